@@ -0,0 +1,371 @@
+# approx.py
+"""Approximate mode: estimates with confidence intervals from a sample taken at ingest
+
+Exploring a selection of hundreds of millions of rows does not need exact
+sums. Every ingested chunk is folded into an `ApproxSummary`:
+
+- a stratified sample: per platform, the SAMPLE_ROWS_PER_STRATUM rows with
+  the smallest random priority (a bottom-k reservoir, which merges across
+  chunks and files), plus the exact row count of every platform;
+- HyperLogLog sketches of the locations and influencers of every
+  (day, platform), for distinct counts.
+
+`ApproxSummary.view` answers like `incremental.Aggregates` with stratified
+estimates, and its `margins` are the half-widths of their 95% confidence
+intervals. Final figures and downloads come from the exact cube.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from cache import MemoryLRU
+from cube import CUBE_DIMS, align_categories
+
+SAMPLE_ROWS_PER_STRATUM = 25_000
+SAMPLE_SEED = 0
+
+STRATUM = 'platform'
+SAMPLE_COLS = [*CUBE_DIMS, 'engagements']
+DISTINCT_COLS = ['location', 'influencer']
+SUMMARY_COLS = SAMPLE_COLS + [col for col in DISTINCT_COLS if col not in SAMPLE_COLS]
+
+# 2**11 registers per sketch: ~2.3% standard error on a distinct count
+HLL_PRECISION = 11
+HLL_REGISTERS = 1 << HLL_PRECISION
+HLL_RELATIVE_ERROR = 1.04 / math.sqrt(HLL_REGISTERS)
+
+# Two-sided 95% normal quantile
+Z_95 = 1.959963984540054
+
+# Rows of `from_frame` folded at a time, as streaming folds its chunks
+FRAME_CHUNK_ROWS = 1_000_000
+
+
+def _bit_length(values):
+    """Number of significant bits of each uint64"""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = values >= np.uint64(1 << shift)
+        length[wide] += shift
+        values[wide] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+def _hll_ranks(hashes):
+    """(register, rank) of 64-bit hashes: the top bits pick the register, the rest give the rank"""
+    bits = 64 - HLL_PRECISION
+    registers = (hashes >> np.uint64(bits)).astype(np.int64)
+    rest = hashes & np.uint64((1 << bits) - 1)
+    return registers, (bits - _bit_length(rest) + 1).astype(np.uint8)
+
+
+def hll_count(registers):
+    """HyperLogLog estimate of the distinct values behind `registers`, with the small-range correction"""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum()
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * math.log(m / zeros)
+    return estimate
+
+
+def _sketch_chunk(chunk, col):
+    """{(day, platform): registers} of the `col` values of one chunk"""
+    values = chunk[col]
+    codes = values.cat.codes.to_numpy().astype(np.int64)
+    platforms = chunk[STRATUM].cat.codes.to_numpy().astype(np.int64)
+    days = chunk['day'].to_numpy().astype(np.int64)
+    valid = (codes >= 0) & (platforms >= 0)
+    if not valid.any():
+        return {}
+    # One (day, platform, value) triple per distinct combination, hashed by label
+    first_day = days[valid].min()
+    width = len(values.cat.categories)
+    groups = (days[valid] - first_day) * len(chunk[STRATUM].cat.categories) + platforms[valid]
+    triples = pd.unique(groups * width + codes[valid])
+    groups, codes = np.divmod(triples, width)
+    label_hashes = pd.util.hash_array(np.asarray(values.cat.categories, dtype=object))
+    registers, ranks = _hll_ranks(label_hashes[codes])
+    groups, keys = pd.factorize(groups)
+    flat = np.zeros(len(keys) * HLL_REGISTERS, dtype=np.uint8)
+    maxima = pd.Series(ranks).groupby(groups * HLL_REGISTERS + registers).max()
+    flat[maxima.index.to_numpy()] = maxima.to_numpy()
+    labels = chunk[STRATUM].cat.categories
+    days, platforms = np.divmod(keys, len(labels))
+    return {
+        (int(first_day + day), labels[platform]): flat[i * HLL_REGISTERS:(i + 1) * HLL_REGISTERS]
+        for i, (day, platform) in enumerate(zip(days, platforms))
+    }
+
+
+def _merge_sketches(target, new):
+    """`target` with `new` registers folded in (register-wise max); neither is modified"""
+    merged = dict(target)
+    for key, registers in new.items():
+        existing = merged.get(key)
+        merged[key] = registers if existing is None else np.maximum(existing, registers)
+    return merged
+
+
+def _bottom_k(sample, k):
+    """Rows with the k smallest priorities of every stratum"""
+    sample = sample.sort_values('priority', kind='stable', ignore_index=True)
+    return sample[sample.groupby(STRATUM, observed=True).cumcount() < k].reset_index(drop=True)
+
+
+class ApproxSummary:
+    """Stratified sample, per-platform row counts and distinct-value sketches of a dataset.
+
+    Immutable: `add` and `merge` return new summaries, so a summary shared
+    between sessions (e.g. by a watcher) never changes under a reader.
+    """
+
+    def __init__(self, sample=None, population=None, sketches=None, rng=None, k=SAMPLE_ROWS_PER_STRATUM):
+        self.sample = sample
+        self.population = population or {}
+        self.sketches = sketches or {col: {} for col in DISTINCT_COLS}
+        self.rng = rng if rng is not None else np.random.default_rng(SAMPLE_SEED)
+        self.k = k
+
+    @classmethod
+    def from_frame(cls, df, chunk_rows=FRAME_CHUNK_ROWS):
+        summary = cls()
+        for start in range(0, len(df), chunk_rows):
+            summary = summary.add(df.iloc[start:start + chunk_rows])
+        return summary
+
+    @property
+    def rows(self):
+        """Rows summarized (those with every cube dimension, as in the cube)"""
+        return sum(self.population.values())
+
+    @property
+    def sample_rows(self):
+        return 0 if self.sample is None else len(self.sample)
+
+    @property
+    def nbytes(self):
+        sample_bytes = 0 if self.sample is None else int(self.sample.memory_usage(index=True, deep=True).sum())
+        return sample_bytes + sum(r.nbytes for sketches in self.sketches.values() for r in sketches.values())
+
+    def _candidates(self, rows):
+        """Rows of a chunk with a random priority, kept only if they can enter their stratum's bottom-k"""
+        priority = self.rng.random(len(rows))
+        codes = rows[STRATUM].cat.codes.to_numpy()
+        categories = rows[STRATUM].cat.categories
+        limits = np.ones(len(categories))
+        if self.sample is not None:
+            # A full stratum only takes priorities below its current k-th smallest
+            held = self.sample.groupby(STRATUM, observed=True)['priority'].agg(['size', 'max'])
+            limits = held['max'].where(held['size'] >= self.k, 1.0)
+            limits = limits.reindex(categories, fill_value=1.0).to_numpy(copy=True)
+        for code in range(len(categories)):
+            # Nor can more than the k smallest of the chunk itself
+            priorities = priority[codes == code]
+            if len(priorities) > self.k:
+                limits[code] = min(limits[code], np.partition(priorities, self.k - 1)[self.k - 1])
+        keep = priority <= limits[codes]
+        return rows[keep].assign(priority=priority[keep], engagements=rows['engagements'][keep].astype(np.int64))
+
+    def add(self, chunk):
+        """Summary with the rows of a cleaned, compact chunk folded in"""
+        rows = chunk.loc[chunk[CUBE_DIMS].notna().all(axis=1).to_numpy(), SUMMARY_COLS]
+        if rows.empty:
+            return self
+        population = dict(self.population)
+        for stratum, count in rows[STRATUM].value_counts().items():
+            if count:
+                population[stratum] = population.get(stratum, 0) + int(count)
+
+        candidates = self._candidates(rows[SAMPLE_COLS])
+        parts = [candidates] if self.sample is None else [self.sample, candidates]
+        sample = _bottom_k(pd.concat(align_categories(parts, CUBE_DIMS[1:]), ignore_index=True), self.k)
+
+        sketches = {col: _merge_sketches(self.sketches[col], _sketch_chunk(rows, col)) for col in DISTINCT_COLS}
+        return ApproxSummary(sample, population, sketches, self.rng, self.k)
+
+    @classmethod
+    def merge(cls, summaries):
+        """One summary of several datasets (e.g. one per campaign file)"""
+        summaries = [s for s in summaries if s.sample is not None]
+        if not summaries:
+            return cls()
+        population = {}
+        sketches = {col: {} for col in DISTINCT_COLS}
+        for summary in summaries:
+            for stratum, count in summary.population.items():
+                population[stratum] = population.get(stratum, 0) + count
+            for col in DISTINCT_COLS:
+                sketches[col] = _merge_sketches(sketches[col], summary.sketches[col])
+        k = min(s.k for s in summaries)
+        samples = align_categories([s.sample for s in summaries], CUBE_DIMS[1:])
+        sample = _bottom_k(pd.concat(samples, ignore_index=True), k)
+        return cls(sample, population, sketches, summaries[0].rng, k)
+
+    def view(self, start_day, end_day, **facets):
+        return ApproxView(self, start_day, end_day, facets)
+
+    def distinct(self, col, start_day, end_day, platforms=None):
+        """(estimate, 95% margin) of the distinct `col` values over a date range and platforms"""
+        registers = [
+            r for (day, platform), r in self.sketches[col].items()
+            if start_day <= day <= end_day and (platforms is None or platform in platforms)
+        ]
+        if not registers:
+            return 0, 0
+        estimate = hll_count(np.maximum.reduce(registers))
+        return int(round(estimate)), int(round(Z_95 * HLL_RELATIVE_ERROR * estimate))
+
+
+class ApproxView:
+    """Estimates for one filter selection, answering like `incremental.Aggregates`.
+
+    Every sampled row of stratum h stands for N_h / n_h rows. Totals are
+    Horvitz-Thompson sums of the rows in the selection, their variance the
+    stratified-sampling variance with finite population correction (zero for
+    a stratum sampled in full), and ratios (average engagement, positive %)
+    use the linearized variance. Sums are `bincount`s over (stratum, member)
+    codes of the selected sample rows.
+    """
+
+    def __init__(self, summary, start_day, end_day, facets):
+        self.summary = summary
+        self._results = {}
+        sample = summary.sample
+        if sample is None:
+            self.rows = pd.DataFrame(columns=SAMPLE_COLS)
+            self.stratum = np.zeros(0, dtype=np.int64)
+            n = N = np.zeros(0)
+        else:
+            mask = sample['day'].between(start_day, end_day).to_numpy(copy=True)
+            for facet, values in facets.items():
+                mask &= sample[facet].isin(list(values)).to_numpy()
+            self.rows = sample[mask]
+            codes = sample[STRATUM].cat.codes.to_numpy().astype(np.int64)
+            strata = sample[STRATUM].cat.categories
+            n = np.bincount(codes, minlength=len(strata)).astype(np.float64)
+            N = np.array([summary.population.get(label, 0) for label in strata], dtype=np.float64)
+            self.stratum = codes[mask]
+
+        self.n = n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.weight = np.where(n > 0, N / n, 0.0)
+            # N_h² (1 - n_h/N_h) / n_h / (n_h - 1): the s²-free part of each stratum's variance
+            self.variance_factor = np.where(n > 1, N * N * (1 - n / N) / n / (n - 1), 0.0)
+
+        y = self.rows['engagements'].to_numpy(dtype=np.float64)
+        self.measures = {
+            'posts': np.ones(len(y)),
+            'engagements': y,
+            'squares': y * y,
+            'positive': (self.rows['sentiment'] == 'Positive').to_numpy(dtype=np.float64),
+        }
+
+    @property
+    def nbytes(self):
+        return int(self.rows.memory_usage(index=True, deep=True).sum()) + sum(m.nbytes for m in self.measures.values())
+
+    @property
+    def empty(self):
+        return self.rows.empty
+
+    def _sums(self, by=None):
+        """Stratum × member sums of every measure over the selected rows, and the members of `by`"""
+        if by is None:
+            codes, members = np.zeros(len(self.rows), dtype=np.int64), [None]
+        elif by == 'day':
+            days = self.rows['day'].to_numpy().astype(np.int64)
+            first = days.min() if len(days) else 0
+            codes = days - first
+            members = np.arange(first, first + (codes.max() + 1 if len(codes) else 0), dtype=np.int32)
+        else:
+            codes = self.rows[by].cat.codes.to_numpy().astype(np.int64)
+            members = self.rows[by].cat.categories
+        shape = (len(self.n), len(members))
+        index = self.stratum * shape[1] + codes
+        return {
+            name: np.bincount(index, weights=values, minlength=shape[0] * shape[1]).reshape(shape)
+            for name, values in self.measures.items()
+        }, members
+
+    def _variance(self, sums, squares):
+        """Estimated variance of a total: Σ_h N_h²(1-f_h) s_h² / n_h, per member"""
+        n = np.maximum(self.n, 1)[:, None]
+        return (self.variance_factor[:, None] * np.maximum(squares - sums * sums / n, 0.0)).sum(axis=0)
+
+    def _estimates(self, by):
+        """Estimated engagements/posts per member of `by` present in the selection, with their 95% margins"""
+        if by in self._results:
+            return self._results[by]
+        sums, members = self._sums(by)
+        present = sums['posts'].sum(axis=0) > 0
+        labels = members[present] if by == 'day' else pd.Categorical(members[present], categories=members)
+        result = pd.DataFrame({
+            by: labels,
+            'engagements': (self.weight @ sums['engagements'])[present].round().astype(np.int64),
+            'posts': (self.weight @ sums['posts'])[present].round().astype(np.int64),
+            'engagements_margin': (Z_95 * np.sqrt(self._variance(sums['engagements'], sums['squares'])))[present]
+            .round().astype(np.int64),
+            # Post counts are sums of 0/1 values, so their squares are the counts themselves
+            'posts_margin': (Z_95 * np.sqrt(self._variance(sums['posts'], sums['posts'])))[present]
+            .round().astype(np.int64),
+        })
+        self._results[by] = result
+        return result
+
+    def rollup(self, dim):
+        """Estimated engagements and posts per member of `dim` present in the sample"""
+        return self._estimates(dim)[[dim, 'engagements', 'posts']].copy()
+
+    def margins(self, dim):
+        """95% margins (±) of `rollup(dim)`, row for row"""
+        return self._estimates(dim)[[dim, 'engagements_margin', 'posts_margin']].set_axis(
+            [dim, 'engagements', 'posts'], axis=1
+        )
+
+    def totals(self):
+        """(estimated total engagements, estimated total posts)"""
+        if self.empty:
+            return 0, 0
+        sums, _ = self._sums()
+        engagements, posts = (float(self.weight @ sums[name][:, 0]) for name in ['engagements', 'posts'])
+        return int(round(engagements)), int(round(posts))
+
+    def kpi_margins(self):
+        """95% margins (±) of the KPIs: posts, engagements, avg_engagement, positive_pct (points)"""
+        if self.empty:
+            return {'posts': 0, 'engagements': 0, 'avg_engagement': 0, 'positive_pct': 0.0}
+        sums, _ = self._sums()
+        posts, y, squares, positive = (sums[name] for name in ['posts', 'engagements', 'squares', 'positive'])
+        total_posts = float(self.weight @ posts[:, 0])
+
+        def ratio_margin(numerator, numerator_squares, cross):
+            # Linearized: z = a - R·1 over the selected rows, Var(R) ≈ Var(Σz) / P²
+            ratio = float(self.weight @ numerator[:, 0]) / total_posts
+            z_sums = numerator - ratio * posts
+            z_squares = numerator_squares - 2 * ratio * cross + ratio * ratio * posts
+            return Z_95 * math.sqrt(self._variance(z_sums, z_squares)[0]) / total_posts
+
+        return {
+            'posts': int(round(Z_95 * math.sqrt(self._variance(posts, posts)[0]))),
+            'engagements': int(round(Z_95 * math.sqrt(self._variance(y, squares)[0]))),
+            'avg_engagement': int(round(ratio_margin(y, squares, y))),
+            # Positive flags are 0/1: their squares and products with the row count are the flags
+            'positive_pct': ratio_margin(positive, positive, positive) * 100,
+        }
+
+
+# Samples are a few hundred thousand rows at most, plus the sketches
+APPROX_CACHE_BYTES = 256 * 1024 * 1024
+
+_summary_cache = MemoryLRU(APPROX_CACHE_BYTES, max_entries=16, name='approx')
+
+
+def summary_for(dataset_hash, df):
+    """Cached `ApproxSummary.from_frame`, built once per dataset hash"""
+    if dataset_hash is None:
+        return ApproxSummary.from_frame(df)
+    return _summary_cache.get_or_compute(dataset_hash, lambda: ApproxSummary.from_frame(df))
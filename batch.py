@@ -0,0 +1,94 @@
+# batch.py
+"""Headless batch reports for a directory of client CSVs
+
+For every CSV, writes the same KPI summary, platform analysis and filtered
+export the dashboard offers for download, plus the influencer leaderboard,
+using the shared pipeline module.
+Files are processed in parallel by a pool of worker processes:
+    python batch.py data/clients --out reports --workers 8
+    python batch.py data/clients --start 2024-01-01 --end 2024-03-31 --platform TikTok Instagram
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import pandas as pd
+
+import pipeline
+
+
+def find_csvs(directory, recursive=False):
+    pattern = os.path.join(directory, '**', '*.csv') if recursive else os.path.join(directory, '*.csv')
+    return sorted(glob.glob(pattern, recursive=recursive))
+
+
+def run_batch(paths, out_dir, workers=None, start_date=None, end_date=None, progress=None, **facets):
+    """Run `pipeline.run_report` for every path; returns the per-file stats in path order"""
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    if workers == 1:
+        for path in paths:
+            results[path] = pipeline.run_report(path, out_dir, start_date, end_date, **facets)
+            if progress:
+                progress(results[path])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(pipeline.run_report, path, out_dir, start_date, end_date, **facets): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress:
+                    progress(results[futures[future]])
+    return [results[path] for path in paths]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory', help="directory containing the client CSV files")
+    parser.add_argument('--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--recursive', action='store_true', help="also read CSVs in subdirectories")
+    parser.add_argument('--start', type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument('--end', type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument('--platform', nargs='+')
+    parser.add_argument('--sentiment', nargs='+')
+    parser.add_argument('--media-type', dest='media_type', nargs='+')
+    parser.add_argument('--brand', nargs='+')
+    parser.add_argument('--post-type', dest='post_type', nargs='+')
+    args = parser.parse_args(argv)
+
+    paths = find_csvs(args.directory, args.recursive)
+    if not paths:
+        print(f"No CSV files in {args.directory}", file=sys.stderr)
+        return 1
+
+    def progress(stats):
+        status = f"ERROR {stats['error']}" if stats['error'] else f"{stats['rows']:,} rows"
+        print(f"{stats['file']:<40} {stats['seconds']:7.2f}s  {status}")
+
+    started = time.perf_counter()
+    results = run_batch(
+        paths, args.out, args.workers, args.start, args.end, progress,
+        platform=args.platform, sentiment=args.sentiment, media_type=args.media_type,
+        brand=args.brand, post_type=args.post_type
+    )
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(args.out, exist_ok=True)
+    pd.DataFrame(results).to_csv(os.path.join(args.out, 'batch_summary.csv'), index=False)
+
+    failed = sum(1 for stats in results if stats['error'])
+    rows = sum(stats['rows'] for stats in results)
+    print(f"{len(results) - failed}/{len(results)} files, {rows:,} rows in {elapsed:.2f}s "
+          f"({rows / elapsed:,.0f} rows/s) -> {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# benchmarks/bench_approx.py
+"""Benchmark: approximate mode (sample + sketches) vs. exact cube aggregates for one filter selection
+
+Builds the exact cube and the approximate-mode summary of --rows synthetic
+rows, then answers the KPIs and the sentiment, platform and location
+rollups of a selection (three of four platforms, two media types, the
+middle of the date range) both ways. Prints the build and query times and,
+per metric, the relative error of the estimate and its 95% margin.
+    python benchmarks/bench_approx.py --rows 1000000 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import approx  # noqa: E402
+import ingest  # noqa: E402
+import pipeline  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube  # noqa: E402
+from incremental import IncrementalAggregator  # noqa: E402
+
+DIMS = ['sentiment', 'platform', 'location']
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def answer(view):
+    return pipeline.kpis(view), {dim: view.rollup(dim) for dim in DIMS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = ingest.prepare(ingest.standardize_columns(synthetic.generate(rows, seed=42)))
+        cube_s, data_cube = timed(lambda: Cube.from_frame(df, 'bench'))
+        summary_s, summary = timed(lambda: approx.ApproxSummary.from_frame(df))
+        days = data_cube.max_day - data_cube.min_day
+        start_day, end_day = data_cube.min_day + days // 4, data_cube.max_day - days // 4
+        facets = {'platform': data_cube.members('platform')[1:], 'media_type': data_cube.members('media_type')[:2]}
+
+        exact_s, (kpis, rollups) = timed(lambda: answer(
+            IncrementalAggregator().update(data_cube, start_day, end_day, **facets)
+        ))
+        view = summary.view(start_day, end_day, **facets)
+        approx_s, (estimated, estimated_rollups) = timed(lambda: answer(view))
+        margins_s, margins = timed(view.kpi_margins)
+
+        print(f"rows={rows:,} cells={len(data_cube):,} sample={summary.sample_rows:,} "
+              f"({summary.nbytes / 1e6:.1f} MB)")
+        print(f"  build   cube {cube_s:6.2f} s   summary {summary_s:6.2f} s")
+        print(f"  query   exact {exact_s * 1000:7.1f} ms   approximate {(approx_s + margins_s) * 1000:7.1f} ms")
+        for name in ['posts', 'engagements', 'avg_engagement', 'positive_pct']:
+            exact, estimate = getattr(kpis, name), getattr(estimated, name)
+            print(f"  {name:<15} exact {exact:>16,.1f}   estimate {estimate:>16,.1f}   "
+                  f"error {abs(estimate - exact) / exact * 100:5.2f}%   ±{margins[name] / exact * 100:5.2f}%")
+        for dim in DIMS:
+            exact = rollups[dim].set_index(dim)['engagements']
+            estimate = estimated_rollups[dim].set_index(dim)['engagements']
+            margin = view.margins(dim).set_index(dim)['engagements']
+            covered = ((estimate - exact.reindex(estimate.index)).abs() <= margin).mean()
+            print(f"  {dim:<15} {len(exact):>3} members   top-1 exact {exact.idxmax()!s:<12} "
+                  f"estimate {estimate.idxmax()!s:<12} inside 95% CI {covered * 100:5.1f}%")
+        for col, truth in [('location', df['location']), ('influencer', df['influencer'])]:
+            in_range = df['day'].between(start_day, end_day) & df['platform'].isin(facets['platform'])
+            estimate, margin = summary.distinct(col, start_day, end_day, facets['platform'])
+            print(f"  distinct {col:<10} exact {truth[in_range].nunique():>8,}   estimate {estimate:>8,} ± {margin:,}")
+
+
+if __name__ == '__main__':
+    main()
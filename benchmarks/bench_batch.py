@@ -0,0 +1,63 @@
+# benchmarks/bench_batch.py
+"""Benchmark: batch report throughput vs. number of worker processes
+
+Writes `--files` synthetic client CSVs to a temporary directory and runs the
+batch runner over them with each worker count.
+    python benchmarks/bench_batch.py --files 32 --rows 100000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import run_batch  # noqa: E402
+
+
+def write_client_csv(path, rows, seed):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'Date': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')).strftime('%Y-%m-%d'),
+        'Platform': rng.choice(['Instagram', 'TikTok', 'X/Twitter', 'YouTube'], rows),
+        'Sentiment': rng.choice(['Positive', 'Neutral', 'Negative'], rows),
+        'Location': rng.choice(['Jakarta', 'Surabaya', 'Bandung', 'Medan', 'Makassar'], rows),
+        'Engagements': rng.integers(0, 20_000, rows),
+        'Media_Type': rng.choice(['Carousel', 'Image', 'Text', 'Video'], rows),
+    }).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_dir = os.path.join(tmp, 'in')
+        os.makedirs(in_dir)
+        paths = []
+        for i in range(args.files):
+            paths.append(os.path.join(in_dir, f"client_{i:03d}.csv"))
+            write_client_csv(paths[-1], args.rows, seed=i)
+
+        print(f"{args.files} files x {args.rows:,} rows, {os.cpu_count()} CPUs")
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            started = time.perf_counter()
+            results = run_batch(paths, os.path.join(tmp, f"out_{workers}"), workers)
+            elapsed = time.perf_counter() - started
+            assert not any(stats['error'] for stats in results)
+            baseline = baseline or elapsed
+            rows = sum(stats['rows'] for stats in results)
+            print(f"workers {workers:>3}  {elapsed:7.2f}s  {rows / elapsed:>12,.0f} rows/s  "
+                  f"speedup {baseline / elapsed:4.1f}x")
+
+
+if __name__ == '__main__':
+    main()
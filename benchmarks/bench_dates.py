@@ -0,0 +1,63 @@
+# benchmarks/bench_dates.py
+"""Micro-benchmark: pd.to_datetime(errors='coerce') vs. inferred-format parse_dates
+
+Each scenario is a date column of --rows rows drawn from two years of days:
+a clean single-format export, one with a share of rows written in a second
+format plus some garbage, and a day-first text format pandas cannot guess.
+Run from the repository root:
+    python benchmarks/bench_dates.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import parse_dates  # noqa: E402
+
+
+def make_column(rows, primary, secondary=None, secondary_share=0.0, garbage_share=0.0, seed=42):
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, rows), unit='D')
+    values = pd.Series(days.strftime(primary), dtype=object)
+    if secondary:
+        other = rng.random(rows) < secondary_share
+        values[other] = days[other].strftime(secondary)
+    if garbage_share:
+        values[rng.random(rows) < garbage_share] = 'n/a'
+    return values
+
+
+SCENARIOS = {
+    'clean ISO (%Y-%m-%d)': dict(primary='%Y-%m-%d'),
+    '5% %d/%m/%Y + 1% garbage': dict(primary='%Y-%m-%d', secondary='%d/%m/%Y',
+                                     secondary_share=0.05, garbage_share=0.01),
+    'text day-first (%d %b %Y)': dict(primary='%d %b %Y'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"rows={args.rows:,}")
+    for name, options in SCENARIOS.items():
+        values = make_column(args.rows, **options)
+        legacy = pd.to_datetime(values, errors='coerce')
+        parsed, report = parse_dates(values)
+
+        legacy_s = min(timeit.repeat(lambda: pd.to_datetime(values, errors='coerce'), number=1, repeat=args.repeat))
+        fast_s = min(timeit.repeat(lambda: parse_dates(values), number=1, repeat=args.repeat))
+        print(f"{name:<28} to_datetime {legacy_s * 1000:8.1f} ms, {int(legacy.isna().sum()):>8,} NaT   "
+              f"parse_dates {fast_s * 1000:7.1f} ms, {report.dropped_rows:>8,} dropped "
+              f"({report.fallback_rows:,} via fallback)   speedup {legacy_s / fast_s:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_downsample.py
+"""Benchmark: trend chart payload with every daily point vs. resampled + LTTB
+
+Run from the repository root:
+    python benchmarks/bench_downsample.py --days 90 365 1825 3650
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import downsample  # noqa: E402
+from schema import date_to_day, day_to_date, format_bytes  # noqa: E402
+
+
+def make_series(days, seed=42):
+    """Daily engagement totals with weekly seasonality, noise and a few spikes"""
+    rng = np.random.default_rng(seed)
+    start = date_to_day(pd.Timestamp('2020-01-01'))
+    day = np.arange(start, start + days, dtype=np.int32)
+    values = 50_000 + 15_000 * np.sin(day * 2 * np.pi / 7) + rng.normal(0, 8_000, days)
+    values[rng.integers(0, days, max(1, days // 200))] *= 4
+    return day, np.maximum(values, 0).astype(np.int64)
+
+
+def trend_figure(frame):
+    fig = px.line(frame, x='Date', y='Engagements', markers=True, line_shape='spline')
+    fig.update_layout(height=400, hovermode='x unified')
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, nargs='+', default=[90, 365, 1825, 3650])
+    args = parser.parse_args()
+
+    print(f"{'days':>6} {'granularity':>11} {'points':>13} {'full payload':>13} {'sampled':>10} "
+          f"{'reduction':>9} {'sample ms':>9}")
+    for days in args.days:
+        day, values = make_series(days)
+        full = pd.DataFrame({'Date': [day_to_date(d) for d in day], 'Engagements': values})
+        full_bytes = downsample.figure_bytes(trend_figure(full))
+
+        started = time.perf_counter()
+        trend = downsample.trend(day, values)
+        elapsed = time.perf_counter() - started
+        sampled_bytes = downsample.figure_bytes(trend_figure(trend.frame))
+
+        # The daily peak survives exactly when the chart stays daily
+        if trend.granularity == 'day':
+            assert trend.frame['Engagements'].max() == values.max()
+
+        print(f"{days:>6} {trend.granularity:>11} {len(trend.frame):>6,} / {days:<6,} "
+              f"{format_bytes(full_bytes):>13} {format_bytes(sampled_bytes):>10} "
+              f"{full_bytes / sampled_bytes:>8.1f}x {elapsed * 1000:>9.2f}")
+
+    # Daily granularity forced over a long range: LTTB alone does the work
+    day, values = make_series(3650)
+    trend = downsample.trend(day, values, 'day')
+    full = pd.DataFrame({'Date': [day_to_date(d) for d in day], 'Engagements': values})
+    ratio = downsample.figure_bytes(trend_figure(full)) / downsample.figure_bytes(trend_figure(trend.frame))
+    assert trend.frame['Engagements'].max() == values.max()
+    assert trend.frame['Engagements'].min() == values.min()
+    print(f"daily over 3650 days: {len(trend.frame)} points kept by LTTB, payload {ratio:.1f}x smaller, "
+          f"peak and minimum exact")
+
+
+if __name__ == '__main__':
+    main()
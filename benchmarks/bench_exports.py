@@ -0,0 +1,63 @@
+# benchmarks/bench_exports.py
+"""Benchmark: filtered-data export as one to_csv string vs. chunked CSV / gzip / Parquet writes
+
+Times each export of the rows selected by a platform filter and records
+its peak traced memory. The chunked CSV is checked to be byte-identical to
+`to_csv`.
+    python benchmarks/bench_exports.py --rows 1000000 3000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exports  # noqa: E402
+import ingest  # noqa: E402
+import pipeline  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube  # noqa: E402
+from filters import FilterIndex  # noqa: E402
+from schema import DERIVED_COLS  # noqa: E402
+
+
+def measured(fn):
+    """(seconds, peak traced bytes, result); timed on its own run since tracing slows allocation"""
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 3_000_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = ingest.prepare(ingest.standardize_columns(synthetic.generate(rows, seed=42)))
+        data_cube = Cube.from_frame(df)
+        # Three of the four platforms, so the selection is a position array rather than a slice
+        selection = pipeline.make_selection(data_cube, platform=data_cube.members('platform')[1:])
+        selected = pipeline.select_rows(selection, FilterIndex(df))
+        print(f"rows={rows:,} selected={len(exports.positions(df, selected)):,}")
+
+        base_s, base_peak, expected = measured(
+            lambda: df.iloc[selected].drop(columns=DERIVED_COLS, errors='ignore').to_csv(index=False).encode('utf-8')
+        )
+        print(f"  {'to_csv':<10} {base_s:7.2f} s   peak {base_peak / 1e6:8.1f} MB   size {len(expected) / 1e6:7.1f} MB")
+        for fmt in exports.FORMATS:
+            seconds, peak, data = measured(lambda: exports.export_bytes(df, selected, fmt))
+            if fmt == 'csv':
+                assert data == expected
+            print(f"  {fmt:<10} {seconds:7.2f} s   peak {peak / 1e6:8.1f} MB   size {len(data) / 1e6:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_figures.py
+"""Benchmark: chart build + serialization cost per rerun, before and after
+
+"before" builds all nine figures with plotly.express on every rerun, as the
+dashboard did with st.tabs. "after" builds only the active tab plus the two
+always-visible deep-analysis charts with graph_objects, through the figure
+cache. Serialization uses plotly.io.to_json, as st.plotly_chart does.
+
+Run from the repository root:
+    python benchmarks/bench_figures.py --csv Spirifi.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import plotly.express as px
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts  # noqa: E402
+import downsample  # noqa: E402
+import ingest  # noqa: E402
+from cube import Cube  # noqa: E402
+from schema import format_bytes  # noqa: E402
+
+
+def aggregates(view):
+    """The aggregate frames behind every chart, as the dashboard computes them"""
+    platform_eng = view.rollup('platform')[['platform', 'engagements']].sort_values('engagements', ascending=False)
+    media_counts = view.rollup('media_type')[['media_type', 'posts']].sort_values('posts', ascending=False)
+    media_counts.columns = ['media_type', 'count']
+    df_s = view.rollup('sentiment')[['sentiment', 'posts']].sort_values('posts', ascending=False)
+    df_s.columns = ['sentiment', 'count']
+    daily = view.rollup('day')
+    media_eng = view.rollup('media_type')
+    media_eng['engagements'] = media_eng['engagements'] / media_eng['posts']
+    sentiment_eng = view.rollup('sentiment')
+    sentiment_eng['avg_engagement'] = sentiment_eng['engagements'] / sentiment_eng['posts']
+    monthly = downsample.trend(daily['day'], daily['engagements'], 'month').frame
+    monthly.columns = ['month', 'engagements']
+    return {
+        'df_s': df_s,
+        'trend': downsample.trend(daily['day'], daily['engagements']).frame,
+        'platform_eng': platform_eng,
+        'platform_counts': view.rollup('platform')[['platform', 'posts']],
+        'media_counts': media_counts,
+        'media_eng': media_eng[['media_type', 'engagements']],
+        'top_locations': view.rollup('location')[['location', 'engagements']].nlargest(5, 'engagements'),
+        'sentiment_eng': sentiment_eng[['sentiment', 'avg_engagement']],
+        'monthly': monthly,
+    }
+
+
+def express_figures(a):
+    """All nine figures, built the way the dashboard used to"""
+    return [
+        px.pie(a['df_s'], names='sentiment', values='count', color='sentiment',
+               color_discrete_map=charts.SENTIMENT_COLORS, hole=0.4),
+        px.line(a['trend'], x='Date', y='Engagements', markers=True, line_shape='spline'),
+        px.bar(a['platform_eng'], x='platform', y='engagements', color='engagements',
+               color_continuous_scale='Greens'),
+        px.pie(a['platform_counts'], names='platform', values='posts',
+               color_discrete_sequence=px.colors.qualitative.Set2),
+        px.pie(a['media_counts'], names='media_type', values='count', hole=0.3,
+               color_discrete_sequence=px.colors.qualitative.Pastel),
+        px.bar(a['media_eng'], x='media_type', y='engagements', color='engagements',
+               color_continuous_scale='Viridis'),
+        px.bar(a['top_locations'], x='engagements', y='location', orientation='h',
+               color='engagements', color_continuous_scale='Greens'),
+        px.bar(a['sentiment_eng'], x='sentiment', y='avg_engagement', color='sentiment',
+               color_discrete_map=charts.SENTIMENT_COLORS),
+        px.line(a['monthly'], x='month', y='engagements', markers=True),
+    ]
+
+
+# Figures per tab in the lazy layout; the deep-analysis pair is always shown
+TAB_FIGURES = [
+    [(charts.sentiment_pie, 'df_s')],
+    [(charts.trend_line, 'trend')],
+    [(charts.platform_bar, 'platform_eng'), (charts.platform_pie, 'platform_counts')],
+    [(charts.media_pie, 'media_counts'), (charts.media_bar, 'media_eng')],
+    [(charts.location_bar, 'top_locations')],
+]
+ALWAYS = [(charts.sentiment_bar, 'sentiment_eng'), (charts.monthly_line, 'monthly')]
+
+
+def lazy_figures(a, tab):
+    return [charts.figure(builder, a[name]) for builder, name in TAB_FIGURES[tab] + ALWAYS]
+
+
+def rerun(build):
+    """Seconds and bytes to build and serialize one rerun's figures"""
+    started = time.perf_counter()
+    payload = sum(len(pio.to_json(fig, validate=False)) for fig in build())
+    return time.perf_counter() - started, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default='Spirifi.csv')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.csv, 'rb') as f:
+        _, df = ingest.load_csv(f.read())
+    a = aggregates(Cube.from_frame(df))
+
+    rerun(lambda: express_figures(a))  # warm up plotly.express imports
+    before = min(rerun(lambda: express_figures(a)) for _ in range(args.repeat))
+    print(f"before  all 9 figures (express)     {before[0] * 1000:7.1f} ms  {format_bytes(before[1]):>10}")
+
+    for tab in range(len(TAB_FIGURES)):
+        charts._figure_cache.clear()
+        cold = rerun(lambda: lazy_figures(a, tab))
+        warm = min(rerun(lambda: lazy_figures(a, tab)) for _ in range(args.repeat))
+        print(f"after   tab {tab + 1}: {len(TAB_FIGURES[tab]) + len(ALWAYS)} figures cold      "
+              f"{cold[0] * 1000:7.1f} ms  {format_bytes(cold[1]):>10}   cached {warm[0] * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
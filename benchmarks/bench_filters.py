@@ -0,0 +1,103 @@
+# benchmarks/bench_filters.py
+"""Benchmark: boolean-mask sidebar filter vs. FilterIndex selection
+
+Run from the repository root:
+    python benchmarks/bench_filters.py --rows 1000000 10000000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filters import FilterIndex  # noqa: E402
+from schema import date_to_day, to_day_index  # noqa: E402
+
+PLATFORMS = ['Instagram', 'TikTok', 'X/Twitter', 'YouTube']
+SENTIMENTS = ['Positive', 'Neutral', 'Negative']
+MEDIA_TYPES = ['Carousel', 'Image', 'Text', 'Video']
+POST_TYPES = ['Behind the Scenes', 'Collab', 'Product Launch', 'Promo', 'Review']
+START = datetime(2023, 1, 1)
+SPAN_DAYS = 730
+
+
+def make_frame(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.to_datetime(START) + pd.to_timedelta(rng.integers(0, SPAN_DAYS, rows), unit='D')
+    df = pd.DataFrame({
+        'date': dates,
+        'platform': pd.Categorical.from_codes(rng.integers(0, len(PLATFORMS), rows), PLATFORMS),
+        'sentiment': pd.Categorical.from_codes(rng.integers(0, len(SENTIMENTS), rows), SENTIMENTS),
+        'media_type': pd.Categorical.from_codes(rng.integers(0, len(MEDIA_TYPES), rows), MEDIA_TYPES),
+        'engagements': rng.integers(0, 20_000, rows).astype(np.int32),
+        'campaign': pd.Categorical.from_codes(np.zeros(rows, dtype=np.int8), ['Default']),
+        'brand': pd.Categorical.from_codes(np.zeros(rows, dtype=np.int8), ['Spirifi']),
+        'post_type': pd.Categorical.from_codes(rng.integers(0, len(POST_TYPES), rows), POST_TYPES),
+    })
+    df['day'] = to_day_index(df['date'])
+    return df
+
+
+def mask_filter(df, start_date, end_date, platforms, sentiments, media_types):
+    """The dashboard's original boolean-mask filter"""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    return df[
+        (df['date'] >= start_dt) &
+        (df['date'] <= end_dt) &
+        (df['platform'].isin(platforms)) &
+        (df['sentiment'].isin(sentiments)) &
+        (df['media_type'].isin(media_types))
+    ]
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = {
+        '30 days, all facets': (30, PLATFORMS),
+        '30 days, 1 platform off': (30, PLATFORMS[:-1]),
+        'full range, 1 platform off': (SPAN_DAYS, PLATFORMS[:-1]),
+    }
+
+    for rows in args.rows:
+        df = make_frame(rows)
+        started = time.perf_counter()
+        index = FilterIndex(df)
+        build = time.perf_counter() - started
+        print(f"\nrows={rows:,}  index build (once per dataset): {build * 1000:.1f} ms")
+
+        for name, (days, platforms) in scenarios.items():
+            start_date = (START + timedelta(days=200)).date()
+            end_date = start_date + timedelta(days=days - 1)
+            facets = dict(platform=platforms, sentiment=SENTIMENTS, media_type=MEDIA_TYPES)
+
+            expected = mask_filter(df, start_date, end_date, platforms, SENTIMENTS, MEDIA_TYPES)
+            selected = index.select(date_to_day(start_date), date_to_day(end_date), **facets)
+            assert df.index[selected].sort_values().equals(expected.index)
+
+            mask_time = best_of(
+                lambda: mask_filter(df, start_date, end_date, platforms, SENTIMENTS, MEDIA_TYPES),
+                args.repeat)
+            index_time = best_of(
+                lambda: index.select(date_to_day(start_date), date_to_day(end_date), **facets),
+                args.repeat)
+            print(f"  {name:<28} mask {mask_time * 1000:8.2f} ms   index {index_time * 1000:8.2f} ms"
+                  f"   speedup {mask_time / index_time:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_influencers.py
+"""Benchmark: influencer top-K leaderboard, raw groupby + full sort vs. influencer cube + argpartition
+
+Uses the synthetic generator with many distinct handles. The baseline
+filters the raw rows with a boolean mask, groups them by handle and sorts
+every handle; the leaderboard slices the cached influencer cube and
+partially selects the top K.
+    python benchmarks/bench_influencers.py --rows 1000000 --handles 50000 --k 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import influencers  # noqa: E402
+import ingest  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube  # noqa: E402
+
+
+def baseline(df, start_day, end_day, k, platforms):
+    mask = (df['day'] >= start_day) & (df['day'] <= end_day) & df['platform'].isin(platforms)
+    totals = df[mask].groupby('influencer', observed=True)['engagements'].agg(['sum', 'count'])
+    return totals.sort_values('sum', ascending=False).head(k)
+
+
+def best_of(repeat, fn):
+    """(min seconds, last result) of `repeat` calls"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--handles', type=int, nargs='+', default=[1_000, 20_000, 50_000])
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for handles in args.handles:
+        raw = synthetic.generate(args.rows, seed=7, influencer_count=handles)
+        df = ingest.prepare(ingest.standardize_columns(raw))
+        del raw
+        end_day = int(df['day'].max())
+        start_day = end_day - 89
+        platforms = list(df['platform'].cat.categories[1:])
+
+        build_s, influencer_cube = best_of(1, lambda: Cube.from_frame(df, dims=influencers.INFLUENCER_DIMS))
+        influencer_cube.index
+        old_s, old = best_of(args.repeat, lambda: baseline(df, start_day, end_day, args.k, platforms))
+        new_s, new = best_of(args.repeat, lambda: influencers.leaderboard(
+            influencer_cube, start_day, end_day, args.k, platform=platforms
+        ))
+
+        # Same handles and totals, in the same order unless totals tie
+        assert np.array_equal(old['sum'].to_numpy(), new['engagements'].to_numpy())
+        print(f"rows={args.rows:,} handles={df['influencer'].nunique():>6,} cells={len(influencer_cube):>9,} "
+              f"(cube build {build_s * 1000:6.0f} ms once)   groupby+sort {old_s * 1000:7.1f} ms   "
+              f"leaderboard {new_s * 1000:6.1f} ms   speedup {old_s / new_s:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_insights.py
+"""Benchmark the insight service against the local AI stub server
+
+Compares sequential vs. parallel generation of the five tab insights, the
+cached second pass, the retry path with a flaky upstream, and time to first
+token of the streaming path vs. the blocking one.
+    python benchmarks/bench_insights.py --delay 0.3
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+from ai_stub_server import start_in_thread  # noqa: E402
+from insights import InsightService  # noqa: E402
+
+CHARTS = {
+    'Sentiment Analysis': "sentiment count\nPositive 114\nNeutral 56\nNegative 30",
+    'Engagement Trend Analysis': "Rata-rata: 67743.2, Maximum: 150312",
+    'Platform Performance Analysis': "platform engagements\nTikTok 612345\nInstagram 598765",
+    'Media Type Analysis': "media_type count\nVideo 56\nImage 52",
+    'Geographic Analysis': "location engagements\nJakarta 401234\nBandung 300123",
+}
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--delay', type=float, default=0.3)
+    args = parser.parse_args()
+
+    for model in ['Gemini', 'GPT-3.5']:
+        server, base = start_in_thread(delay=args.delay)
+        service = InsightService(gemini_base=base, openai_base=base)
+
+        sequential, t_seq = timed(lambda: {
+            name: service.generate(model, name, text + " ", api_key='stub')
+            for name, text in CHARTS.items()
+        })
+        parallel, t_par = timed(lambda: service.generate_all(model, CHARTS, api_key='stub'))
+        cached, t_hit = timed(lambda: service.generate_all(model, CHARTS, api_key='stub'))
+        assert not any(v.startswith('❌') for v in [*sequential.values(), *parallel.values()])
+        assert cached == parallel
+        service.session.close()
+        server.shutdown()
+
+        print(f"{model:8} sequential {t_seq:6.2f}s   parallel {t_par:6.2f}s   cached {t_hit * 1000:6.1f} ms")
+
+    server, base = start_in_thread(delay=0, fail_every=2)
+    service = InsightService(gemini_base=base, openai_base=base, backoff_factor=0.05)
+    flaky, t_flaky = timed(lambda: service.generate_all('Gemini', CHARTS, api_key='stub'))
+    failed = sum(v.startswith('❌') for v in flaky.values())
+    print(f"flaky upstream (every 2nd request 503): {len(flaky) - failed}/{len(flaky)} ok after retries "
+          f"in {t_flaky:.2f}s, {server.requests} upstream requests")
+    service.session.close()
+    server.shutdown()
+
+    for model in ['Gemini', 'GPT-3.5']:
+        server, base = start_in_thread(delay=args.delay, token_delay=0.05)
+        service = InsightService(gemini_base=base, openai_base=base)
+        name, text = next(iter(CHARTS.items()))
+        blocking, t_block = timed(lambda: service.generate(model, name, text, api_key='stub'))
+        service.cache.clear()
+        streamed = service.stream(model, name, text, api_key='stub')
+        tokens = sum(1 for _ in streamed)
+        assert streamed.text == blocking
+        print(f"{model:8} blocking {t_block:5.2f}s   streamed: first token {streamed.ttft:5.2f}s, "
+              f"{tokens} tokens in {streamed.total:5.2f}s")
+        service.session.close()
+        server.shutdown()
+
+    # Streaming endpoint down: falls back to the blocking request
+    server, base = start_in_thread(delay=0, no_stream=True)
+    service = InsightService(gemini_base=base, openai_base=base)
+    streamed = service.stream('Gemini', name, text, api_key='stub')
+    print(f"streaming unavailable -> fallback answer: {''.join(streamed)[:40]!r}")
+    service.session.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
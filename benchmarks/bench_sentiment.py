@@ -0,0 +1,67 @@
+# benchmarks/bench_sentiment.py
+"""Micro-benchmark: per-row lambda vs. factorized sentiment normalization
+
+Run from the repository root:
+    python benchmarks/bench_sentiment.py --rows 1000000 --labels 12
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment import DEFAULT_SYNONYMS, normalize_sentiment  # noqa: E402
+
+RAW_LABELS = [
+    'Positive', 'positive', 'POS', 'Positif', 'Negative', 'negatif', 'NEG',
+    'Neutral', 'netral', '😊', '😡', 'mixed', None,
+]
+
+
+def legacy_normalize(values):
+    """The original per-row implementation, kept for comparison"""
+    return values.fillna('Neutral').apply(
+        lambda x: 'Positive' if 'pos' in str(x).lower()
+                  else ('Negative' if 'neg' in str(x).lower() else 'Neutral')
+    )
+
+
+def make_column(rows, labels, seed=42):
+    rng = np.random.default_rng(seed)
+    pool = (RAW_LABELS * (labels // len(RAW_LABELS) + 1))[:labels]
+    pool = [f"{p} {i // len(RAW_LABELS)}" if i >= len(RAW_LABELS) and p else p
+            for i, p in enumerate(pool)]
+    return pd.Series(rng.choice(np.array(pool, dtype=object), rows), name='sentiment')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--labels', type=int, default=len(RAW_LABELS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    values = make_column(args.rows, args.labels)
+
+    # Both paths must agree before timing anything
+    expected = legacy_normalize(values)
+    actual = normalize_sentiment(values)
+    # (emoji and other synonym-table entries are new and have no legacy equivalent)
+    legacy_only = ~values.astype(str).str.lower().str.strip().isin(DEFAULT_SYNONYMS)
+    assert (expected[legacy_only].to_numpy() == actual[legacy_only].astype(object).to_numpy()).all()
+
+    legacy = min(timeit.repeat(lambda: legacy_normalize(values), number=1, repeat=args.repeat))
+    vectorized = min(timeit.repeat(lambda: normalize_sentiment(values), number=1, repeat=args.repeat))
+
+    print(f"rows={args.rows:,} distinct_labels={values.nunique(dropna=False)}")
+    print(f"legacy .apply lambda : {legacy * 1000:9.1f} ms")
+    print(f"normalize_sentiment  : {vectorized * 1000:9.1f} ms")
+    print(f"speedup              : {legacy / vectorized:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_shared_cache.py
+"""Benchmark: N sessions opening the same CSV with default filters, private work vs. shared single-flight caches
+
+Each session runs on its own thread, as Streamlit does, and does what a first
+dashboard render does: parse + clean the upload, build the cube, select the
+default filters and compute the overview aggregates. "private" repeats all of
+it per session (as if nothing were cached); "shared" goes through the
+process-wide caches, where concurrent identical requests compute once.
+    python benchmarks/bench_shared_cache.py --rows 1000000 --sessions 10
+"""
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+import ingest  # noqa: E402
+import pipeline  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube, cube_for  # noqa: E402
+from incremental import IncrementalAggregator  # noqa: E402
+
+
+def overview(view):
+    return {
+        'kpis': pipeline.kpis(view),
+        'platform_eng': pipeline.platform_analysis(view),
+        'locations': view.rollup('location').nlargest(5, 'engagements'),
+        'daily': view.rollup('day'),
+    }
+
+
+def default_selection(data_cube):
+    facets = {facet: data_cube.members(facet) for facet in ['platform', 'sentiment', 'media_type', 'post_type']}
+    return data_cube.min_day, data_cube.max_day, facets
+
+
+def private_session(data):
+    df = ingest.parse_csv(data)
+    data_cube = Cube.from_frame(df)
+    start_day, end_day, facets = default_selection(data_cube)
+    view = IncrementalAggregator().update(data_cube, start_day, end_day, **facets)
+    return overview(view)
+
+
+def shared_session(data):
+    dataset_hash, df = ingest.load_csv(data)
+    data_cube = cube_for(dataset_hash, df)
+    start_day, end_day, facets = default_selection(data_cube)
+    key = cache.selection_key(start_day, end_day, facets)
+    view = cache.shared_result(data_cube.key, key, 'view',
+                               lambda: IncrementalAggregator().update(data_cube, start_day, end_day, **facets))
+    return cache.shared_result(data_cube.key, key, 'overview', lambda: overview(view))
+
+
+def run_sessions(session, data, sessions):
+    threads = [threading.Thread(target=session, args=(data,)) for _ in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 10])
+    args = parser.parse_args()
+
+    buffer = io.StringIO()
+    synthetic.generate(args.rows, seed=42).to_csv(buffer, index=False)
+    data = buffer.getvalue().encode('utf-8')
+    print(f"rows={args.rows:,} csv={len(data) / 1e6:.0f} MB cpus={os.cpu_count()}")
+
+    for sessions in args.sessions:
+        private_s = run_sessions(private_session, data, sessions)
+        for name in ('datasets', 'cubes', 'results'):
+            cache._registry[name].clear()
+        before = {name: stats for name, stats in cache.all_stats().items()}
+        shared_s = run_sessions(shared_session, data, sessions)
+        after = cache.all_stats()
+        counts = '  '.join(
+            f"{name} {after[name].misses - before[name].misses} computed/"
+            f"{after[name].shared - before[name].shared} waited/{after[name].hits - before[name].hits} hit"
+            for name in ('datasets', 'cubes', 'results')
+        )
+        print(f"sessions={sessions:>3}   private {private_s:7.2f} s   shared {shared_s:6.2f} s   "
+              f"speedup {private_s / shared_s:5.1f}x   ({counts})")
+
+
+if __name__ == '__main__':
+    main()
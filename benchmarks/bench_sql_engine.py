@@ -0,0 +1,94 @@
+# benchmarks/bench_sql_engine.py
+"""Benchmark: dashboard aggregates on raw rows with pandas groupby, the cube, and DuckDB at 1..N threads
+
+Every engine computes what one dashboard render needs for a filtered
+selection (three of four platforms, the last half of the date range): the
+totals and the platform, location, sentiment and daily rollups (the monthly
+trend is a calendar rollup of the daily one). The DuckDB results are checked
+to be identical to the cube path. DuckDB can only scale up to the cores of
+the machine; the core count is printed with the results.
+    python benchmarks/bench_sql_engine.py --rows 10000000 --threads 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ingest  # noqa: E402
+import pipeline  # noqa: E402
+import sqlengine  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube  # noqa: E402
+from incremental import IncrementalAggregator  # noqa: E402
+
+DIMS = ['platform', 'location', 'sentiment', 'day']
+
+
+def timed(fn, repeat=3):
+    """(best seconds of `repeat` runs, result of the last one)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def aggregates(view):
+    return view.totals(), {dim: view.rollup(dim) for dim in DIMS}
+
+
+def pandas_rows(df, selection):
+    """The pre-cube way: mask the raw rows, then one groupby per chart"""
+    mask = df['day'].between(selection.start_day, selection.end_day)
+    for facet, values in selection.facets.items():
+        mask &= df[facet].isin(values)
+    rows = df[mask]
+    engagements = rows['engagements'].astype('int64')
+    return (int(engagements.sum()), len(rows)), {
+        dim: engagements.groupby(rows[dim], observed=True).agg(engagements='sum', posts='count').reset_index()
+        for dim in DIMS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    if not sqlengine.AVAILABLE:
+        sys.exit("DuckDB tidak terpasang: pip install duckdb")
+
+    df = ingest.prepare(ingest.standardize_columns(synthetic.generate(args.rows, seed=42)))
+    data_cube = Cube.from_frame(df, 'bench')
+    days = data_cube.max_day - data_cube.min_day
+    selection = pipeline.make_selection(data_cube, platform=data_cube.members('platform')[1:])
+    selection = selection._replace(start_day=data_cube.min_day + days // 2)
+    print(f"rows={len(df):,} cells={len(data_cube):,} cpus={os.cpu_count()}")
+
+    rows_s, _ = timed(lambda: pandas_rows(df, selection))
+    cube_s, expected = timed(lambda: aggregates(
+        IncrementalAggregator().update(data_cube, selection.start_day, selection.end_day, **selection.facets)
+    ))
+    print(f"  pandas groupby on rows        query {rows_s * 1000:8.1f} ms")
+    print(f"  cube (default engine)         query {cube_s * 1000:8.1f} ms")
+
+    for threads in args.threads:
+        load_s, table = timed(lambda: sqlengine.SqlTable(df, threads=threads), repeat=1)
+        sql_s, result = timed(lambda: aggregates(
+            table.view(selection.start_day, selection.end_day, **selection.facets)
+        ))
+        assert result[0] == expected[0]
+        for dim in DIMS:
+            pd.testing.assert_frame_equal(result[1][dim], expected[1][dim])
+        label = f"duckdb threads={table.threads}"
+        print(f"  {label:<29} query {sql_s * 1000:8.1f} ms   "
+              f"load {load_s:6.2f} s   vs rows {rows_s / sql_s:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_suite.py
+"""Benchmark suite: every pipeline stage at several dataset sizes, saved as JSON
+
+For each size a seeded synthetic CSV (see synthetic.py) is written to a
+temporary directory, then ingest (CSV parse), cleaning, filter index build,
+filtering, cube aggregation, chart aggregates and figure construction are
+timed separately (best of --repeat). Results go to one JSON file per run, so
+two commits can be compared:
+    python benchmarks/bench_suite.py --rows 10000 100000 1000000
+    python benchmarks/bench_suite.py --rows 10000 100000 1000000 --compare benchmarks/results/<old>.json
+
+The largest sizes (up to 50M rows) need several GB of RAM for the raw parse.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import charts  # noqa: E402
+import ingest  # noqa: E402
+import synthetic  # noqa: E402
+from bench_figures import ALWAYS, TAB_FIGURES, aggregates  # noqa: E402
+from cube import Cube  # noqa: E402
+from filters import FilterIndex  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+STAGES = ['ingest', 'clean', 'filter_index', 'filter', 'cube', 'aggregate', 'figures']
+
+
+def best_of(repeat, fn):
+    """(min seconds, last result) of `repeat` calls"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def commit_id():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sidebar_selection(df):
+    """A typical sidebar state: the last 30 days with one platform deselected"""
+    end_day = int(df['day'].max())
+    platforms = list(df['platform'].cat.categories[1:])
+    return end_day - 29, end_day, {'platform': platforms}
+
+
+def run_size(rows, seed, repeat, tmp):
+    path = os.path.join(tmp, f"synthetic_{rows}.csv")
+    csv_bytes = synthetic.write_csv(path, rows, seed)
+    seconds = {}
+
+    seconds['ingest'], raw = best_of(repeat, lambda: pd.read_csv(path))
+    seconds['clean'], df = best_of(repeat, lambda: ingest.prepare(ingest.standardize_columns(raw.copy())))
+    del raw
+
+    seconds['filter_index'], index = best_of(repeat, lambda: FilterIndex(df))
+    start_day, end_day, facets = sidebar_selection(df)
+    seconds['filter'], selected = best_of(repeat, lambda: index.select(start_day, end_day, **facets))
+
+    seconds['cube'], data_cube = best_of(repeat, lambda: Cube.from_frame(df))
+    seconds['aggregate'], agg = best_of(repeat, lambda: aggregates(data_cube))
+
+    # Every builder called directly, so the figure cache does not hide the cost
+    builders = [pair for tab in TAB_FIGURES for pair in tab] + ALWAYS
+    seconds['figures'], payload = best_of(repeat, lambda: sum(
+        len(pio.to_json(builder(agg[name]), validate=False)) for builder, name in builders
+    ))
+    os.remove(path)
+
+    return {
+        'rows': rows,
+        'rows_kept': len(df),
+        'csv_bytes': csv_bytes,
+        'selected_rows': len(selected),
+        'cube_cells': len(data_cube),
+        'figure_bytes': payload,
+        'seconds': seconds,
+    }
+
+
+def compare(results, baseline_path):
+    """Print per-stage time ratios against an earlier results file"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['rows']: r['seconds'] for r in json.load(f)['results']}
+    print(f"\nvs {os.path.basename(baseline_path)} (ratio < 1 is faster)")
+    for result in results:
+        old = baseline.get(result['rows'])
+        if old is None:
+            continue
+        ratios = '  '.join(f"{stage} {result['seconds'][stage] / old[stage]:5.2f}x"
+                           for stage in STAGES if old.get(stage))
+        print(f"{result['rows']:>12,}  {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    commit = commit_id()
+    meta = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+    results = []
+    print(f"{'rows':>12}  " + '  '.join(f"{stage:>12}" for stage in STAGES))
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            charts._figure_cache.clear()
+            result = run_size(rows, args.seed, args.repeat, tmp)
+            results.append(result)
+            print(f"{rows:>12,}  " + '  '.join(f"{result['seconds'][stage] * 1000:>10.1f}ms" for stage in STAGES))
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"-> {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
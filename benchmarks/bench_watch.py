@@ -0,0 +1,67 @@
+# benchmarks/bench_watch.py
+"""Benchmark: watch-mode refresh after an append vs. re-streaming the whole file
+
+A synthetic history of --rows rows (one year) is written and read once by a
+`watch.Watcher`; then --append rows dated on the last days of that year are
+appended, as a live export does, and the watcher refresh is timed against a
+full `streaming.stream_csv` of the grown file. The cells of both are
+checked to be identical.
+    python benchmarks/bench_watch.py --rows 100000 1000000 5000000 --append 10000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streaming  # noqa: E402
+import synthetic  # noqa: E402
+import watch  # noqa: E402
+from cube import CUBE_DIMS  # noqa: E402
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def canonical(cells):
+    cells = cells.astype({dim: str for dim in CUBE_DIMS if dim != 'day'})
+    return cells.sort_values(CUBE_DIMS, ignore_index=True)[CUBE_DIMS + ['engagements', 'posts']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--append', type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"live_{rows}.csv")
+            synthetic.write_csv(path, rows, seed=42)
+            watcher = watch.Watcher(path)
+            initial_s, _ = timed(watcher.refresh)
+
+            new_rows = synthetic.generate(args.append, seed=43, start='2023-12-25', days=7)
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                new_rows.to_csv(f, index=False, header=False)
+
+            refresh_s, (result, appended) = timed(watcher.refresh)
+            full_s, streamed = timed(lambda: streaming.stream_csv(path, campaign=streaming.source_campaign(path)))
+            assert appended == args.append
+            pd.testing.assert_frame_equal(canonical(result.cube.cells), canonical(streamed.cube.cells),
+                                          check_dtype=False)
+            print(f"history={rows:>10,} (+{args.append:,}, cells={len(result.cube):,})   "
+                  f"initial read {initial_s * 1000:8.0f} ms   refresh {refresh_s * 1000:7.1f} ms   "
+                  f"full re-stream {full_s * 1000:8.0f} ms   speedup {full_s / refresh_s:6.1f}x")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# cache.py
+"""Process-wide, memory-bounded LRU cache shared by every Streamlit session"""
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+import pandas as pd
+
+
+def sizeof(value):
+    """Approximate in-memory size of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+    if hasattr(value, 'to_plotly_json'):
+        return sizeof(value.to_plotly_json())
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+_MISSING = object()
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'shared', 'entries', 'total_bytes', 'max_bytes'])
+
+# Named caches, listed with their counters in the dashboard's Performance panel
+_registry = {}
+
+
+class MemoryLRU:
+    """Thread-safe LRU cache evicting least recently used entries above `max_bytes`.
+
+    Streamlit runs every session in its own thread but imports helper modules
+    once per process, so a module-level instance is shared across sessions.
+    Cached values are handed out as-is: callers must treat them as read-only.
+    With `ttl` (seconds) set, entries also expire that long after being stored.
+    `get_or_compute` also de-duplicates concurrent computations of one key.
+    A cache created with a `name` is listed by `all_stats`.
+    """
+
+    def __init__(self, max_bytes, max_entries=None, ttl=None, name=None):
+        if name is not None:
+            _registry[name] = self
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # Futures of the computations currently running, per key
+        self._inflight = {}
+        self.hits = self.misses = self.shared = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def stats(self):
+        return CacheStats(self.hits, self.misses, self.shared, len(self._entries), self._total_bytes,
+                          self.max_bytes)
+
+    def _lookup(self, key):
+        """Live value of `key` or _MISSING, counted as a hit or a miss; the lock must be held"""
+        if key in self._entries:
+            value, nbytes, expires_at = self._entries[key]
+            if expires_at is None or time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self._total_bytes -= nbytes
+        self.misses += 1
+        return _MISSING
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def get_or_compute(self, key, compute):
+        """Cached value of `key`, calling `compute()` once on a miss.
+
+        When several sessions miss the same key at the same time, only the
+        first one computes; the others wait for its result (counted as
+        `shared`) instead of repeating the work. If `compute` raises, every
+        waiting caller gets the exception and nothing is cached.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+            else:
+                # Waiting on another session's computation: shared, not a second miss
+                self.misses -= 1
+                self.shared += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            value = self.put(key, compute())
+        except BaseException as error:
+            with self._lock:
+                del self._inflight[key]
+            flight.set_exception(error)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        flight.set_result(value)
+        return value
+
+    def put(self, key, value):
+        nbytes = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            # A single value larger than the whole budget is never kept
+            if nbytes > self.max_bytes:
+                return value
+            expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+            self._entries[key] = (value, nbytes, expires_at)
+            self._total_bytes += nbytes
+            self._evict()
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, nbytes, _ = self._entries.pop(key)
+            self._total_bytes -= nbytes
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            self._total_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, nbytes, _) = self._entries.popitem(last=False)
+            self._total_bytes -= nbytes
+
+
+def all_stats():
+    """`CacheStats` of every named cache, by name"""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+# Aggregates, filtered views and leaderboards: small, recomputed per filter selection
+RESULT_CACHE_BYTES = 256 * 1024 * 1024
+RESULT_CACHE_ENTRIES = 4096
+
+results = MemoryLRU(RESULT_CACHE_BYTES, max_entries=RESULT_CACHE_ENTRIES, name='results')
+
+
+def selection_key(start_day, end_day, facets):
+    """Hashable form of a filter selection, independent of the order values were picked in"""
+    return (int(start_day), int(end_day),
+            tuple(sorted((facet, tuple(sorted(map(str, values)))) for facet, values in facets.items())))
+
+
+def shared_result(dataset, selection, name, compute):
+    """`compute()` through the process-wide `results` cache, keyed on (dataset, selection, name).
+
+    Sessions showing the same dataset with the same filters share one
+    computation. Data without a dataset key (e.g. demo data) is not cached.
+    """
+    if dataset is None:
+        return compute()
+    return results.get_or_compute((dataset, selection, name), compute)
@@ -0,0 +1,173 @@
+# charts.py
+"""Dashboard figures built directly with plotly.graph_objects, cached by their data
+
+`plotly.express` validates and reshapes its input frame on every call; the
+dashboard already has every chart as a small aggregate, so the traces are
+built straight from those columns. `figure()` caches the result on the data
+plus the layout parameters, which makes a rerun with unchanged filters reuse
+the previous figures.
+"""
+import hashlib
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+import profiling
+from cache import MemoryLRU
+
+SENTIMENT_COLORS = {
+    'Positive': '#22c55e',
+    'Neutral': '#6b7280',
+    'Negative': '#ef4444'
+}
+
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+_figure_cache = MemoryLRU(FIGURE_CACHE_BYTES, max_entries=512, name='figures')
+
+
+def data_key(data):
+    """Content hash of an aggregate frame, including column names and dtypes"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(col, str(dtype)) for col, dtype in data.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def figure(builder, data, **params):
+    """`builder(data, **params)`, cached on (builder, data content, params).
+
+    The same Figure object is returned on every hit, so callers must not
+    modify it.
+    """
+    with profiling.stage(f'chart.{builder.__name__}', rows=len(data)) as built:
+        key = (builder.__name__, data_key(data), tuple(sorted(params.items())))
+        built.detail = 'cache'
+
+        def build():
+            built.detail = 'build'
+            return builder(data, **params)
+
+        return _figure_cache.get_or_compute(key, build)
+
+
+def cache_info():
+    return len(_figure_cache), _figure_cache.total_bytes
+
+
+def _layout(fig, title, height, x_title=None, y_title=None, **layout):
+    fig.update_layout(title=title, height=height, margin=dict(t=60), **layout)
+    if x_title is not None:
+        fig.update_xaxes(title_text=x_title)
+    if y_title is not None:
+        fig.update_yaxes(title_text=y_title)
+    return fig
+
+
+def _color_bar(x, y, color, orientation='v'):
+    """Bar trace colored by `color` on a continuous scale, like px.bar(color=...)"""
+    return go.Bar(
+        x=x, y=y, orientation=orientation, showlegend=False,
+        marker=dict(color=color, coloraxis='coloraxis')
+    )
+
+
+def sentiment_pie(df_s, title='Distribusi Sentimen Kampanye'):
+    fig = go.Figure(go.Pie(
+        labels=df_s['sentiment'],
+        values=df_s['count'],
+        hole=0.4,
+        marker=dict(colors=[SENTIMENT_COLORS.get(s) for s in df_s['sentiment']]),
+        textposition='inside',
+        textinfo='percent+label',
+        textfont_size=12
+    ))
+    return _layout(fig, title, 400, showlegend=True, font=dict(size=12))
+
+
+def trend_line(trend_df, title='Tren Engagement Harian'):
+    fig = go.Figure(go.Scatter(
+        x=trend_df['Date'],
+        y=trend_df['Engagements'],
+        mode='lines+markers',
+        line=dict(color='#22c55e', width=3, shape='spline'),
+        marker=dict(size=6, color='#16a34a')
+    ))
+    return _layout(fig, title, 400, 'Date', 'Engagements', hovermode='x unified')
+
+
+def platform_bar(platform_eng, title='Total Engagement per Platform'):
+    fig = go.Figure(_color_bar(platform_eng['platform'], platform_eng['engagements'],
+                               platform_eng['engagements']))
+    return _layout(fig, title, 400, 'platform', 'engagements', showlegend=False,
+                   coloraxis=dict(colorscale='Greens', colorbar=dict(title='engagements')))
+
+
+def platform_pie(platform_counts, title='Distribusi Postingan per Platform'):
+    fig = go.Figure(go.Pie(labels=platform_counts['platform'], values=platform_counts['posts']))
+    return _layout(fig, title, 400, piecolorway=qualitative.Set2)
+
+
+def media_pie(media_counts, title='Distribusi Tipe Media'):
+    fig = go.Figure(go.Pie(
+        labels=media_counts['media_type'],
+        values=media_counts['count'],
+        hole=0.3,
+        textposition='inside',
+        textinfo='percent+label'
+    ))
+    return _layout(fig, title, 400, piecolorway=qualitative.Pastel)
+
+
+def media_bar(media_eng, title='Rata-rata Engagement per Tipe Media'):
+    fig = go.Figure(_color_bar(media_eng['media_type'], media_eng['engagements'],
+                               media_eng['engagements']))
+    return _layout(fig, title, 400, 'media_type', 'engagements', showlegend=False,
+                   coloraxis=dict(colorscale='Viridis', colorbar=dict(title='engagements')))
+
+
+def location_bar(top_locations, title='Top 5 Lokasi dengan Engagement Tertinggi'):
+    fig = go.Figure(_color_bar(top_locations['engagements'], top_locations['location'],
+                               top_locations['engagements'], orientation='h'))
+    return _layout(fig, title, 400, 'engagements', 'location', showlegend=False,
+                   coloraxis=dict(colorscale='Greens', colorbar=dict(title='engagements')))
+
+
+def campaign_bar(campaign_eng, title='Total Engagement per Kampanye'):
+    fig = go.Figure(_color_bar(campaign_eng['campaign'], campaign_eng['engagements'],
+                               campaign_eng['engagements']))
+    return _layout(fig, title, 400, 'campaign', 'engagements', showlegend=False,
+                   coloraxis=dict(colorscale='Blues', colorbar=dict(title='engagements')))
+
+
+def influencer_bar(leaders, title='Top Influencer'):
+    # Best first from the top: horizontal bars are drawn bottom-up
+    metric = leaders.columns[1]
+    leaders = leaders.iloc[::-1]
+    fig = go.Figure(_color_bar(leaders[metric], leaders['influencer'], leaders[metric], orientation='h'))
+    return _layout(fig, title, max(400, 28 * len(leaders)), metric, 'influencer', showlegend=False,
+                   coloraxis=dict(colorscale='Greens', colorbar=dict(title=metric)))
+
+
+def sentiment_bar(sentiment_eng, title='Rata-rata Engagement per Sentiment'):
+    # One trace per sentiment, so each bar keeps its own color
+    fig = go.Figure([
+        go.Bar(x=[row.sentiment], y=[row.avg_engagement], name=row.sentiment,
+               marker=dict(color=SENTIMENT_COLORS.get(row.sentiment)))
+        for row in sentiment_eng.itertuples(index=False)
+    ])
+    return _layout(fig, title, 350, 'sentiment', 'avg_engagement', showlegend=False)
+
+
+def monthly_line(monthly_eng, title='Tren Engagement Bulanan'):
+    fig = go.Figure(go.Scatter(
+        x=monthly_eng['month'],
+        y=monthly_eng['engagements'],
+        mode='lines+markers',
+        line=dict(color='#16a34a', width=3),
+        marker=dict(size=8, color='#22c55e')
+    ))
+    fig = _layout(fig, title, 350, 'month', 'engagements')
+    fig.update_xaxes(tickangle=45)
+    return fig
@@ -0,0 +1,91 @@
+# comparison.py
+"""Period-over-period KPIs answered from prefix sums over daily totals
+
+For one facet selection, `CumulativeIndex` holds running totals of posts,
+engagements and positive posts for every day of the dataset. The KPIs of
+any date window, the selected one or the equally long window just before
+it, are then two array lookups instead of another filter-and-aggregate pass.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from cache import MemoryLRU
+
+COMPARISON_CACHE_BYTES = 64 * 1024 * 1024
+
+_index_cache = MemoryLRU(COMPARISON_CACHE_BYTES, max_entries=256, name='comparison')
+
+
+class Kpis(namedtuple('Kpis', ['posts', 'engagements', 'positive_posts'])):
+    """Dashboard KPIs of one date window"""
+
+    @property
+    def avg_engagement(self):
+        return int(self.engagements / self.posts) if self.posts > 0 else 0
+
+    @property
+    def positive_pct(self):
+        return self.positive_posts / self.posts * 100 if self.posts > 0 else 0.0
+
+
+def previous_window(start_day, end_day):
+    """The window of the same length ending the day before `start_day`"""
+    length = end_day - start_day + 1
+    return start_day - length, start_day - 1
+
+
+class CumulativeIndex:
+    """Prefix sums of daily posts, engagements and positive posts.
+
+    `cells` are cube cells (already limited to one facet selection);
+    days outside [first_day, last_day] count as zero.
+    """
+
+    def __init__(self, cells, first_day, last_day):
+        self.first_day = int(first_day)
+        self.last_day = int(last_day)
+        size = self.last_day - self.first_day + 1
+        days = cells['day'].to_numpy(dtype=np.int64) - self.first_day
+        positive = (cells['sentiment'] == 'Positive').to_numpy()
+
+        daily = np.zeros((3, size), dtype=np.int64)
+        for i, weights in enumerate([
+            cells['posts'].to_numpy(dtype=np.float64),
+            cells['engagements'].to_numpy(dtype=np.float64),
+            np.where(positive, cells['posts'].to_numpy(dtype=np.float64), 0),
+        ]):
+            daily[i] = np.rint(np.bincount(days, weights=weights, minlength=size))
+
+        # cumulative[:, k] is the total of the first k days, so cumulative[:, 0] == 0
+        self.cumulative = np.zeros((3, size + 1), dtype=np.int64)
+        np.cumsum(daily, axis=1, out=self.cumulative[:, 1:])
+
+    @property
+    def nbytes(self):
+        return self.cumulative.nbytes
+
+    def window(self, start_day, end_day):
+        """`Kpis` of [start_day, end_day] in O(1)"""
+        start = min(max(start_day - self.first_day, 0), self.cumulative.shape[1] - 1)
+        end = min(max(end_day - self.first_day + 1, 0), self.cumulative.shape[1] - 1)
+        if end <= start:
+            return Kpis(0, 0, 0)
+        totals = self.cumulative[:, end] - self.cumulative[:, start]
+        return Kpis(*(int(total) for total in totals))
+
+    def compare(self, start_day, end_day):
+        """(current, previous) `Kpis` for the window and the one before it"""
+        return self.window(start_day, end_day), self.window(*previous_window(start_day, end_day))
+
+
+def index_for(data_cube, **facets):
+    """`CumulativeIndex` of a cube under a facet selection, cached per dataset"""
+    def build():
+        cells = data_cube.slice(data_cube.min_day, data_cube.max_day, **facets).cells
+        return CumulativeIndex(cells, data_cube.min_day, data_cube.max_day)
+
+    if data_cube.key is None:
+        return build()
+    key = (data_cube.key, tuple(sorted((f, frozenset(v)) for f, v in facets.items())))
+    return _index_cache.get_or_compute(key, build)
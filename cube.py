@@ -0,0 +1,168 @@
+# cube.py
+"""Pre-aggregated engagement cells (day × dimensions) that every chart reads from"""
+import numpy as np
+import pandas as pd
+
+import profiling
+from cache import MemoryLRU
+from filters import FilterIndex
+from timebuckets import Calendar
+
+CUBE_DIMS = ['day', 'platform', 'sentiment', 'media_type', 'location', 'campaign', 'brand', 'post_type']
+MEASURES = ['engagements', 'posts']
+
+
+def build_cells(df, dims=CUBE_DIMS):
+    """Aggregate cleaned rows into one sum/count cell per distinct dimension tuple"""
+    # Sum in int64: engagements may be downcast to int16/int32 by the compact schema
+    engagements = df['engagements'].astype(np.int64)
+    cells = engagements.groupby([df[col] for col in dims], observed=True, sort=False).agg(
+        engagements='sum', posts='count'
+    )
+    return _sort_by_day(cells.reset_index())
+
+
+def _sort_by_day(cells):
+    """Cells ordered by day, so date ranges resolve with a binary search"""
+    return cells.sort_values('day', kind='stable', ignore_index=True)
+
+
+def align_categories(frames, dims=CUBE_DIMS):
+    """Give every categorical dimension the same (sorted union) categories"""
+    frames = list(frames)
+    for col in dims:
+        if not all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames):
+            continue
+        categories = frames[0][col].cat.categories
+        if all(f[col].cat.categories.equals(categories) for f in frames[1:]):
+            continue
+        union = pd.api.types.union_categoricals([f[col] for f in frames], sort_categories=True).categories
+        frames = [f.assign(**{col: f[col].cat.set_categories(union)}) for f in frames]
+    return frames
+
+
+def merge_cells(parts, dims=CUBE_DIMS):
+    """Combine partial cell frames (e.g. one per CSV chunk) into a single frame"""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=dims + MEASURES)
+    if len(parts) == 1:
+        return parts[0]
+    combined = pd.concat(align_categories(parts, dims), ignore_index=True)
+    return _sort_by_day(combined.groupby(dims, observed=True, sort=False)[MEASURES].sum().reset_index())
+
+
+def append_cells(cells, new, dims=CUBE_DIMS):
+    """Fold `new` cells into day-sorted `cells`, regrouping only the days from the earliest new one.
+
+    Rows appended to a live export are nearly all recent, so the cells before
+    that day are copied as they are and the cost follows the new rows rather
+    than the history.
+    """
+    if not len(new):
+        return cells
+    if not len(cells):
+        return new
+    cells, new = align_categories([cells, new], dims)
+    split = int(np.searchsorted(cells['day'].to_numpy(), new['day'].min(), side='left'))
+    tail = merge_cells([cells.iloc[split:], new], dims)
+    return pd.concat([cells.iloc[:split], tail], ignore_index=True)
+
+
+def rollup(cells, by):
+    """Sum engagements and posts over every dimension not in `by`"""
+    return cells.groupby(by, observed=True)[MEASURES].sum().reset_index()
+
+
+class Cube:
+    """Day × platform × sentiment × media_type × location × campaign × brand × post_type sum/count cells.
+
+    Built once per dataset; every filter change slices the cells and every
+    KPI or chart is a rollup of the slice, so the cost of a rerun scales with
+    the number of cells rather than the number of raw rows. Other groupings
+    of the same rows (see influencers.py) pass their own `dims`.
+    """
+
+    def __init__(self, cells, key=None):
+        self.cells = cells
+        # Identifies the dataset a cached cube was built from; slices have none
+        self.key = key
+        self._index = None
+        self._calendar = None
+
+    @classmethod
+    def from_frame(cls, df, key=None, dims=CUBE_DIMS):
+        return cls(build_cells(df, dims), key)
+
+    def __len__(self):
+        return len(self.cells)
+
+    @property
+    def index(self):
+        """`FilterIndex` over the cells, built on first use"""
+        if self._index is None:
+            self._index = FilterIndex(self.cells)
+        return self._index
+
+    @property
+    def calendar(self):
+        """Period codes for every day of the cube's range, built on first use"""
+        if self._calendar is None:
+            self._calendar = Calendar(self.min_day, self.max_day)
+        return self._calendar
+
+    @property
+    def nbytes(self):
+        index_bytes = 0 if self._index is None else self._index.nbytes
+        calendar_bytes = 0 if self._calendar is None else self._calendar.nbytes
+        return int(self.cells.memory_usage(index=True, deep=True).sum()) + index_bytes + calendar_bytes
+
+    @property
+    def empty(self):
+        return self.cells.empty
+
+    @property
+    def min_day(self):
+        return int(self.cells['day'].min())
+
+    @property
+    def max_day(self):
+        return int(self.cells['day'].max())
+
+    def members(self, dim):
+        """Distinct values present for a dimension, sorted"""
+        return sorted(self.cells[dim].unique())
+
+    def slice(self, start_day, end_day, **facets):
+        """Cells within [start_day, end_day] whose dimensions are in the given value lists"""
+        return Cube(self.cells.iloc[self.index.select(start_day, end_day, **facets)])
+
+    def totals(self):
+        """(total engagements, total posts) of the whole cube"""
+        return int(self.cells['engagements'].sum()), int(self.cells['posts'].sum())
+
+    def rollup(self, by):
+        return rollup(self.cells, by)
+
+
+# Cubes are much smaller than the frames they summarize
+CUBE_CACHE_BYTES = 256 * 1024 * 1024
+
+_cube_cache = MemoryLRU(CUBE_CACHE_BYTES, max_entries=32, name='cubes')
+
+
+def cube_for(dataset_hash, df):
+    """Cached `Cube.from_frame`, built once per dataset hash"""
+    if dataset_hash is None:
+        return Cube.from_frame(df)
+
+    def build():
+        with profiling.stage('cube.build', rows=len(df)) as built:
+            data_cube = Cube.from_frame(df, dataset_hash)
+            # Build before caching so their size is accounted for
+            data_cube.index
+            data_cube.calendar
+            built.detail = f"{len(data_cube):,} sel"
+        return data_cube
+
+    return _cube_cache.get_or_compute(dataset_hash, build)
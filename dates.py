@@ -0,0 +1,216 @@
+# dates.py
+"""Date parsing with format inference: one fixed format for the column, fallback per distinct value
+
+`pd.to_datetime(..., errors='coerce')` guesses a format from the first value
+and turns every row written differently into NaT, or parses element by
+element when no format can be guessed. Here the column is factorized first,
+the format is inferred from a sample of the distinct strings (each weighted
+by its row count) and applied to all of them at once, and only the distinct strings it cannot read go through
+the flexible per-value parser. Rows are then a single integer take, and the
+`DateReport` says how many rows needed the fallback or were dropped, and why.
+"""
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil import parser as dateutil_parser
+
+# Tried in order; on a tie (e.g. every day <= 12) the earlier format wins,
+# so month-first comes before day-first as in pd.to_datetime
+CANDIDATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%m/%d/%Y %H:%M',
+    '%d/%m/%Y %H:%M',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%Y%m%d',
+]
+
+# Distinct values used to pick the format
+SAMPLE_SIZE = 256
+
+# Unparseable values listed in the report
+MAX_EXAMPLES = 5
+
+
+class DateReport(namedtuple('DateReport', [
+    'rows', 'date_format', 'fast_rows', 'fallback_rows', 'missing_rows', 'invalid_rows', 'invalid_examples',
+    'ambiguous'
+], defaults=(False,))):
+    """How the rows of a date column were parsed.
+
+    `fast_rows` matched the inferred `date_format`; `fallback_rows` were read
+    by the per-value parser; `missing_rows` were empty and `invalid_rows`
+    could not be read at all. Both of the latter are dropped by ingest.
+    `ambiguous` means another candidate format fit as many rows (e.g. every
+    day <= 12), so the format should not be reused for later chunks.
+    """
+
+    @property
+    def dropped_rows(self):
+        return self.missing_rows + self.invalid_rows
+
+
+def _matches(text, fmt):
+    try:
+        datetime.strptime(text, fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def infer_format(texts, counts=None, formats=CANDIDATE_FORMATS, sample_size=SAMPLE_SIZE):
+    """`(format, ambiguous)`: the candidate parsing the most rows of an evenly spaced sample of distinct strings.
+
+    Each string counts for its number of rows in `counts` (once without), so
+    a format used by a minority of rows does not win because it has as many
+    distinct values. `ambiguous` is True when another candidate parses as
+    many rows with different dates; the earlier one in `formats` is returned. The format is None
+    when no candidate parses anything.
+    """
+    texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+    weights = np.ones(len(texts), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+    filled = (texts != '').to_numpy()
+    texts, weights = texts[filled], weights[filled]
+    if texts.empty:
+        return None, False
+    if len(texts) > sample_size:
+        sample = np.linspace(0, len(texts) - 1, sample_size).astype(np.int64)
+        texts, weights = texts.iloc[sample], weights[sample]
+    total, first = int(weights.sum()), texts.iloc[0]
+    best, best_hits, best_parsed, ambiguous = None, 0, None, False
+    for fmt in formats:
+        if best_hits == total and not _matches(first, fmt):
+            # After a complete match only a format reading every string can tie
+            continue
+        parsed = pd.to_datetime(texts, format=fmt, errors='coerce')
+        hits = int(weights[parsed.notna().to_numpy()].sum())
+        if hits > best_hits:
+            best, best_hits, best_parsed, ambiguous = fmt, hits, parsed, False
+        elif hits and hits == best_hits and not parsed.equals(best_parsed):
+            # e.g. day-first and month-first when every day is <= 12 ('%b' and '%B' for May agree)
+            ambiguous = True
+    return best, ambiguous
+
+
+def _parse_flexible(text):
+    """Per-value parse of one string that does not match the inferred format, or NaT"""
+    # Year-first strings are ISO-like; anything else is read day-first
+    yearfirst = text[:4].isdigit()
+    try:
+        parsed = dateutil_parser.parse(text, dayfirst=not yearfirst, yearfirst=yearfirst)
+        # Keep the wall-clock time of values with an offset: the dashboard works on local days
+        return pd.Timestamp(parsed.replace(tzinfo=None))
+    except (ValueError, OverflowError, pd.errors.OutOfBoundsDatetime):
+        return pd.NaT
+
+
+def _to_ns(parsed):
+    """`datetime64[ns]` series; values outside its range (years before 1677 or after 2262) become NaT"""
+    parsed = parsed.where((parsed >= pd.Timestamp.min) & (parsed <= pd.Timestamp.max))
+    return parsed.astype('datetime64[ns]')
+
+
+def parse_dates(values, date_format=None):
+    """Parse a column of date strings into `datetime64[ns]`; returns `(dates, DateReport)`.
+
+    `date_format` skips inference (e.g. when streaming later chunks of a file
+    whose format was inferred, unambiguously, from an earlier chunk).
+    Unreadable and empty values become NaT.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        dates = values.astype('datetime64[ns]')
+        missing = int(dates.isna().sum())
+        return dates, DateReport(len(values), None, len(values) - missing, 0, missing, 0, [], False)
+
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    texts = pd.Series(pd.Index(uniques).astype(str), dtype=object).str.strip()
+
+    ambiguous = False
+    if date_format is None:
+        date_format, ambiguous = infer_format(texts, counts)
+    if date_format is None:
+        parsed = pd.Series(pd.NaT, index=texts.index, dtype='datetime64[ns]')
+    else:
+        parsed = _to_ns(pd.to_datetime(texts, format=date_format, errors='coerce'))
+    fast = parsed.notna().to_numpy()
+
+    retry = ~fast & (texts != '').to_numpy()
+    if retry.any() and date_format is not None:
+        # Rows in a second format (e.g. another export appended) are read in one go when it is unambiguous
+        other_format, other_ambiguous = infer_format(texts[retry], counts[retry])
+        if other_format is not None and not other_ambiguous:
+            parsed[retry] = _to_ns(pd.to_datetime(texts[retry], format=other_format, errors='coerce')).to_numpy()
+            retry &= parsed.isna().to_numpy()
+    if retry.any():
+        parsed[retry] = _to_ns(pd.Series([_parse_flexible(text) for text in texts[retry]], dtype='datetime64[us]')).to_numpy()
+    ok = parsed.notna().to_numpy()
+    invalid = ~ok & (texts != '').to_numpy()
+
+    # factorize marks missing values with -1, which indexes this trailing NaT
+    lookup = np.append(parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    dates = pd.Series(lookup[codes], index=values.index, name=values.name)
+
+    invalid_counts = counts[invalid]
+    examples = texts[invalid].iloc[np.argsort(-invalid_counts, kind='stable')[:MAX_EXAMPLES]]
+    fast_rows = int(counts[fast].sum())
+    fallback_rows = int(counts[ok & ~fast].sum())
+    invalid_rows = int(invalid_counts.sum())
+    return dates, DateReport(
+        rows=len(values),
+        date_format=date_format,
+        fast_rows=fast_rows,
+        fallback_rows=fallback_rows,
+        # NaN cells and empty strings
+        missing_rows=len(values) - fast_rows - fallback_rows - invalid_rows,
+        invalid_rows=invalid_rows,
+        invalid_examples=list(examples),
+        ambiguous=ambiguous,
+    )
+
+
+def merge_reports(reports):
+    """One `DateReport` for several files or chunks"""
+    reports = [r for r in reports if r is not None]
+    if not reports:
+        return None
+    formats = {r.date_format for r in reports}
+    examples = []
+    for r in reports:
+        examples.extend(e for e in r.invalid_examples if e not in examples)
+    return DateReport(
+        rows=sum(r.rows for r in reports),
+        date_format=formats.pop() if len(formats) == 1 else 'campuran',
+        fast_rows=sum(r.fast_rows for r in reports),
+        fallback_rows=sum(r.fallback_rows for r in reports),
+        missing_rows=sum(r.missing_rows for r in reports),
+        invalid_rows=sum(r.invalid_rows for r in reports),
+        invalid_examples=examples[:MAX_EXAMPLES],
+        ambiguous=all(r.ambiguous for r in reports),
+    )
+
+
+def describe(report):
+    """Short Indonesian summary line for the dashboard"""
+    text = f"format `{report.date_format}`" if report.date_format else "format tidak terdeteksi"
+    if report.ambiguous:
+        text += " (ambigu: hari dan bulan sama-sama ≤ 12, dibaca bulan lebih dulu)"
+    if report.fallback_rows:
+        text += f" • {report.fallback_rows:,} baris dibaca dengan parser fleksibel"
+    if report.dropped_rows:
+        text += f" • {report.dropped_rows:,} baris dibuang"
+    return text
@@ -0,0 +1,100 @@
+# downsample.py
+"""Adaptive resampling of time series before they are sent to the browser
+
+A trend chart only needs as many points as it has pixels. The daily series is
+first rolled up to day, week or month (see timebuckets) depending on the
+selected range and then thinned with Largest-Triangle-Three-Buckets (LTTB),
+which keeps the visual shape. The maximum and minimum bucket are always kept.
+At day granularity the plotted peak is therefore the "Peak Engagement" /
+"Best Day" of the metrics; at week or month granularity (chosen by 'auto'
+for ranges over 366 days) it is the largest weekly or monthly sum instead.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from schema import EPOCH_DAY
+from timebuckets import Calendar, period_start_days
+
+GRANULARITIES = ['day', 'week', 'month']
+GRANULARITY_LABELS = {'day': 'Harian', 'week': 'Mingguan', 'month': 'Bulanan'}
+
+# Longest range (in days) shown at each granularity in 'auto' mode
+AUTO_MAX_SPAN = {'day': 366, 'week': 4 * 366}
+
+# Maximum points per trace after LTTB
+POINT_BUDGET = 500
+
+Trend = namedtuple('Trend', ['frame', 'granularity', 'buckets', 'days'])
+
+
+def pick_granularity(start_day, end_day):
+    """Finest granularity whose bucket count stays readable for the range"""
+    span = end_day - start_day + 1
+    for granularity, max_span in AUTO_MAX_SPAN.items():
+        if span <= max_span:
+            return granularity
+    return 'month'
+
+
+def lttb(x, y, threshold):
+    """Indices of the `threshold` points kept by Largest-Triangle-Three-Buckets"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # First and last points are fixed; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def downsample(x, y, budget=POINT_BUDGET):
+    """LTTB indices plus the positions of the maximum and minimum"""
+    y = np.asarray(y)
+    if len(y) <= budget:
+        return np.arange(len(y))
+    return np.union1d(lttb(x, y, budget), [y.argmax(), y.argmin()])
+
+
+def trend(days, values, granularity='auto', budget=POINT_BUDGET, calendar=None):
+    """Chart-ready `Date`/`Engagements` frame for a daily series.
+
+    `days` are day indexes (see `schema.to_day_index`); pass the dataset's
+    `Calendar` (`Cube.calendar`) to reuse its period codes. Returns a `Trend`
+    with the frame, the granularity used, the bucket count before LTTB and
+    the number of input days.
+    """
+    days = np.asarray(days)
+    values = np.asarray(values)
+    if not len(days):
+        return Trend(pd.DataFrame({'Date': [], 'Engagements': []}), 'day', 0, 0)
+    if granularity == 'auto':
+        granularity = pick_granularity(days.min(), days.max())
+    if calendar is None:
+        calendar = Calendar(days.min(), days.max())
+
+    codes, sums = calendar.rollup(days, values, granularity)
+    starts = period_start_days(codes, granularity)
+    kept = downsample(starts, sums, budget)
+    dates = (EPOCH_DAY + starts[kept].astype('timedelta64[D]')).astype(object)
+    frame = pd.DataFrame({'Date': dates, 'Engagements': sums[kept]})
+    return Trend(frame, granularity, len(starts), len(days))
+
+
+def figure_bytes(fig):
+    """Size of the JSON Streamlit sends to the browser for a Plotly figure"""
+    return len(fig.to_json())
@@ -0,0 +1,76 @@
+# explorer.py
+"""Server-side search, sort and pagination over the selected rows of a frame
+
+The browser only ever receives one page. A search matches the text against
+the distinct values of each column (the categories of a categorical, the
+distinct days of a date column) and turns the hits into a code lookup over
+the selected rows; a sort is one stable argsort of integer sort keys. Both
+return positions into the frame, which callers cache per (selection,
+search, sort) so paging is a slice of them.
+"""
+import numpy as np
+import pandas as pd
+
+from exports import positions
+from schema import DERIVED_COLS
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def _category_hits(labels, text):
+    """Boolean per label (plus a trailing False for missing values) of labels containing `text`"""
+    hits = np.fromiter((text in str(label).casefold() for label in labels), dtype=bool, count=len(labels))
+    return np.append(hits, False)
+
+
+def match(df, rows, text):
+    """Positions among the selected `rows` where any text or date column contains `text`, case-insensitive"""
+    text = text.strip().casefold()
+    if not text:
+        return positions(df, rows)
+    selected = np.asarray(positions(df, rows))
+    keep = np.zeros(len(selected), dtype=bool)
+    for col in df.columns.drop(DERIVED_COLS, errors='ignore'):
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            hits = _category_hits(values.cat.categories, text)
+            if hits.any():
+                keep |= hits[values.cat.codes.to_numpy()[selected]]
+        elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+            codes, days = pd.factorize(values.to_numpy()[selected])
+            hits = _category_hits(pd.DatetimeIndex(days).strftime('%Y-%m-%d'), text)
+            if hits.any():
+                keep |= hits[codes]
+        elif pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+            keep |= values.iloc[selected].astype(str).str.casefold().str.contains(text, regex=False).to_numpy()
+    return selected[keep]
+
+
+def sort_key(values):
+    """Integer or float keys ordering a column: categories by label, dates by time, numbers by value"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Category codes follow insertion order; rank the labels instead, missing values last
+        ranks = np.argsort(np.argsort(np.asarray(values.cat.categories, dtype=str), kind='stable'))
+        return np.append(ranks, len(ranks))[values.cat.codes.to_numpy()]
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.to_numpy().view(np.int64)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.to_numpy()
+    return sort_key(values.astype('category'))
+
+
+def order(df, selected, column=None, ascending=True):
+    """`selected` positions sorted by `column` (stable, so ties keep the frame order)"""
+    if column is None:
+        return selected
+    selected = np.asarray(selected)
+    keys = sort_key(df[column])[selected]
+    if not ascending:
+        # Negated as int64 so unsigned (downcast) columns do not wrap around
+        keys = -keys.astype(np.int64) if keys.dtype.kind in 'biu' else -keys
+    return selected[np.argsort(keys, kind='stable')]
+
+
+def page(df, ordered, number, size):
+    """Rows of page `number` (0-based) of the ordered positions, derived columns dropped"""
+    return df.iloc[ordered[number * size:(number + 1) * size]].drop(columns=DERIVED_COLS, errors='ignore')
@@ -0,0 +1,89 @@
+# exports.py
+"""Chunked exports of selected rows as CSV, gzip-compressed CSV or Parquet
+
+`df.iloc[rows].to_csv(index=False)` copies every selected row and then
+builds one string as large as the whole file next to that copy. Here the
+selected positions are taken EXPORT_CHUNK_ROWS at a time, each chunk is
+encoded and written before the next one is taken, and the output goes to a
+temporary file that stays in memory while small and spills to disk when
+large, so the working memory of an export is one chunk.
+"""
+import gzip
+import io
+import tempfile
+from collections import namedtuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import DERIVED_COLS
+
+EXPORT_CHUNK_ROWS = 100_000
+
+# Exports up to this size stay in memory; larger ones are written to disk
+SPOOL_BYTES = 32 * 1024 * 1024
+
+# zlib's default level: nearly the size of level 9 (gzip's default) at about half the time
+GZIP_LEVEL = 6
+
+ExportFormat = namedtuple('ExportFormat', ['label', 'extension', 'mime'])
+
+FORMATS = {
+    'csv': ExportFormat('CSV', '.csv', 'text/csv'),
+    'csv.gz': ExportFormat('CSV (gzip)', '.csv.gz', 'application/gzip'),
+    'parquet': ExportFormat('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def positions(df, rows):
+    """Selected positions as a sliceable sequence: a `range` for a slice, else the array itself"""
+    return range(len(df))[rows] if isinstance(rows, slice) else rows
+
+
+def chunks(df, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Frames of at most `chunk_rows` selected rows, derived columns dropped, in selection order"""
+    selected = positions(df, rows)
+    for start in range(0, len(selected), chunk_rows):
+        yield df.iloc[selected[start:start + chunk_rows]].drop(columns=DERIVED_COLS, errors='ignore')
+
+
+def write(df, rows, out, fmt='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write the selected rows of `df` to the binary file object `out`; returns the rows written"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    # An empty selection still gets the header / schema
+    parts = chunks(df, rows, chunk_rows) if len(positions(df, rows)) else [
+        df.iloc[:0].drop(columns=DERIVED_COLS, errors='ignore')
+    ]
+    written = 0
+
+    if fmt == 'parquet':
+        writer = None
+        for chunk in parts:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+        writer.close()
+        return written
+
+    # mtime=0 keeps the gzip bytes identical for identical data
+    stream = gzip.GzipFile(fileobj=out, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) if fmt == 'csv.gz' else out
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    for i, chunk in enumerate(parts):
+        chunk.to_csv(text, index=False, header=(i == 0))
+        written += len(chunk)
+    text.flush()
+    text.detach()
+    if stream is not out:
+        stream.close()
+    return written
+
+
+def export_bytes(df, rows, fmt='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Contents of an export, written chunk by chunk through a spooled temporary file"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as out:
+        write(df, rows, out, fmt, chunk_rows)
+        out.seek(0)
+        return out.read()
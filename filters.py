@@ -0,0 +1,91 @@
+# filters.py
+"""Index-accelerated sidebar filters: date binary search + categorical code lookups"""
+import numpy as np
+
+from cache import MemoryLRU
+
+FACETS = ['platform', 'sentiment', 'media_type', 'campaign', 'brand', 'post_type']
+
+
+class FilterIndex:
+    """Rows of a frame sorted once by `day`, with the facet codes in the same order.
+
+    A date range resolves to one contiguous block via binary search, and each
+    facet is a lookup of the block's category codes in a small boolean table,
+    so neither step touches rows outside the selected dates. `select` returns
+    row positions into the original frame; nothing is copied until the caller
+    takes them.
+    """
+
+    def __init__(self, frame, facets=FACETS):
+        days = frame['day'].to_numpy()
+        position_dtype = np.int32 if len(frame) < np.iinfo(np.int32).max else np.int64
+        if len(days) and np.all(days[:-1] <= days[1:]):
+            self.order = None
+            self.days = days
+        else:
+            self.order = np.argsort(days, kind='stable').astype(position_dtype)
+            self.days = days[self.order]
+
+        self.categories = {}
+        self.codes = {}
+        for facet in facets:
+            values = frame[facet]
+            self.categories[facet] = values.cat.categories
+            codes = values.cat.codes.to_numpy()
+            self.codes[facet] = codes if self.order is None else codes[self.order]
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        order_bytes = 0 if self.order is None else self.order.nbytes
+        return order_bytes + self.days.nbytes + sum(c.nbytes for c in self.codes.values())
+
+    def date_bounds(self, start_day, end_day):
+        """[lo, hi) positions in day order covering start_day..end_day inclusive"""
+        # Keys must match the array dtype, otherwise numpy casts the whole array
+        lo = int(np.searchsorted(self.days, self.days.dtype.type(start_day), side='left'))
+        hi = int(np.searchsorted(self.days, self.days.dtype.type(end_day), side='right'))
+        return lo, hi
+
+    def select(self, start_day, end_day, **facets):
+        """Row positions (in day order) matching the date range and facet value lists.
+
+        Facets whose selection covers every category are skipped. When no
+        facet needs checking on an already day-sorted frame the result is a
+        `slice`, which `frame.iloc` turns into a view.
+        """
+        lo, hi = self.date_bounds(start_day, end_day)
+        keep = None
+        for facet, values in facets.items():
+            categories = self.categories[facet]
+            allowed = np.zeros(len(categories) + 1, dtype=bool)
+            positions = categories.get_indexer(list(values))
+            allowed[positions[positions >= 0]] = True
+            if allowed[:-1].all():
+                continue
+            # Missing values have code -1, which hits the trailing False slot
+            matched = allowed[self.codes[facet][lo:hi]]
+            keep = matched if keep is None else keep & matched
+
+        if keep is None:
+            if self.order is None:
+                return slice(lo, hi)
+            return self.order[lo:hi]
+        rows = np.flatnonzero(keep) + lo
+        return rows if self.order is None else self.order[rows]
+
+
+# Row indexes of cached datasets: positions + codes, a fraction of the frame size
+INDEX_CACHE_BYTES = 256 * 1024 * 1024
+
+_index_cache = MemoryLRU(INDEX_CACHE_BYTES, max_entries=16, name='filter_index')
+
+
+def index_for(dataset_hash, df):
+    """Cached `FilterIndex` for a dataset, built once per dataset hash"""
+    if dataset_hash is None:
+        return FilterIndex(df)
+    return _index_cache.get_or_compute(dataset_hash, lambda: FilterIndex(df))
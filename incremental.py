@@ -0,0 +1,162 @@
+# incremental.py
+"""Delta-aware KPI and group aggregates that follow sidebar filter changes"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from cube import MEASURES
+
+GROUP_DIMS = ['day', 'platform', 'sentiment', 'media_type', 'location', 'campaign', 'brand', 'post_type']
+
+FilterState = namedtuple('FilterState', ['dataset', 'start_day', 'end_day', 'facets'])
+
+
+class Aggregates:
+    """Engagement/post totals of a cube slice per member of every group dimension.
+
+    Sums are dense int64 arrays laid out by the base cube (category codes, or
+    days since the cube's first day), so adding or subtracting a delta slice
+    is a `bincount` over the delta cells plus an array add.
+    """
+
+    def __init__(self, base, sums):
+        self.base = base
+        self.sums = sums
+
+    @classmethod
+    def of(cls, base, cells):
+        return cls(base, {dim: _bincount(base, cells, dim) for dim in GROUP_DIMS})
+
+    def combine(self, cells, sign):
+        """New aggregates with `cells` added (sign=1) or removed (sign=-1)"""
+        if cells.empty:
+            return self
+        return Aggregates(self.base, {
+            dim: self.sums[dim] + sign * _bincount(self.base, cells, dim)
+            for dim in GROUP_DIMS
+        })
+
+    @property
+    def nbytes(self):
+        # The base cube is shared with the cube cache and not counted here
+        return sum(sums.nbytes for sums in self.sums.values())
+
+    @property
+    def empty(self):
+        return self.totals()[1] == 0
+
+    def totals(self):
+        """(total engagements, total posts)"""
+        engagements, posts = self.sums['platform'].sum(axis=1)
+        return int(engagements), int(posts)
+
+    def rollup(self, dim):
+        """Same frame as `Cube.rollup(dim)`: one row per member with posts"""
+        engagements, posts = self.sums[dim]
+        present = posts > 0
+        labels = _labels(self.base, dim)[present]
+        if dim != 'day':
+            labels = pd.Categorical(labels, categories=self.base.cells[dim].cat.categories)
+        return pd.DataFrame({
+            dim: labels,
+            'engagements': engagements[present],
+            'posts': posts[present],
+        })
+
+
+def _labels(base, dim):
+    if dim == 'day':
+        return np.arange(base.min_day, base.max_day + 1, dtype=np.int32)
+    return np.asarray(base.cells[dim].cat.categories, dtype=object)
+
+
+def _bincount(base, cells, dim):
+    if dim == 'day':
+        codes = cells['day'].to_numpy() - base.min_day
+    else:
+        codes = cells[dim].cat.codes.to_numpy()
+    size = len(_labels(base, dim))
+    sums = np.empty((len(MEASURES), size), dtype=np.int64)
+    for i, measure in enumerate(MEASURES):
+        weights = cells[measure].to_numpy(dtype=np.float64)
+        sums[i] = np.rint(np.bincount(codes, weights=weights, minlength=size))
+    return sums
+
+
+def _day_ranges(start, end, other_start, other_end):
+    """Inclusive day ranges covered by [start, end] but not by [other_start, other_end]"""
+    ranges = []
+    if start < other_start:
+        ranges.append((start, min(end, other_start - 1)))
+    if end > other_end:
+        ranges.append((max(start, other_end + 1), end))
+    return ranges
+
+
+class IncrementalAggregator:
+    """Keeps the last filter state and its aggregates for one session.
+
+    When only one facet changes, or only the date range moves while still
+    overlapping the previous one, just the cells entering or leaving the
+    selection are sliced and added to / subtracted from the previous
+    aggregates. Anything else falls back to a full slice of the cube.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.aggregates = None
+        self.last_update = None
+
+    def update(self, data_cube, start_day, end_day, **facets):
+        state = FilterState(
+            data_cube.key, start_day, end_day,
+            {facet: frozenset(values) for facet, values in facets.items()}
+        )
+        deltas = self._deltas(self.state, state)
+
+        if deltas is None:
+            view = data_cube.slice(start_day, end_day, **state.facets)
+            aggregates = Aggregates.of(data_cube, view.cells)
+            self.last_update = 'full'
+        else:
+            aggregates = self.aggregates
+            for sign, delta_start, delta_end, delta_facets in deltas:
+                delta = data_cube.slice(delta_start, delta_end, **delta_facets)
+                aggregates = aggregates.combine(delta.cells, sign)
+            self.last_update = 'delta' if deltas else 'unchanged'
+
+        self.state, self.aggregates = state, aggregates
+        return aggregates
+
+    @staticmethod
+    def _deltas(prev, state):
+        """(sign, start_day, end_day, facets) slices turning `prev` into `state`, or None"""
+        if prev is None or state.dataset is None or prev.dataset != state.dataset:
+            return None
+        if prev.facets.keys() != state.facets.keys():
+            return None
+
+        changed = [f for f in state.facets if state.facets[f] != prev.facets[f]]
+        same_dates = (prev.start_day, prev.end_day) == (state.start_day, state.end_day)
+
+        if same_dates and len(changed) == 1:
+            facet = changed[0]
+            added = state.facets[facet] - prev.facets[facet]
+            removed = prev.facets[facet] - state.facets[facet]
+            deltas = []
+            for sign, values in [(1, added), (-1, removed)]:
+                if values:
+                    deltas.append((sign, state.start_day, state.end_day, {**state.facets, facet: values}))
+            return deltas
+
+        overlaps = state.start_day <= prev.end_day and prev.start_day <= state.end_day
+        if not changed and overlaps:
+            deltas = []
+            for start, end in _day_ranges(state.start_day, state.end_day, prev.start_day, prev.end_day):
+                deltas.append((1, start, end, state.facets))
+            for start, end in _day_ranges(prev.start_day, prev.end_day, state.start_day, state.end_day):
+                deltas.append((-1, start, end, state.facets))
+            return deltas
+
+        return None
@@ -0,0 +1,121 @@
+# influencers.py
+"""Influencer analytics: handle/brand split at ingest and top-K leaderboards
+
+`Influencer_Brand` values such as '@snackattack | Spirifi' are split once per
+distinct value into `influencer` and `brand` categoricals. Handles can number
+in the tens of thousands, far more than any other dimension, so they get
+their own cube (day × influencer × every filter facet) instead of
+multiplying the cells of the main one; it is built on first use and cached
+per dataset. A leaderboard is one slice of that cube, a `bincount` per
+handle and an `argpartition` for the top K, so only K rows are ever sorted.
+"""
+import numpy as np
+import pandas as pd
+
+import profiling
+from cache import MemoryLRU
+from cube import Cube
+from filters import FACETS
+
+UNKNOWN = 'Unknown'
+SEPARATOR = '|'
+
+INFLUENCER_DIMS = ['day', 'influencer', *FACETS]
+
+RANKINGS = {
+    'engagements': 'Total Engagement',
+    'posts': 'Jumlah Post',
+    'avg_engagement': 'Rata-rata Engagement',
+}
+
+# Handles with fewer posts are left out of the average-engagement ranking
+MIN_POSTS_FOR_AVERAGE = 3
+
+INFLUENCER_CACHE_BYTES = 256 * 1024 * 1024
+
+_influencer_cache = MemoryLRU(INFLUENCER_CACHE_BYTES, max_entries=16, name='influencers')
+
+
+def split_handle(raw):
+    """(handle, brand) of one raw 'handle | brand' value"""
+    handle, _, brand = str(raw).partition(SEPARATOR)
+    return handle.strip() or UNKNOWN, brand.strip() or UNKNOWN
+
+
+def split_handles(values):
+    """`influencer` and `brand` categoricals for a raw Influencer_Brand column.
+
+    The column is factorized so `split_handle` runs once per distinct value;
+    missing values become 'Unknown' for both. Labels no row uses (e.g.
+    'Unknown' in a complete column) are not kept as categories.
+    """
+    codes, uniques = pd.factorize(values)
+    pairs = [split_handle(raw) for raw in uniques] + [(UNKNOWN, UNKNOWN)]
+    # factorize marks missing values with -1, which indexes the trailing pair
+    influencer_codes, influencer_labels = pd.factorize(np.array([p[0] for p in pairs], dtype=object))
+    brand_codes, brand_labels = pd.factorize(np.array([p[1] for p in pairs], dtype=object))
+    return (
+        pd.Categorical.from_codes(influencer_codes[codes], influencer_labels).remove_unused_categories(),
+        pd.Categorical.from_codes(brand_codes[codes], brand_labels).remove_unused_categories(),
+    )
+
+
+def influencer_cube_for(dataset_hash, df):
+    """Cached day × influencer × facets cube of a dataset"""
+    if dataset_hash is None:
+        return Cube.from_frame(df, dims=INFLUENCER_DIMS)
+
+    def build():
+        with profiling.stage('influencer.cube', rows=len(df)) as built:
+            influencer_cube = Cube.from_frame(df, dataset_hash, dims=INFLUENCER_DIMS)
+            influencer_cube.index
+            built.detail = f"{len(influencer_cube):,} sel"
+        return influencer_cube
+
+    return _influencer_cache.get_or_compute(dataset_hash, build)
+
+
+def top_k(scores, k):
+    """Positions of the `k` largest scores, best first, sorting only those k"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def leaderboard(influencer_cube, start_day, end_day, k=10, by='engagements', **facets):
+    """Top `k` influencers of a selection ranked by `by` (a key of RANKINGS).
+
+    Returns rank, influencer, posts, engagements, avg_engagement and each
+    handle's share of the selection's engagement.
+    """
+    cells = influencer_cube.slice(start_day, end_day, **facets).cells
+    handles = influencer_cube.cells['influencer'].cat.categories
+    codes = cells['influencer'].cat.codes.to_numpy()
+    engagements = np.rint(np.bincount(codes, weights=cells['engagements'].to_numpy(dtype=np.float64),
+                                      minlength=len(handles))).astype(np.int64)
+    posts = np.rint(np.bincount(codes, weights=cells['posts'].to_numpy(dtype=np.float64),
+                                minlength=len(handles))).astype(np.int64)
+    average = engagements / np.maximum(posts, 1)
+
+    if by == 'engagements':
+        scores = engagements.astype(np.float64)
+    elif by == 'posts':
+        scores = posts.astype(np.float64)
+    else:
+        scores = np.where(posts >= MIN_POSTS_FOR_AVERAGE, average, -1.0)
+    # Handles without posts in the selection never rank
+    scores = np.where(posts > 0, scores, -np.inf)
+    top = top_k(scores, k)
+    top = top[np.isfinite(scores[top]) & (scores[top] >= 0)]
+
+    total = engagements.sum()
+    return pd.DataFrame({
+        'rank': np.arange(1, len(top) + 1),
+        'influencer': np.asarray(handles, dtype=object)[top],
+        'posts': posts[top],
+        'engagements': engagements[top],
+        'avg_engagement': np.round(average[top]).astype(np.int64),
+        'share_pct': np.round(engagements[top] / total * 100, 1) if total else np.zeros(len(top)),
+    })
@@ -0,0 +1,194 @@
+# ingest.py
+"""Parse + clean stage for uploaded CSVs, cached on a hash of the file bytes"""
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import profiling
+from cache import MemoryLRU
+from dates import merge_reports, parse_dates
+from influencers import split_handles
+from schema import DIMENSIONS, MemoryReport, compact, format_bytes, frame_bytes
+from sentiment import normalize_sentiment
+
+REQUIRED_COLS = ["date", "platform", "sentiment", "location", "engagements", "media_type"]
+
+# Read when present; missing ones are filled with 'Unknown'
+OPTIONAL_COLS = ["influencer_brand", "post_type"]
+
+# Budget for cleaned frames kept in memory across all sessions
+DATASET_CACHE_BYTES = 1024 * 1024 * 1024
+DATASET_CACHE_ENTRIES = 16
+
+# Campaign of data that does not come from a named file
+DEFAULT_CAMPAIGN = 'Default'
+
+# Upper bound on files parsed at the same time
+MAX_PARSE_WORKERS = 8
+
+_dataset_cache = MemoryLRU(DATASET_CACHE_BYTES, max_entries=DATASET_CACHE_ENTRIES, name='datasets')
+
+
+class MissingColumnsError(ValueError):
+    """Raised when a CSV lacks one or more of the required columns"""
+
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(f"Kolom yang hilang: {', '.join(missing)}")
+
+
+def content_hash(data):
+    """Stable hash of the raw uploaded bytes, used as the cache key"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def dataset_key(data, campaign):
+    """Cache key of a file's bytes loaded as `campaign`"""
+    digest = hashlib.blake2b(data, digest_size=16)
+    digest.update(campaign.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def campaign_name(file_name):
+    """Campaign label for a file: its name without directory and extension"""
+    return os.path.splitext(os.path.basename(str(file_name)))[0] or DEFAULT_CAMPAIGN
+
+
+def unique_campaigns(campaigns):
+    """Campaign labels made distinct: a repeated label gets a " (2)", " (3)", ... suffix.
+
+    Files with the same name in different folders would otherwise be merged
+    into one campaign.
+    """
+    campaigns = list(campaigns)
+    labels = []
+    for campaign in campaigns:
+        label, copy = campaign, 1
+        # A suffixed label never takes the name of another file
+        while label in labels or (copy > 1 and label in campaigns):
+            copy += 1
+            label = f"{campaign} ({copy})"
+        labels.append(label)
+    return labels
+
+
+def column_key(col):
+    """Standard snake_case key for a raw header like 'Media Type' or 'Media_Type'"""
+    return col.lower().strip().replace(" ", "_")
+
+
+def standardize_columns(df):
+    """Rename required and optional columns to their standard key and check no required one is missing"""
+    col_map = {}
+    for col in df.columns:
+        key = column_key(col)
+        if key in REQUIRED_COLS or key in OPTIONAL_COLS:
+            col_map[col] = key
+
+    df = df.rename(columns=col_map)
+
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        raise MissingColumnsError(missing)
+    return df
+
+
+def clean(df, date_format=None):
+    """Type conversion, sentiment standardization and missing-value handling.
+
+    The `dates.DateReport` of the date column is kept in
+    `df.attrs['date_report']`; `date_format` skips format inference.
+    """
+    # Date conversion: one inferred format, per-distinct-value fallback
+    with profiling.stage('ingest.dates', rows=len(df)) as parsed:
+        df['date'], date_report = parse_dates(df['date'], date_format)
+        parsed.detail = date_report.date_format
+
+    # Remove rows with invalid dates
+    df = df.dropna(subset=['date'])
+
+    # Engagements conversion
+    df['engagements'] = pd.to_numeric(df['engagements'], errors='coerce').fillna(0).astype(int)
+
+    # Sentiment standardization
+    df['sentiment'] = normalize_sentiment(df['sentiment'])
+
+    # Fill missing values
+    df['media_type'] = df['media_type'].fillna('Unknown')
+    df['platform'] = df['platform'].fillna('Other')
+    df['location'] = df['location'].fillna('Unknown')
+
+    # Influencer handle and brand, split once per distinct value
+    raw_handles = df.pop('influencer_brand') if 'influencer_brand' in df else pd.Series(None, index=df.index, dtype=object)
+    df['influencer'], df['brand'] = split_handles(raw_handles)
+    df['post_type'] = df['post_type'].fillna('Unknown') if 'post_type' in df else 'Unknown'
+    df.attrs['date_report'] = date_report
+    return df
+
+
+def prepare(df, campaign=DEFAULT_CAMPAIGN, date_format=None):
+    """Clean a frame with standardized columns and convert it to the compact schema"""
+    df = clean(df, date_format)
+    df['campaign'] = campaign
+    return compact(df)
+
+
+def parse_csv(data, campaign=DEFAULT_CAMPAIGN):
+    """Read raw CSV bytes and run the full standardize + clean pipeline"""
+    with profiling.stage('ingest.read_csv', detail=format_bytes(len(data))) as read:
+        df = pd.read_csv(io.BytesIO(data))
+        read.rows = len(df)
+    df = standardize_columns(df)
+    with profiling.stage('ingest.clean') as cleaned:
+        df = prepare(df, campaign)
+        cleaned.rows = len(df)
+    return df
+
+
+def load_csv(data, campaign=DEFAULT_CAMPAIGN):
+    """Return the cleaned frame for `data`, parsing it only once per distinct file.
+
+    Returns `(dataset_hash, df)`. The frame is shared between sessions and
+    must not be modified in place; sessions uploading the same file at the
+    same time wait for one parse.
+    """
+    key = dataset_key(data, campaign)
+    return key, _dataset_cache.get_or_compute(key, lambda: parse_csv(data, campaign))
+
+
+def combine(frames):
+    """Concatenate compact frames into one, keeping every dimension categorical"""
+    frames = list(frames)
+    for col in DIMENSIONS:
+        union = pd.api.types.union_categoricals([f[col] for f in frames], sort_categories=True).categories
+        frames = [f.assign(**{col: f[col].cat.set_categories(union)}) for f in frames]
+    before = sum(f.attrs['memory_report'].before for f in frames)
+    date_report = merge_reports(f.attrs.get('date_report') for f in frames)
+    df = compact(pd.concat(frames, ignore_index=True))
+    df.attrs['memory_report'] = MemoryReport(before, frame_bytes(df))
+    df.attrs['date_report'] = date_report
+    return df
+
+
+def load_csvs(files, max_workers=MAX_PARSE_WORKERS):
+    """Load several `(file_name, data)` CSVs as one dataset with a campaign per file.
+
+    Files are parsed concurrently on a thread pool (the CSV tokenizer releases
+    the GIL), so the total time is close to that of the slowest file. Each
+    file and the combination are cached like `load_csv`; returns
+    `(dataset_hash, df)`.
+    """
+    files = list(files)
+    if len(files) == 1:
+        name, data = files[0]
+        return load_csv(data, campaign_name(name))
+
+    campaigns = unique_campaigns(campaign_name(name) for name, _ in files)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(files), max_workers))) as pool:
+        loaded = list(pool.map(lambda f: load_csv(f[0][1], f[1]), zip(files, campaigns)))
+
+    key = hashlib.blake2b(''.join(k for k, _ in loaded).encode('ascii'), digest_size=16).hexdigest()
+    return key, _dataset_cache.get_or_compute(key, lambda: combine(frame for _, frame in loaded))
@@ -0,0 +1,263 @@
+# insights.py
+"""AI insight service: pooled HTTP session, retries, response cache, parallel and streamed generation
+
+Provider base URLs default to the public APIs and can be pointed at a local
+stub (see tools/ai_stub_server.py) with the GEMINI_API_BASE and
+OPENAI_API_BASE environment variables.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import MemoryLRU
+
+GEMINI_API_BASE = os.environ.get('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com')
+OPENAI_API_BASE = os.environ.get('OPENAI_API_BASE', 'https://api.openai.com')
+GEMINI_MODEL = 'gemini-1.5-flash-latest'
+
+# (connect, read) seconds
+REQUEST_TIMEOUT = (5, 60)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+CACHE_TTL = 60 * 60
+CACHE_BYTES = 8 * 1024 * 1024
+CACHE_ENTRIES = 512
+
+DEMO_INSIGHTS = {
+    'Sentiment Analysis': """
+    • **Sentiment Positif Dominan**: 60% sentiment positif menunjukkan respon baik dari audience Gen Z
+    • **Peluang Improvement**: 20% sentiment negatif masih bisa dioptimasi dengan content strategy yang lebih targeted
+    • **Rekomendasi**: Fokus pada konten yang menghasilkan engagement positif dan analisis penyebab sentiment negatif
+    """,
+    'Engagement Trend Analysis': """
+    • **Pola Konsistensi**: Engagement menunjukkan tren stabil dengan peak di hari-hari tertentu
+    • **Opportunity Window**: Identifikasi jam dan hari dengan engagement tertinggi untuk optimal posting
+    • **Content Timing**: Sesuaikan jadwal posting berdasarkan pola engagement harian audience Gen Z
+    """,
+    'Platform Performance Analysis': """
+    • **Platform Champion**: TikTok dan Instagram menunjukkan performa terbaik untuk audience Gen Z
+    • **Resource Allocation**: Fokuskan 70% resources pada platform dengan ROI tertinggi
+    • **Cross-Platform Strategy**: Repurpose konten terbaik dari platform champion ke platform lain
+    """,
+    'Media Type Analysis': """
+    • **Video Dominance**: Video content menghasilkan engagement 3x lebih tinggi dibanding format lain
+    • **Visual Appeal**: Gen Z responds better pada konten visual dibanding text-only
+    • **Content Mix**: Optimal ratio 60% video, 30% image, 10% text untuk maximize engagement
+    """,
+    'Geographic Analysis': """
+    • **Urban Concentration**: Jakarta dan Surabaya menjadi hub utama engagement
+    • **Regional Expansion**: Potensi besar di kota tier-2 yang belum dioptimalkan
+    • **Localized Content**: Pertimbangkan konten dengan nuansa lokal untuk regional markets
+    """
+}
+
+
+def build_prompt(chart_name, data_text):
+    return f"""
+Anda adalah analis media profesional yang berpengalaman dalam kampanye digital untuk brand Gen Z.
+
+Berikan 3 insight utama dan actionable dari analisis {chart_name}:
+
+Data: {data_text}
+
+Fokus pada:
+1. Pola signifikan dan trend yang teridentifikasi
+2. Implikasi strategis untuk brand Gen Z
+3. Rekomendasi aksi konkret untuk optimisasi kampanye
+
+Format jawaban dengan bullet points yang jelas dan mudah dipahami.
+"""
+
+
+class InsightStream:
+    """Iterable of insight text chunks that records its own timing.
+
+    `ttft` (time to first token) and `total` are seconds since iteration
+    started; both stay None until the respective point is reached.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.parts = []
+        self.ttft = None
+        self.total = None
+
+    def __iter__(self):
+        started = time.perf_counter()
+        for chunk in self._chunks:
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - started
+            self.parts.append(chunk)
+            yield chunk
+        self.total = time.perf_counter() - started
+
+    @property
+    def text(self):
+        return ''.join(self.parts)
+
+
+def _sse_payloads(response):
+    """JSON payloads of the `data:` lines of a server-sent events response"""
+    # chunk_size=None yields each network chunk as soon as it arrives
+    for line in response.iter_lines(chunk_size=None):
+        if not line.startswith(b'data:'):
+            continue
+        data = line[len(b'data:'):].strip()
+        # Read on past OpenAI's end marker so the connection goes back to the pool
+        if data != b'[DONE]':
+            yield json.loads(data.decode('utf-8'))
+
+
+class InsightService:
+    """Generates chart insights over one pooled `requests.Session`.
+
+    Transient failures (connection errors, 429 and 5xx) are retried with
+    exponential backoff, every request has a timeout, and successful answers
+    are cached on (model, chart_name, hash of data_text) with a TTL.
+    """
+
+    def __init__(self, gemini_base=GEMINI_API_BASE, openai_base=OPENAI_API_BASE,
+                 timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                 cache_ttl=CACHE_TTL, pool_size=10):
+        self.gemini_base = gemini_base.rstrip('/')
+        self.openai_base = openai_base.rstrip('/')
+        self.timeout = timeout
+        self.cache = MemoryLRU(CACHE_BYTES, max_entries=CACHE_ENTRIES, ttl=cache_ttl, name='insights')
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['POST'],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @staticmethod
+    def cache_key(model, chart_name, data_text):
+        data_hash = hashlib.blake2b(data_text.encode('utf-8'), digest_size=16).hexdigest()
+        return (model, chart_name, data_hash)
+
+    def generate(self, model, chart_name, data_text, api_key=None):
+        """Insight text for one chart; errors are returned as '❌ ...' messages"""
+        if model == "Demo Mode":
+            return DEMO_INSIGHTS.get(chart_name, "Demo insight untuk analisis ini belum tersedia.")
+
+        if model not in ('Gemini', 'GPT-3.5') or not api_key:
+            return f"❌ Model {model} tidak tersedia atau API key tidak valid. Silakan periksa konfigurasi API Anda."
+
+        key = self.cache_key(model, chart_name, data_text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            prompt = build_prompt(chart_name, data_text)
+            if model == 'Gemini':
+                response = self._post_gemini(prompt, api_key)
+            else:
+                response = self._post_openai(prompt, api_key)
+        except requests.RequestException as e:
+            return f"❌ Error generating insight: {str(e)}"
+
+        if response.status_code != 200:
+            return f"❌ Error: {response.status_code} - {response.text}"
+
+        try:
+            result = response.json()
+            if model == 'Gemini':
+                text = result['candidates'][0]['content']['parts'][0]['text']
+            else:
+                text = result['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError) as e:
+            return f"❌ Error generating insight: {str(e)}"
+
+        return self.cache.put(key, text)
+
+    def generate_all(self, model, charts, api_key=None, max_workers=5):
+        """Run `generate` for every {chart_name: data_text} in parallel"""
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                name: pool.submit(self.generate, model, name, data_text, api_key)
+                for name, data_text in charts.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def stream(self, model, chart_name, data_text, api_key=None):
+        """Like `generate`, but as an `InsightStream` of tokens as they arrive.
+
+        Uses the providers' SSE endpoints. If the streaming request fails
+        before the first token, it falls back to the non-streaming path;
+        cached answers, Demo Mode and configuration errors come as one chunk.
+        """
+        return InsightStream(self._stream_chunks(model, chart_name, data_text, api_key))
+
+    def _stream_chunks(self, model, chart_name, data_text, api_key):
+        key = self.cache_key(model, chart_name, data_text)
+        if model not in ('Gemini', 'GPT-3.5') or not api_key or self.cache.get(key) is not None:
+            yield self.generate(model, chart_name, data_text, api_key)
+            return
+
+        parts = []
+        try:
+            prompt = build_prompt(chart_name, data_text)
+            if model == 'Gemini':
+                response = self._post_gemini(prompt, api_key, stream=True)
+            else:
+                response = self._post_openai(prompt, api_key, stream=True)
+            with response:
+                if response.status_code == 200:
+                    for payload in _sse_payloads(response):
+                        if model == 'Gemini':
+                            text = payload['candidates'][0]['content']['parts'][0].get('text', '')
+                        else:
+                            text = payload['choices'][0].get('delta', {}).get('content') or ''
+                        if text:
+                            parts.append(text)
+                            yield text
+        except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+            if parts:
+                yield f"\n\n❌ Streaming terputus: {str(e)}"
+                return
+
+        if parts:
+            self.cache.put(key, ''.join(parts))
+        else:
+            yield self.generate(model, chart_name, data_text, api_key)
+
+    def _post_gemini(self, prompt, api_key, stream=False):
+        method = 'streamGenerateContent' if stream else 'generateContent'
+        url = f"{self.gemini_base}/v1beta/models/{GEMINI_MODEL}:{method}"
+        params = {'key': api_key, 'alt': 'sse'} if stream else {'key': api_key}
+        data = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }]
+        }
+        return self.session.post(url, params=params, json=data, timeout=self.timeout, stream=stream)
+
+    def _post_openai(self, prompt, api_key, stream=False):
+        url = f"{self.openai_base}/v1/chat/completions"
+        headers = {'Authorization': f'Bearer {api_key}'}
+        data = {
+            'model': 'gpt-3.5-turbo',
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': 500,
+            'temperature': 0.7,
+            'stream': stream
+        }
+        return self.session.post(url, headers=headers, json=data, timeout=self.timeout, stream=stream)
+
+
+# Shared by every session so connections and cached answers are reused
+service = InsightService()
@@ -1,14 +1,36 @@
 # media_intelligence_dashboard.py
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import numpy as np
 from datetime import datetime, timedelta
-import requests
 import json
 
+import approx
+import cache
+import charts
+import comparison
+import cube
+import dates
+import downsample
+import explorer
+import exports
+import filters
+import incremental
+import influencers
+import ingest
+import insights
+import pipeline
+import profiling
+import schema
+import sqlengine
+import store
+import streaming
+import synthetic
+import timebuckets
+import watch
+
 # === PAGE CONFIGURATION ===
 st.set_page_config(
     page_title="AI-Powered Media Insights Dashboard",
@@ -17,6 +39,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Times every named stage of this rerun; shown in the sidebar "Performance" panel
+profiler = profiling.Profiler()
+
 # === CUSTOM CSS - GREEN THEME ===
 st.markdown("""
 <style>
@@ -157,7 +182,63 @@ with st.sidebar:
     st.markdown("### 📄 Upload & Konfigurasi")
     
     # File Upload
-    uploaded_file = st.file_uploader("Upload file CSV Anda:", type=["csv"])
+    uploaded_files = st.file_uploader(
+        "Upload file CSV Anda (satu file per kampanye):",
+        type=["csv"],
+        accept_multiple_files=True
+    )
+    upload_campaigns = ingest.unique_campaigns(ingest.campaign_name(f.name) for f in uploaded_files)
+    if any(campaign != ingest.campaign_name(f.name) for f, campaign in zip(uploaded_files, upload_campaigns)):
+        st.info("ℹ️ Beberapa file bernama sama; masing-masing dimuat sebagai kampanye terpisah: "
+                + ", ".join(upload_campaigns))
+    
+    # Previously ingested datasets, reopened without re-parsing the CSV
+    stored_name = None
+    stored_datasets = store.list_datasets()
+    if stored_datasets:
+        stored_name = st.selectbox(
+            "🗄️ Atau buka dataset tersimpan:",
+            options=[None] + [m['name'] for m in stored_datasets],
+            format_func=lambda name: "—" if name is None else name
+        )
+    
+    # Streaming mode for files larger than memory
+    stream_mode = st.checkbox("🌊 Mode streaming (file sangat besar)")
+    local_path = ""
+    if stream_mode:
+        local_path = st.text_input("📂 Path CSV di server (opsional):").strip()
+        chunk_rows = st.number_input(
+            "Ukuran chunk (baris):",
+            min_value=10_000,
+            value=streaming.STREAM_CHUNK_ROWS,
+            step=50_000
+        )
+    
+    # Watch mode for exports that keep growing during a live campaign
+    watch_mode = st.checkbox("👀 Mode watch (file terus bertambah)")
+    watch_path = ""
+    if watch_mode:
+        watch_path = st.text_input("📂 Path file atau folder CSV di server:").strip()
+        watch_interval = st.number_input(
+            "Interval refresh (detik):",
+            min_value=5,
+            value=watch.DEFAULT_INTERVAL_SECONDS,
+            step=5
+        )
+    
+    # Engine answering the filter and the aggregates; DuckDB is optional
+    query_engine = 'pandas'
+    if sqlengine.AVAILABLE:
+        query_engine = st.selectbox(
+            "🧮 Mesin query:",
+            options=sqlengine.ENGINES,
+            format_func=sqlengine.ENGINE_LABELS.get
+        )
+    else:
+        st.caption("🧮 Mesin query: pandas (pasang `duckdb` untuk mesin SQL multi-core)")
+    
+    # Estimates from the sample taken at ingest while exploring; downloads stay exact
+    approx_mode = st.checkbox("≈ Mode perkiraan (sampel + interval kepercayaan)", key="approx_mode")
     
     st.markdown("---")
     st.markdown("### 🔑 API Keys")
@@ -175,24 +256,90 @@ with st.sidebar:
         "Model AI untuk Insight:",
         options=["Gemini", "GPT-3.5", "Demo Mode"]
     )
+    stream_insights = st.checkbox("⚡ Tampilkan insight secara streaming", value=True)
 
 # === DATA LOADING & PROCESSING ===
-if not uploaded_file:
+def watch_poller(watcher, rendered_key):
+    """Sidebar auto-refresh: a cheap stat every interval, a full rerun only when the watched files grew"""
+    with st.sidebar:
+        if not hasattr(st, 'fragment'):
+            st.button("🔄 Refresh data", key="watch_refresh")
+            return
+
+        @st.fragment(run_every=int(watch_interval))
+        def poll():
+            # Another session may already have read the new rows into the shared watcher
+            if watcher.has_new_data() or watcher.key != rendered_key:
+                st.rerun()
+            st.caption(f"🔄 Dicek setiap {int(watch_interval)} detik • terakhir {datetime.now():%H:%M:%S}")
+
+        poll()
+
+
+if watch_mode and watch_path:
+    # Only the rows appended since the last refresh are parsed; like streaming, only cells are kept
+    df = None
+    watcher = watch.watcher_for(watch_path)
+    try:
+        with profiler.stage('data.load', detail='watch') as loaded:
+            stream, appended = watcher.refresh()
+            loaded.rows = appended
+        st.success(f"✅ Mode watch: **{appended:,}** baris baru dari **{len(watcher.paths())}** file")
+    except ingest.MissingColumnsError as e:
+        st.error(f"⚠️ {e}")
+        st.info("💡 Pastikan CSV Anda memiliki kolom: Date, Platform, Sentiment, Location, Engagements, Media_Type")
+        watch_poller(watcher, watcher.key)
+        st.stop()
+    except watch.WaitingForData as e:
+        st.info(f"⏳ {e}; menunggu data baru...")
+        watch_poller(watcher, watcher.key)
+        st.stop()
+    except Exception as e:
+        st.error(f"⚠️ Gagal membaca CSV: {e}")
+        st.stop()
+    watch_poller(watcher, stream.cube.key)
+
+elif stream_mode and (uploaded_files or local_path):
+    # Only the aggregated cells are kept; there is no row-level frame
+    df = None
+    try:
+        with st.spinner("🌊 Membaca file per chunk..."):
+            with profiler.stage('data.load', detail='stream') as loaded:
+                stream = streaming.load_streams([local_path] if local_path else uploaded_files, int(chunk_rows))
+                loaded.rows = stream.rows_kept
+        st.success(f"✅ File berhasil di-stream dalam **{stream.chunks}** chunk!")
+    except ingest.MissingColumnsError as e:
+        st.error(f"⚠️ {e}")
+        st.info("💡 Pastikan CSV Anda memiliki kolom: Date, Platform, Sentiment, Location, Engagements, Media_Type")
+        st.stop()
+    except Exception as e:
+        st.error(f"⚠️ Gagal membaca CSV: {e}")
+        st.stop()
+
+elif stored_name:
+    try:
+        with st.spinner("🗄️ Membuka dataset tersimpan..."):
+            with profiler.stage('data.load', detail='store') as loaded:
+                dataset_hash, df = store.load(stored_name)
+                loaded.rows = len(df)
+        st.success(f"✅ Dataset **{stored_name}** berhasil dibuka!")
+    except Exception as e:
+        st.error(f"⚠️ Gagal membuka dataset: {e}")
+        st.stop()
+
+elif not uploaded_files:
     st.warning("⚠️ Silakan upload file CSV untuk melanjutkan.")
     
-    # Demo data untuk testing
+    # Demo data untuk testing: seeded synthetic rows with the Spirifi schema (see synthetic.py)
     with st.expander("🔬 Gunakan Data Demo untuk Testing"):
+        demo_rows = st.number_input("Jumlah baris:", min_value=100, max_value=5_000_000, value=10_000, step=10_000)
+        demo_seed = st.number_input("Seed:", min_value=0, value=42, step=1)
         if st.button("Generate Demo Data"):
-            # Create demo data
-            demo_data = {
-                'date': pd.date_range(start='2024-01-01', periods=100, freq='D'),
-                'platform': np.random.choice(['Instagram', 'TikTok', 'Twitter', 'Facebook'], 100),
-                'sentiment': np.random.choice(['Positive', 'Negative', 'Neutral'], 100, p=[0.5, 0.2, 0.3]),
-                'location': np.random.choice(['Jakarta', 'Surabaya', 'Bandung', 'Medan', 'Makassar'], 100),
-                'engagements': np.random.randint(100, 5000, 100),
-                'media_type': np.random.choice(['Image', 'Video', 'Text', 'Carousel'], 100)
-            }
-            df = pd.DataFrame(demo_data)
+            with profiler.stage('data.load', detail='synthetic') as loaded:
+                demo_data = synthetic.generate(int(demo_rows), seed=int(demo_seed))
+                df = ingest.prepare(ingest.standardize_columns(demo_data), campaign='Demo')
+                loaded.rows = len(df)
+            dataset_hash = None
             st.success("✅ Demo data berhasil dimuat!")
             st.dataframe(df.head())
     
@@ -201,56 +348,76 @@ if not uploaded_file:
 
 else:
     try:
-        df = pd.read_csv(uploaded_file)
-        st.success(f"✅ File berhasil dimuat!")
+        with st.spinner("🔄 Memproses dan membersihkan data..."):
+            with profiler.stage('data.load', detail='upload') as loaded:
+                dataset_hash, df = ingest.load_csvs([(f.name, f.getvalue()) for f in uploaded_files])
+                loaded.rows = len(df)
+        st.success(f"✅ {len(uploaded_files)} file berhasil dimuat dalam {loaded.seconds:.2f} detik!")
+    except ingest.MissingColumnsError as e:
+        st.error(f"⚠️ {e}")
+        st.info("💡 Pastikan CSV Anda memiliki kolom: Date, Platform, Sentiment, Location, Engagements, Media_Type")
+        st.stop()
     except Exception as e:
         st.error(f"⚠️ Gagal membaca CSV: {e}")
         st.stop()
 
-# === PREPROCESSING & COLUMN STANDARDIZATION ===
-required_cols = ["date", "platform", "sentiment", "location", "engagements", "media_type"]
-col_map = {}
-
-for col in df.columns:
-    key = col.lower().strip().replace(" ", "_")
-    if key in required_cols:
-        col_map[col] = key
-
-df = df.rename(columns=col_map)
-
-missing = [c for c in required_cols if c not in df.columns]
-if missing:
-    st.error(f"⚠️ Kolom yang hilang: {', '.join(missing)}")
-    st.info("💡 Pastikan CSV Anda memiliki kolom: Date, Platform, Sentiment, Location, Engagements, Media_Type")
-    st.stop()
+if df is not None:
+    st.success(f"✅ Data berhasil diproses: **{df.shape[0]:,}** baris, **{df.shape[1] - len(schema.DERIVED_COLS)}** kolom")
+    st.caption(f"💾 Memori dataset: {schema.describe_memory(df.attrs['memory_report'])}")
+    with profiler.stage('data.cube', rows=len(df)):
+        data_cube = cube.cube_for(dataset_hash, df)
+else:
+    st.success(f"✅ Data berhasil diproses: **{stream.rows_kept:,}** baris → **{len(stream.cube):,}** sel agregat")
+    st.caption(f"💾 Memori agregat: {schema.format_bytes(stream.cube.nbytes)} "
+               f"({stream.rows_read - stream.rows_kept:,} baris dengan tanggal tidak valid dibuang)")
+    data_cube = stream.cube
 
-# === DATA TYPE CONVERSION & CLEANING ===
-with st.spinner("🔄 Memproses dan membersihkan data..."):
-    # Date conversion
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    
-    # Remove rows with invalid dates
-    df = df.dropna(subset=['date'])
-    
-    # Engagements conversion
-    df['engagements'] = pd.to_numeric(df['engagements'], errors='coerce').fillna(0).astype(int)
-    
-    # Sentiment standardization
-    df['sentiment'] = df['sentiment'].fillna('Neutral').apply(
-        lambda x: 'Positive' if 'pos' in str(x).lower()
-                  else ('Negative' if 'neg' in str(x).lower() else 'Neutral')
-    )
-    
-    # Fill missing values
-    df['media_type'] = df['media_type'].fillna('Unknown')
-    df['platform'] = df['platform'].fillna('Other')
-    df['location'] = df['location'].fillna('Unknown')
+# Date parsing report: the inferred format and the rows that needed the fallback or were dropped
+date_report = df.attrs.get('date_report') if df is not None else stream.date_report
+if date_report is not None:
+    st.caption(f"📅 Tanggal: {dates.describe(date_report)}")
+    if date_report.fallback_rows or date_report.dropped_rows:
+        with st.expander("📅 Laporan parsing tanggal"):
+            st.dataframe(pd.DataFrame({
+                'Keterangan': [
+                    f"Sesuai format {date_report.date_format or '-'}",
+                    "Format lain (parser fleksibel)",
+                    "Kosong → dibuang",
+                    "Tidak dapat dibaca → dibuang"
+                ],
+                'Baris': [
+                    date_report.fast_rows,
+                    date_report.fallback_rows,
+                    date_report.missing_rows,
+                    date_report.invalid_rows
+                ]
+            }), use_container_width=True, hide_index=True)
+            if date_report.invalid_examples:
+                st.caption("Contoh nilai yang tidak dapat dibaca: " +
+                           ", ".join(f"`{value}`" for value in date_report.invalid_examples))
 
-st.success(f"✅ Data berhasil diproses: **{df.shape[0]:,}** baris, **{df.shape[1]}** kolom")
+# Save a freshly uploaded CSV so later sessions can reopen it by name
+if uploaded_files and df is not None and not stored_name:
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### 🗄️ Dataset Store")
+        dataset_name = st.text_input(
+            "Nama dataset:",
+            value="_".join(upload_campaigns)
+        )
+        if st.button("💾 Simpan Dataset", key="save_dataset"):
+            try:
+                saved = store.save(dataset_name, df, dataset_hash)
+                st.success(f"✅ Tersimpan sebagai **{saved['name']}** ({schema.format_bytes(saved['file_bytes'])})")
+            except Exception as e:
+                st.error(f"⚠️ Gagal menyimpan dataset: {e}")
 
 # Show data preview
 with st.expander("👀 Lihat Preview Data"):
-    st.dataframe(df.head(10), use_container_width=True)
+    if df is not None:
+        st.dataframe(df.head(10).drop(columns=schema.DERIVED_COLS), use_container_width=True)
+    else:
+        st.dataframe(stream.preview, use_container_width=True)
 
 # === SIDEBAR FILTERS ===
 with st.sidebar:
@@ -258,8 +425,8 @@ with st.sidebar:
     st.markdown("### 🔍 Filter Data")
     
     # Date range filter
-    min_date = df['date'].min().date()
-    max_date = df['date'].max().date()
+    min_date = schema.day_to_date(data_cube.min_day)
+    max_date = schema.day_to_date(data_cube.max_day)
     
     date_range = st.date_input(
         "📅 Rentang Tanggal:",
@@ -277,275 +444,372 @@ with st.sidebar:
     # Platform filter
     platforms = st.multiselect(
         "📱 Platform:",
-        options=sorted(df['platform'].unique()),
-        default=list(df['platform'].unique())
+        options=data_cube.members('platform'),
+        default=data_cube.members('platform')
     )
     
     # Sentiment filter
     sentiments = st.multiselect(
         "😊 Sentiment:",
-        options=sorted(df['sentiment'].unique()),
-        default=list(df['sentiment'].unique())
+        options=data_cube.members('sentiment'),
+        default=data_cube.members('sentiment')
     )
     
     # Media type filter
     media_types = st.multiselect(
         "🎬 Tipe Media:",
-        options=sorted(df['media_type'].unique()),
-        default=list(df['media_type'].unique())
+        options=data_cube.members('media_type'),
+        default=data_cube.members('media_type')
+    )
+    
+    # Post type filter
+    post_types = st.multiselect(
+        "📝 Tipe Post:",
+        options=data_cube.members('post_type'),
+        default=data_cube.members('post_type')
     )
+    
+    # Brand filter, only when more than one brand is present
+    brands = data_cube.members('brand')
+    if len(brands) > 1:
+        brands = st.multiselect(
+            "🏢 Brand:",
+            options=brands,
+            default=brands
+        )
+    
+    # Campaign filter, only when more than one campaign is loaded
+    campaigns = data_cube.members('campaign')
+    if len(campaigns) > 1:
+        campaigns = st.multiselect(
+            "🏷️ Kampanye:",
+            options=campaigns,
+            default=campaigns
+        )
 
 # === APPLY FILTERS ===
-start_dt = datetime.combine(start_date, datetime.min.time())
-end_dt = datetime.combine(end_date, datetime.max.time())
-
-df_filtered = df[
-    (df['date'] >= start_dt) &
-    (df['date'] <= end_dt) &
-    (df['platform'].isin(platforms)) &
-    (df['sentiment'].isin(sentiments)) &
-    (df['media_type'].isin(media_types))
-]
+start_day = schema.date_to_day(start_date)
+end_day = schema.date_to_day(end_date)
+facet_selection = {
+    'platform': platforms,
+    'sentiment': sentiments,
+    'media_type': media_types,
+    'campaign': campaigns,
+    'brand': brands,
+    'post_type': post_types
+}
+
+# Results shared by every session showing the same dataset with the same
+# filters: computed once per (dataset, selection, name), also when several
+# sessions ask at the same time
+selection_key = cache.selection_key(start_day, end_day, facet_selection)
+
+# Only row-level data can be loaded into DuckDB; streamed/watched data is cells only
+use_sql = query_engine == 'duckdb' and df is not None and not approx_mode
+if query_engine == 'duckdb' and df is None and not approx_mode:
+    st.info("ℹ️ Mode streaming/watch hanya menyimpan data agregat; memakai mesin pandas")
+if use_sql:
+    # Kept apart from the pandas results so each engine is measured on its own
+    selection_key = ('duckdb', selection_key)
+if approx_mode:
+    # The same result names hold estimates here
+    selection_key = ('approx', selection_key)
+    # Streaming and watch build the sample while reading; uploads on first use
+    with profiler.stage('approx.summary'):
+        approx_summary = approx.summary_for(dataset_hash, df) if df is not None else stream.approx
 
-if df_filtered.empty:
+def exact_view():
+    """Exact cube slice of the selection: final figures and downloads in approximate mode"""
+    return pipeline.aggregate(data_cube, pipeline.Selection(start_day, end_day, facet_selection))
+
+def shared_result(name, compute):
+    return cache.shared_result(data_cube.key, selection_key, name, compute)
+
+# All KPIs and charts below are rollups of the filtered cube slice. The
+# session keeps the previous filter state, so a single facet toggle or a
+# date range shift only adds/subtracts the cells entering or leaving the
+# selection; raw rows are only filtered when the user exports them.
+if 'aggregator' not in st.session_state:
+    st.session_state['aggregator'] = incremental.IncrementalAggregator()
+
+with profiler.stage('filter') as filtered:
+    filtered.detail = 'shared'
+
+    def select_view():
+        aggregator = st.session_state['aggregator']
+        selected = aggregator.update(data_cube, start_day, end_day, **facet_selection)
+        filtered.detail = aggregator.last_update
+        return selected
+
+    def select_sql_view():
+        sql_table = sqlengine.table_for(dataset_hash, df)
+        filtered.detail = f"duckdb • {sql_table.threads} thread"
+        return sql_table.view(start_day, end_day, **facet_selection)
+
+    def select_approx_view():
+        filtered.detail = f"perkiraan • sampel {approx_summary.sample_rows:,} baris"
+        return approx_summary.view(start_day, end_day, **facet_selection)
+
+    if approx_mode:
+        view = shared_result('view', select_approx_view)
+    else:
+        view = shared_result('view', select_sql_view if use_sql else select_view)
+
+if view.empty:
     st.warning("⚠️ Tidak ada data yang sesuai dengan filter yang dipilih. Silakan sesuaikan filter Anda.")
     st.stop()
 
+if approx_mode:
+    st.info(
+        f"≈ **Mode perkiraan:** angka di bawah diperkirakan dari sampel {approx_summary.sample_rows:,} "
+        f"dari {approx_summary.rows:,} baris (bertingkat per platform) dengan interval kepercayaan 95%. "
+        f"Download selalu memakai angka eksak."
+    )
+    distinct_locations, distinct_influencers = (
+        approx_summary.distinct(col, start_day, end_day, platforms) for col in approx.DISTINCT_COLS
+    )
+    st.caption(
+        f"📍 Lokasi unik ≈ {distinct_locations[0]:,} ± {distinct_locations[1]:,} • "
+        f"👤 Influencer unik ≈ {distinct_influencers[0]:,} ± {distinct_influencers[1]:,} "
+        f"(sketch HyperLogLog per hari & platform)"
+    )
+    st.button(
+        "🎯 Hitung angka final (eksak)",
+        key="approx_exact",
+        on_click=lambda: st.session_state.update(approx_mode=False)
+    )
+
 # === PRECOMPUTE METRICS ===
-kpi_posts = len(df_filtered)
-kpi_total_eng = df_filtered['engagements'].sum()
-kpi_avg_eng = int(df_filtered['engagements'].mean()) if kpi_posts > 0 else 0
-kpi_pos_pct = df_filtered['sentiment'].value_counts(normalize=True).get('Positive', 0) * 100
+with profiler.stage('aggregate'):
+    kpi_view = shared_result('kpis', lambda: pipeline.kpis(view))
+    sentiment_posts = shared_result('sentiment_posts', lambda: view.rollup('sentiment').set_index('sentiment')['posts'])
 
-# Prepare aggregated data
-platform_eng = df_filtered.groupby('platform')['engagements'].sum().reset_index().sort_values('engagements', ascending=False)
-media_counts = df_filtered['media_type'].value_counts().reset_index()
-media_counts.columns = ['media_type', 'count']
-top_locations = df_filtered.groupby('location')['engagements'].sum().reset_index().nlargest(5, 'engagements')
+    # Prepare aggregated data
+    platform_eng = shared_result('platform_eng', lambda: pipeline.platform_analysis(view))
+    media_counts = shared_result('media_counts', lambda: (
+        view.rollup('media_type')[['media_type', 'posts']]
+        .sort_values('posts', ascending=False)
+        .set_axis(['media_type', 'count'], axis=1)
+    ))
+    top_locations = shared_result('top_locations', lambda: (
+        view.rollup('location')[['location', 'engagements']].nlargest(5, 'engagements')
+    ))
+
+    df_s = shared_result('sentiment_counts', lambda: (
+        sentiment_posts.reset_index()
+        .sort_values('posts', ascending=False)
+        .set_axis(['sentiment', 'count'], axis=1)
+    ))
+
+    daily_eng = shared_result('daily_eng', lambda: view.rollup('day')[['day', 'engagements']])
+    df_t = shared_result('daily_trend', lambda: pd.DataFrame({
+        'Date': daily_eng['day'].map(schema.day_to_date),
+        'Engagements': daily_eng['engagements']
+    }))
+
+    if not df_t.empty:
+        trend_summary = f"Rata-rata: {df_t['Engagements'].mean():.1f}, Maximum: {df_t['Engagements'].max()}"
+    else:
+        trend_summary = "No trend data available"
+
+    # Data text sent to the AI for each tab
+    insight_data = {
+        'Sentiment Analysis': df_s.to_string(index=False),
+        'Engagement Trend Analysis': trend_summary,
+        'Platform Performance Analysis': platform_eng.to_string(index=False),
+        'Media Type Analysis': media_counts.to_string(index=False),
+        'Geographic Analysis': top_locations.to_string(index=False),
+    }
 
 # === KEY METRICS DISPLAY ===
 st.markdown("### 📊 Ringkasan Performa Kampanye")
 
+# Same KPIs for the equally long window just before the selected range
+prev_start, prev_end = comparison.previous_window(start_day, end_day)
+with profiler.stage('kpi.compare'):
+    if approx_mode:
+        kpi_current = kpi_view
+        kpi_previous = pipeline.kpis(approx_summary.view(prev_start, prev_end, **facet_selection))
+        kpi_margins = view.kpi_margins()
+    else:
+        kpi_index = comparison.index_for(data_cube, **facet_selection)
+        kpi_current, kpi_previous = kpi_index.compare(start_day, end_day)
+has_previous = kpi_previous.posts > 0
+
+# Estimates are marked, with their 95% confidence interval under the metric
+approx_prefix = "≈ " if approx_mode else ""
+
+def kpi_margin(name, fmt="± {:,}"):
+    if approx_mode:
+        st.caption(f"{fmt.format(kpi_margins[name])} (CI 95%)")
+
+def kpi_delta(current, previous, fmt):
+    """Delta text vs the previous window, or None when it has no data"""
+    return fmt.format(current - previous) if has_previous else None
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric(
         "📝 Total Postingan",
-        f"{kpi_posts:,}",
-        delta=f"+{int(kpi_posts * 0.15)} vs periode lalu"
+        f"{approx_prefix}{kpi_current.posts:,}",
+        delta=kpi_delta(kpi_current.posts, kpi_previous.posts, "{:+,} vs periode lalu")
     )
+    kpi_margin('posts')
 
 with col2:
     st.metric(
         "💡 Total Engagement",
-        f"{kpi_total_eng:,}",
-        delta=f"+{int(kpi_total_eng * 0.08):,}"
+        f"{approx_prefix}{kpi_current.engagements:,}",
+        delta=kpi_delta(kpi_current.engagements, kpi_previous.engagements, "{:+,}")
     )
+    kpi_margin('engagements')
 
 with col3:
     st.metric(
         "📊 Rata-rata Engagement/Post",
-        f"{kpi_avg_eng:,}",
-        delta=f"+{int(kpi_avg_eng * 0.12):,}"
+        f"{approx_prefix}{kpi_current.avg_engagement:,}",
+        delta=kpi_delta(kpi_current.avg_engagement, kpi_previous.avg_engagement, "{:+,}")
     )
+    kpi_margin('avg_engagement')
 
 with col4:
     st.metric(
         "😊 Sentiment Positif",
-        f"{kpi_pos_pct:.1f}%",
-        delta=f"+{kpi_pos_pct * 0.05:.1f}%"
+        f"{approx_prefix}{kpi_current.positive_pct:.1f}%",
+        delta=kpi_delta(kpi_current.positive_pct, kpi_previous.positive_pct, "{:+.1f}%")
     )
+    kpi_margin('positive_pct', "± {:.1f} poin")
+
+if has_previous:
+    st.caption(
+        f"Delta dibandingkan periode sebelumnya: "
+        f"{schema.day_to_date(prev_start):%d %b %Y} – {schema.day_to_date(prev_end):%d %b %Y}"
+    )
+else:
+    st.caption("Tidak ada data pada periode sebelumnya untuk perbandingan")
 
 st.markdown("---")
 
 # === AI INSIGHT FUNCTION ===
+ai_api_key = {'Gemini': google_api_key, 'GPT-3.5': openai_api_key}.get(ai_model)
+
 def generate_insight(chart_name, data_text):
     """Generate AI insights for visualizations"""
-    
-    # Demo mode - return mock insights
-    if ai_model == "Demo Mode":
-        demo_insights = {
-            'Sentiment Analysis': """
-            • **Sentiment Positif Dominan**: 60% sentiment positif menunjukkan respon baik dari audience Gen Z
-            • **Peluang Improvement**: 20% sentiment negatif masih bisa dioptimasi dengan content strategy yang lebih targeted
-            • **Rekomendasi**: Fokus pada konten yang menghasilkan engagement positif dan analisis penyebab sentiment negatif
-            """,
-            'Engagement Trend Analysis': """
-            • **Pola Konsistensi**: Engagement menunjukkan tren stabil dengan peak di hari-hari tertentu
-            • **Opportunity Window**: Identifikasi jam dan hari dengan engagement tertinggi untuk optimal posting
-            • **Content Timing**: Sesuaikan jadwal posting berdasarkan pola engagement harian audience Gen Z
-            """,
-            'Platform Performance Analysis': """
-            • **Platform Champion**: TikTok dan Instagram menunjukkan performa terbaik untuk audience Gen Z
-            • **Resource Allocation**: Fokuskan 70% resources pada platform dengan ROI tertinggi
-            • **Cross-Platform Strategy**: Repurpose konten terbaik dari platform champion ke platform lain
-            """,
-            'Media Type Analysis': """
-            • **Video Dominance**: Video content menghasilkan engagement 3x lebih tinggi dibanding format lain
-            • **Visual Appeal**: Gen Z responds better pada konten visual dibanding text-only
-            • **Content Mix**: Optimal ratio 60% video, 30% image, 10% text untuk maximize engagement
-            """,
-            'Geographic Analysis': """
-            • **Urban Concentration**: Jakarta dan Surabaya menjadi hub utama engagement
-            • **Regional Expansion**: Potensi besar di kota tier-2 yang belum dioptimalkan
-            • **Localized Content**: Pertimbangkan konten dengan nuansa lokal untuk regional markets
-            """
-        }
-        return demo_insights.get(chart_name, "Demo insight untuk analisis ini belum tersedia.")
-    
-    # Real AI implementation
-    prompt = f"""
-Anda adalah analis media profesional yang berpengalaman dalam kampanye digital untuk brand Gen Z.
-
-Berikan 3 insight utama dan actionable dari analisis {chart_name}:
-
-Data: {data_text}
-
-Fokus pada:
-1. Pola signifikan dan trend yang teridentifikasi
-2. Implikasi strategis untuk brand Gen Z 
-3. Rekomendasi aksi konkret untuk optimisasi kampanye
-
-Format jawaban dengan bullet points yang jelas dan mudah dipahami.
-"""
-    
-    try:
-        if ai_model == 'Gemini' and google_api_key:
-            # Using requests instead of google.generativeai
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={google_api_key}"
-            headers = {'Content-Type': 'application/json'}
-            data = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }]
-            }
-            response = requests.post(url, headers=headers, json=data)
-            if response.status_code == 200:
-                result = response.json()
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                return f"❌ Error: {response.status_code} - {response.text}"
-        
-        elif ai_model == 'GPT-3.5' and openai_api_key:
-            # Using requests instead of openai library
-            url = "https://api.openai.com/v1/chat/completions"
-            headers = {
-                'Authorization': f'Bearer {openai_api_key}',
-                'Content-Type': 'application/json'
-            }
-            data = {
-                'model': 'gpt-3.5-turbo',
-                'messages': [{'role': 'user', 'content': prompt}],
-                'max_tokens': 500,
-                'temperature': 0.7
-            }
-            response = requests.post(url, headers=headers, json=data)
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                return f"❌ Error: {response.status_code} - {response.text}"
-        
-        else:
-            return f"❌ Model {ai_model} tidak tersedia atau API key tidak valid. Silakan periksa konfigurasi API Anda."
-    
-    except Exception as e:
-        return f"❌ Error generating insight: {str(e)}"
+    return insights.service.generate(ai_model, chart_name, data_text, api_key=ai_api_key)
+
+def render_insight(chart_name, spinner_text):
+    """Show a fresh insight, streamed token by token when enabled"""
+    if stream_insights and hasattr(st, 'write_stream'):
+        streamed = insights.service.stream(ai_model, chart_name, insight_data[chart_name], api_key=ai_api_key)
+        with profiler.stage('ai.stream', detail=f"{ai_model}: {chart_name}"):
+            with st.container(border=True):
+                st.write_stream(streamed)
+        st.caption(f"⏱️ Token pertama {streamed.ttft:.2f}s • selesai {streamed.total:.2f}s")
+    else:
+        with st.spinner(spinner_text), profiler.stage('ai.generate', detail=f"{ai_model}: {chart_name}"):
+            st.info(generate_insight(chart_name, insight_data[chart_name]))
+
+def show_generated_insight(chart_name):
+    """Show the result of 'Generate Semua Insight' if it matches the current data"""
+    generated = st.session_state.get('all_insights', {}).get((ai_model, chart_name))
+    if generated and generated[0] == insight_data[chart_name]:
+        st.info(generated[1])
 
 # === VISUALIZATION TABS ===
 st.markdown("### 📈 Visualisasi Data Interaktif")
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+# All five tab insights at once, requested in parallel
+if st.button("🤖 Generate Semua Insight", key="insight_all"):
+    with st.spinner(f"🔍 {ai_model} sedang menganalisis kelima tab..."):
+        with profiler.stage('ai.generate_all', detail=ai_model):
+            results = insights.service.generate_all(ai_model, insight_data, api_key=ai_api_key)
+    st.session_state['all_insights'] = {
+        (ai_model, name): (insight_data[name], text) for name, text in results.items()
+    }
+
+# Only the selected tab is built and sent to the browser on each rerun
+TAB_LABELS = [
     "😊 Distribusi Sentimen", 
     "📈 Tren Engagement", 
     "📱 Performa Platform", 
     "🎬 Tipe Media", 
-    "🌍 Top Lokasi"
-])
+    "🌍 Top Lokasi",
+    "🏆 Influencer"
+]
+active_tab = st.radio(
+    "Tab visualisasi:",
+    options=TAB_LABELS,
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_tab"
+)
 
 # Tab 1: Sentiment Analysis
-with tab1:
+if active_tab == TAB_LABELS[0]:
     st.markdown("#### 🎯 Analisis Distribusi Sentimen")
     
     # Sentiment pie chart
-    df_s = df_filtered['sentiment'].value_counts().reset_index()
-    df_s.columns = ['sentiment', 'count']
-    
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        fig1 = px.pie(
-            df_s, 
-            names='sentiment', 
-            values='count', 
-            title='Distribusi Sentimen Kampanye',
-            color='sentiment', 
-            color_discrete_map={
-                'Positive': '#22c55e',
-                'Neutral': '#6b7280',
-                'Negative': '#ef4444'
-            },
-            hole=0.4
-        )
-        
-        fig1.update_traces(
-            textposition='inside',
-            textinfo='percent+label',
-            textfont_size=12
-        )
-        
-        fig1.update_layout(
-            showlegend=True,
-            height=400,
-            font=dict(size=12)
-        )
-        
+        fig1 = charts.figure(charts.sentiment_pie, df_s)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
         st.markdown("##### 📊 Detail Sentimen")
+        if approx_mode:
+            sentiment_margins = view.margins('sentiment').set_index('sentiment')['posts']
         for _, row in df_s.iterrows():
             percentage = (row['count'] / df_s['count'].sum()) * 100
             st.metric(
                 f"{row['sentiment']}",
-                f"{row['count']:,}",
+                f"{approx_prefix}{row['count']:,}",
                 f"{percentage:.1f}%"
             )
+            if approx_mode:
+                st.caption(f"± {sentiment_margins[row['sentiment']]:,} post (CI 95%)")
     
     # AI Insight Button
     if st.button("🤖 AI Insight: Analisis Sentimen", key="insight_sentiment"):
-        with st.spinner(f"🔍 {ai_model} sedang menganalisis sentimen..."):
-            insight = generate_insight('Sentiment Analysis', df_s.to_string(index=False))
-            st.info(insight)
+        render_insight('Sentiment Analysis', f"🔍 {ai_model} sedang menganalisis sentimen...")
+    else:
+        show_generated_insight('Sentiment Analysis')
 
 # Tab 2: Engagement Trends
-with tab2:
+if active_tab == TAB_LABELS[1]:
     st.markdown("#### 📈 Tren Engagement Over Time")
     
-    # Daily engagement trend
-    df_t = df_filtered.groupby(df_filtered['date'].dt.date)['engagements'].sum().reset_index()
-    df_t.columns = ['Date', 'Engagements']
-    
-    fig2 = px.line(
-        df_t, 
-        x='Date', 
-        y='Engagements', 
-        title='Tren Engagement Harian',
-        markers=True,
-        line_shape='spline'
+    trend_granularity = st.radio(
+        "Granularitas:",
+        options=['auto', *downsample.GRANULARITIES],
+        format_func=lambda g: "Otomatis" if g == 'auto' else downsample.GRANULARITY_LABELS[g],
+        horizontal=True,
+        key="trend_granularity"
     )
     
-    fig2.update_traces(
-        line=dict(color='#22c55e', width=3),
-        marker=dict(size=6, color='#16a34a')
+    # Engagement trend, resampled and downsampled to the point budget
+    trend = downsample.trend(
+        daily_eng['day'], daily_eng['engagements'], trend_granularity,
+        calendar=data_cube.calendar
     )
-    
-    fig2.update_layout(
-        height=400,
-        hovermode='x unified'
+    fig2 = charts.figure(
+        charts.trend_line, trend.frame,
+        title=f'Tren Engagement {downsample.GRANULARITY_LABELS[trend.granularity]}'
     )
-    
     st.plotly_chart(fig2, use_container_width=True)
+    # Payload of the same chart with every daily point, for the reduction
+    trend_bytes = downsample.figure_bytes(fig2)
+    daily_bytes = shared_result('trend_daily_bytes', lambda: downsample.figure_bytes(charts.trend_line(
+        downsample.trend(daily_eng['day'], daily_eng['engagements'], 'day', budget=len(daily_eng)).frame
+    )))
+    st.caption(
+        f"📉 {len(trend.frame):,} titik dari {trend.days:,} hari "
+        f"({downsample.GRANULARITY_LABELS[trend.granularity].lower()}, {trend.buckets:,} periode) • "
+        f"payload grafik {schema.format_bytes(trend_bytes)}"
+        + (f" dari {schema.format_bytes(daily_bytes)} tanpa resampling ({daily_bytes / trend_bytes:.1f}x lebih kecil)"
+           if len(trend.frame) < trend.days else " (semua titik harian)")
+    )
     
     # Engagement statistics
     col1, col2, col3 = st.columns(3)
@@ -565,59 +829,37 @@ with tab2:
     
     # AI Insight Button
     if st.button("🤖 AI Insight: Tren Engagement", key="insight_trend"):
-        with st.spinner(f"🔍 {ai_model} sedang menganalisis tren..."):
-            if not df_t.empty:
-                trend_summary = f"Rata-rata: {df_t['Engagements'].mean():.1f}, Maximum: {df_t['Engagements'].max()}"
-            else:
-                trend_summary = "No trend data available"
-            insight = generate_insight('Engagement Trend Analysis', trend_summary)
-            st.info(insight)
+        render_insight('Engagement Trend Analysis', f"🔍 {ai_model} sedang menganalisis tren...")
+    else:
+        show_generated_insight('Engagement Trend Analysis')
 
 # Tab 3: Platform Performance
-with tab3:
+if active_tab == TAB_LABELS[2]:
     st.markdown("#### 📱 Analisis Performa Platform")
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Platform engagement bar chart
-        fig3 = px.bar(
-            platform_eng, 
-            x='platform', 
-            y='engagements', 
-            title='Total Engagement per Platform',
-            color='engagements',
-            color_continuous_scale='Greens'
-        )
-        
-        fig3.update_layout(height=400, showlegend=False)
+        fig3 = charts.figure(charts.platform_bar, platform_eng)
         st.plotly_chart(fig3, use_container_width=True)
     
     with col2:
         # Platform distribution
-        platform_counts = df_filtered['platform'].value_counts().reset_index()
-        platform_counts.columns = ['platform', 'posts']
+        platform_counts = view.rollup('platform')[['platform', 'posts']].sort_values('posts', ascending=False)
         
-        fig3b = px.pie(
-            platform_counts,
-            names='platform',
-            values='posts',
-            title='Distribusi Postingan per Platform',
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        
-        fig3b.update_layout(height=400)
+        fig3b = charts.figure(charts.platform_pie, platform_counts)
         st.plotly_chart(fig3b, use_container_width=True)
     
     # Platform performance table
     st.markdown("##### 📊 Ringkasan Performa Platform")
     
-    platform_summary = df_filtered.groupby('platform').agg({
-        'engagements': ['sum', 'mean', 'count']
-    }).round(0)
-    
-    platform_summary.columns = ['Total Engagement', 'Avg Engagement', 'Jumlah Post']
-    platform_summary = platform_summary.reset_index()
+    platform_summary = view.rollup('platform')
+    platform_summary['mean'] = (platform_summary['engagements'] / platform_summary['posts']).round(0)
+    platform_summary = platform_summary[['platform', 'engagements', 'mean', 'posts']]
+    platform_summary.columns = ['platform', 'Total Engagement', 'Avg Engagement', 'Jumlah Post']
+    if approx_mode:
+        platform_summary['± Engagement (CI 95%)'] = view.margins('platform')['engagements'].to_numpy()
     
     st.dataframe(
         platform_summary,
@@ -632,85 +874,61 @@ with tab3:
     
     # AI Insight Button
     if st.button("🤖 AI Insight: Performa Platform", key="insight_platform"):
-        with st.spinner(f"🔍 {ai_model} sedang menganalisis platform..."):
-            insight = generate_insight('Platform Performance Analysis', platform_eng.to_string(index=False))
-            st.info(insight)
+        render_insight('Platform Performance Analysis', f"🔍 {ai_model} sedang menganalisis platform...")
+    else:
+        show_generated_insight('Platform Performance Analysis')
 
 # Tab 4: Media Type Analysis
-with tab4:
+if active_tab == TAB_LABELS[3]:
     st.markdown("#### 🎬 Analisis Tipe Media")
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Media type pie chart
-        fig4 = px.pie(
-            media_counts, 
-            names='media_type', 
-            values='count', 
-            title='Distribusi Tipe Media',
-            hole=0.3,
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        
-        fig4.update_traces(textposition='inside', textinfo='percent+label')
-        fig4.update_layout(height=400)
+        fig4 = charts.figure(charts.media_pie, media_counts)
         st.plotly_chart(fig4, use_container_width=True)
     
     with col2:
         # Media type engagement performance
-        media_eng = df_filtered.groupby('media_type')['engagements'].mean().reset_index()
+        media_eng = view.rollup('media_type')
+        media_eng['engagements'] = media_eng['engagements'] / media_eng['posts']
+        media_eng = media_eng[['media_type', 'engagements']]
         media_eng = media_eng.sort_values('engagements', ascending=False)
         
-        fig4b = px.bar(
-            media_eng,
-            x='media_type',
-            y='engagements',
-            title='Rata-rata Engagement per Tipe Media',
-            color='engagements',
-            color_continuous_scale='Viridis'
-        )
-        
-        fig4b.update_layout(height=400, showlegend=False)
+        fig4b = charts.figure(charts.media_bar, media_eng)
         st.plotly_chart(fig4b, use_container_width=True)
     
     # AI Insight Button
     if st.button("🤖 AI Insight: Tipe Media", key="insight_media"):
-        with st.spinner(f"🔍 {ai_model} sedang menganalisis tipe media..."):
-            insight = generate_insight('Media Type Analysis', media_counts.to_string(index=False))
-            st.info(insight)
+        render_insight('Media Type Analysis', f"🔍 {ai_model} sedang menganalisis tipe media...")
+    else:
+        show_generated_insight('Media Type Analysis')
 
 # Tab 5: Geographic Analysis
-with tab5:
+if active_tab == TAB_LABELS[4]:
     st.markdown("#### 🌍 Top 5 Lokasi by Engagement")
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Top locations horizontal bar chart
-        fig5 = px.bar(
-            top_locations, 
-            x='engagements', 
-            y='location', 
-            orientation='h',
-            title='Top 5 Lokasi dengan Engagement Tertinggi',
-            color='engagements',
-            color_continuous_scale='Greens'
-        )
-        
-        fig5.update_layout(height=400, showlegend=False)
+        fig5 = charts.figure(charts.location_bar, top_locations)
         st.plotly_chart(fig5, use_container_width=True)
     
     with col2:
         # Location statistics
         st.markdown("##### 📊 Statistik Lokasi")
         
-        location_stats = df_filtered.groupby('location').agg({
-            'engagements': ['sum', 'mean', 'count']
-        }).round(0)
-        
-        location_stats.columns = ['Total', 'Rata-rata', 'Jumlah Post']
-        location_stats = location_stats.reset_index().sort_values('Total', ascending=False).head(5)
+        location_stats = view.rollup('location')
+        if approx_mode:
+            location_stats['margin'] = view.margins('location')['engagements'].to_numpy()
+        location_stats['mean'] = (location_stats['engagements'] / location_stats['posts']).round(0)
+        if approx_mode:
+            location_margins = location_stats.set_index('location')['margin']
+        location_stats = location_stats[['location', 'engagements', 'mean', 'posts']]
+        location_stats.columns = ['location', 'Total', 'Rata-rata', 'Jumlah Post']
+        location_stats = location_stats.sort_values('Total', ascending=False).head(5)
         
         for _, row in location_stats.iterrows():
             with st.container():
@@ -719,13 +937,59 @@ with tab5:
                 col_a.metric("Total", f"{row['Total']:,.0f}")
                 col_b.metric("Rata-rata", f"{row['Rata-rata']:,.0f}")
                 col_c.metric("Posts", f"{row['Jumlah Post']:,.0f}")
+                if approx_mode:
+                    st.caption(f"Total ± {location_margins[row['location']]:,} (CI 95%)")
                 st.markdown("---")
     
     # AI Insight Button
     if st.button("🤖 AI Insight: Analisis Lokasi", key="insight_location"):
-        with st.spinner(f"🔍 {ai_model} sedang menganalisis lokasi..."):
-            insight = generate_insight('Geographic Analysis', top_locations.to_string(index=False))
-            st.info(insight)
+        render_insight('Geographic Analysis', f"🔍 {ai_model} sedang menganalisis lokasi...")
+    else:
+        show_generated_insight('Geographic Analysis')
+
+# Tab 6: Influencer Leaderboard
+if active_tab == TAB_LABELS[5]:
+    st.markdown("#### 🏆 Leaderboard Influencer")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        leaderboard_k = st.slider("Jumlah influencer:", min_value=5, max_value=50, value=10, step=5)
+    with col2:
+        leaderboard_by = st.selectbox(
+            "Urutkan berdasarkan:",
+            options=list(influencers.RANKINGS),
+            format_func=influencers.RANKINGS.get
+        )
+    
+    # Separate day × influencer cube, built on first use; streaming builds it while reading
+    if df is not None:
+        influencer_cube = influencers.influencer_cube_for(dataset_hash, df)
+    else:
+        influencer_cube = stream.influencer_cube
+    with profiler.stage('influencer.leaderboard') as ranked:
+        leaders = shared_result(f'leaderboard:{leaderboard_by}:{leaderboard_k}', lambda: influencers.leaderboard(
+            influencer_cube, start_day, end_day, leaderboard_k, leaderboard_by, **facet_selection
+        ))
+        ranked.detail = f"top {leaderboard_k} dari {len(influencer_cube.cells['influencer'].cat.categories):,} handle"
+    
+    if leaders.empty:
+        st.info("ℹ️ Tidak ada data influencer pada filter ini")
+    else:
+        fig6 = charts.figure(charts.influencer_bar, leaders[['influencer', leaderboard_by]],
+                             title=f"Top {len(leaders)} Influencer – {influencers.RANKINGS[leaderboard_by]}")
+        st.plotly_chart(fig6, use_container_width=True)
+        
+        leader_table = leaders.rename(columns={
+            'rank': '#',
+            'influencer': 'Influencer',
+            'posts': 'Jumlah Post',
+            'engagements': 'Total Engagement',
+            'avg_engagement': 'Rata-rata',
+            'share_pct': 'Share %'
+        })
+        st.dataframe(leader_table, use_container_width=True, hide_index=True)
+        if leaderboard_by == 'avg_engagement':
+            st.caption(f"Hanya influencer dengan minimal {influencers.MIN_POSTS_FOR_AVERAGE} post yang diperingkat")
 
 # === ADDITIONAL ANALYSIS SECTION ===
 st.markdown("---")
@@ -737,49 +1001,56 @@ with col1:
     st.markdown("#### 📊 Korelasi Sentiment vs Engagement")
     
     # Sentiment vs Engagement analysis
-    sentiment_eng = df_filtered.groupby('sentiment')['engagements'].agg(['mean', 'sum', 'count']).reset_index()
+    sentiment_eng = view.rollup('sentiment')
+    sentiment_eng['mean'] = sentiment_eng['engagements'] / sentiment_eng['posts']
+    sentiment_eng = sentiment_eng[['sentiment', 'mean', 'engagements', 'posts']]
     sentiment_eng.columns = ['sentiment', 'avg_engagement', 'total_engagement', 'post_count']
     
-    fig_corr = px.bar(
-        sentiment_eng,
-        x='sentiment',
-        y='avg_engagement',
-        title='Rata-rata Engagement per Sentiment',
-        color='sentiment',
-        color_discrete_map={
-            'Positive': '#22c55e',
-            'Neutral': '#6b7280', 
-            'Negative': '#ef4444'
-        }
-    )
-    
-    fig_corr.update_layout(height=350, showlegend=False)
+    fig_corr = charts.figure(charts.sentiment_bar, sentiment_eng)
     st.plotly_chart(fig_corr, use_container_width=True)
 
 with col2:
     st.markdown("#### 🕐 Pola Engagement Bulanan")
     
-    # Monthly engagement pattern
-    df_filtered['month'] = df_filtered['date'].dt.strftime('%B %Y')
-    monthly_eng = df_filtered.groupby('month')['engagements'].sum().reset_index()
+    # Monthly engagement pattern, grouped on integer month codes (time order)
+    month_codes, month_totals = data_cube.calendar.rollup(daily_eng['day'], daily_eng['engagements'], 'month')
+    kept = downsample.downsample(month_codes, month_totals)
+    monthly_eng = pd.DataFrame({
+        'month': timebuckets.period_labels(month_codes[kept], 'month'),
+        'engagements': month_totals[kept]
+    })
     
-    fig_monthly = px.line(
-        monthly_eng,
-        x='month',
-        y='engagements',
-        title='Tren Engagement Bulanan',
-        markers=True
-    )
-    
-    fig_monthly.update_traces(
-        line=dict(color='#16a34a', width=3),
-        marker=dict(size=8, color='#22c55e')
-    )
-    
-    fig_monthly.update_layout(height=350)
-    fig_monthly.update_xaxes(tickangle=45)
+    fig_monthly = charts.figure(charts.monthly_line, monthly_eng)
     st.plotly_chart(fig_monthly, use_container_width=True)
 
+# Campaign comparison, only when several campaign files are loaded
+if len(campaigns) > 1:
+    st.markdown("#### 🏷️ Perbandingan Kampanye")
+    
+    # One cached prefix-sum index per campaign gives its KPIs for the window in O(1)
+    campaign_kpis = {
+        campaign: comparison.index_for(data_cube, **{**facet_selection, 'campaign': [campaign]}).window(start_day, end_day)
+        for campaign in campaigns
+    }
+    campaign_eng = pd.DataFrame({
+        'campaign': list(campaign_kpis),
+        'engagements': [k.engagements for k in campaign_kpis.values()]
+    }).sort_values('engagements', ascending=False)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_campaign = charts.figure(charts.campaign_bar, campaign_eng)
+        st.plotly_chart(fig_campaign, use_container_width=True)
+    with col2:
+        campaign_table = pd.DataFrame({
+            'Kampanye': campaign_eng['campaign'],
+            'Total Posts': [campaign_kpis[c].posts for c in campaign_eng['campaign']],
+            'Total Engagement': campaign_eng['engagements'],
+            'Avg Engagement': [campaign_kpis[c].avg_engagement for c in campaign_eng['campaign']],
+            'Positive %': [round(campaign_kpis[c].positive_pct, 1) for c in campaign_eng['campaign']]
+        })
+        st.dataframe(campaign_table, use_container_width=True, hide_index=True)
+
 # === PERFORMANCE SUMMARY ===
 st.markdown("---")
 st.markdown("### 📋 Ringkasan Executive")
@@ -795,7 +1066,8 @@ with summary_col1:
     st.info(f"**Total Engagement:** {top_platform['engagements']:,}")
     
     # Best media type
-    best_media = df_filtered.groupby('media_type')['engagements'].sum().idxmax() if not df_filtered.empty else 'N/A'
+    media_totals = view.rollup('media_type').set_index('media_type')['engagements']
+    best_media = media_totals.idxmax() if not media_totals.empty else 'N/A'
     st.info(f"**Media Type Terbaik:** {best_media}")
 
 with summary_col2:
@@ -808,7 +1080,7 @@ with summary_col2:
         st.warning(f"**Engagement:** {low_platform['engagements']:,}")
     
     # Negative sentiment percentage
-    neg_pct = df_filtered['sentiment'].value_counts(normalize=True).get('Negative', 0) * 100
+    neg_pct = sentiment_posts.get('Negative', 0) / kpi_view.posts * 100
     if neg_pct > 15:
         st.warning(f"**Sentiment Negatif:** {neg_pct:.1f}% (Perlu Perhatian)")
 
@@ -820,6 +1092,52 @@ with summary_col3:
     st.success("✅ Optimalkan timing posting")
     st.success("✅ Monitor sentiment secara real-time")
 
+# Positions of the filtered raw rows, shared by the explorer and the export
+if df is not None:
+    selection = pipeline.Selection(start_day, end_day, facet_selection)
+    with profiler.stage('filter.rows') as selected:
+        rows = shared_result('rows', lambda: pipeline.select_rows(selection, filters.index_for(dataset_hash, df)))
+        selected.rows = len(exports.positions(df, rows))
+
+# === DATA EXPLORER ===
+st.markdown("---")
+st.markdown("### 🔎 Data Explorer")
+
+if df is None:
+    st.info("ℹ️ Mode streaming/watch hanya menyimpan data agregat; baris mentah tidak tersedia untuk dijelajahi")
+else:
+    # Searched, sorted and paged on the server: only one page is sent to the browser
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        explore_search = st.text_input("Cari (platform, lokasi, influencer, tanggal, ...):").strip()
+    with col2:
+        explore_columns = [col for col in df.columns if col not in schema.DERIVED_COLS]
+        explore_sort = st.selectbox(
+            "Urutkan kolom:",
+            options=[None] + explore_columns,
+            format_func=lambda col: "—" if col is None else col
+        )
+    with col3:
+        explore_ascending = st.radio("Arah:", ["Naik", "Turun"], horizontal=True) == "Naik"
+    with col4:
+        explore_page_size = st.selectbox("Baris/halaman:", options=explorer.PAGE_SIZES, index=1)
+    
+    with profiler.stage('explorer') as explored:
+        explore_rows = shared_result(
+            f'explorer:{explore_search.casefold()}:{explore_sort}:{explore_ascending}',
+            lambda: explorer.order(df, explorer.match(df, rows, explore_search), explore_sort, explore_ascending)
+        )
+        explored.rows = len(explore_rows)
+    
+    page_count = max(1, -(-len(explore_rows) // explore_page_size))
+    explore_page = st.number_input("Halaman:", min_value=1, max_value=page_count, value=1, step=1)
+    st.dataframe(
+        explorer.page(df, explore_rows, int(explore_page) - 1, explore_page_size),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(f"{len(explore_rows):,} baris cocok • halaman {int(explore_page)} dari {page_count:,}")
+
 # === EXPORT FUNCTIONALITY ===
 st.markdown("---")
 st.markdown("### 💾 Export Data")
@@ -827,22 +1145,58 @@ st.markdown("### 💾 Export Data")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    if st.button("📊 Download Filtered Data", key="download_filtered"):
-        csv = df_filtered.to_csv(index=False)
+    export_format = st.selectbox(
+        "Format data terfilter:",
+        options=list(exports.FORMATS),
+        format_func=lambda fmt: exports.FORMATS[fmt].label
+    )
+    # The file is written chunk by chunk when the button is clicked, on
+    # Streamlit's download thread rather than in the script
+    if df is not None:
+        export_rows = len(exports.positions(df, rows))
+
+        def export_filtered():
+            # Stored datasets are opened with the chart columns only
+            export_df = store.load(stored_name, columns=None)[1] if stored_name else df
+            return exports.export_bytes(export_df, rows, export_format)
+    else:
+        # Streaming mode keeps no raw rows: export the daily aggregates instead
+        st.caption("ℹ️ Mode streaming: file berisi data agregat per hari")
+        export_slice = data_cube.slice(start_day, end_day, **facet_selection)
+        export_rows = len(export_slice)
+
+        def export_filtered():
+            export_cells = export_slice.cells.copy()
+            export_cells.insert(0, 'date', export_cells.pop('day').map(schema.day_to_date))
+            return exports.export_bytes(export_cells, slice(None), export_format)
+
+    export_label = f"📊 Download Filtered Data ({export_rows:,} baris)"
+    export_file_name = (f"spirifi_filtered_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                        f"{exports.FORMATS[export_format].extension}")
+    try:
         st.download_button(
-            label="💾 Download CSV",
-            data=csv,
-            file_name=f"spirifi_filtered_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
+            label=export_label,
+            data=export_filtered,
+            file_name=export_file_name,
+            mime=exports.FORMATS[export_format].mime,
+            key="download_filtered"
         )
+    except StreamlitAPIException:
+        # Streamlit versions without deferred downloads: build it on request in the script
+        if st.button(export_label, key="build_filtered"):
+            with profiler.stage('export.filtered') as exported:
+                export_data = export_filtered()
+                exported.rows = export_rows
+            st.download_button(
+                label="💾 Download",
+                data=export_data,
+                file_name=export_file_name,
+                mime=exports.FORMATS[export_format].mime
+            )
 
 with col2:
     if st.button("📈 Download Summary Report", key="download_summary"):
-        summary_data = {
-            'Metric': ['Total Posts', 'Total Engagement', 'Avg Engagement', 'Positive Sentiment %'],
-            'Value': [kpi_posts, kpi_total_eng, kpi_avg_eng, f"{kpi_pos_pct:.1f}%"]
-        }
-        summary_df = pd.DataFrame(summary_data)
+        summary_df = pipeline.summary_report(pipeline.kpis(exact_view()) if approx_mode else kpi_view)
         csv = summary_df.to_csv(index=False)
         st.download_button(
             label="💾 Download Summary",
@@ -853,7 +1207,7 @@ with col2:
 
 with col3:
     if st.button("📊 Download Platform Analysis", key="download_platform"):
-        csv = platform_eng.to_csv(index=False)
+        csv = (pipeline.platform_analysis(exact_view()) if approx_mode else platform_eng).to_csv(index=False)
         st.download_button(
             label="💾 Download Platform Data",
             data=csv,
@@ -861,6 +1215,35 @@ with col3:
             mime="text/csv"
         )
 
+# === PERFORMANCE PANEL ===
+with st.sidebar:
+    st.markdown("---")
+    with st.expander("⏱️ Performance"):
+        rss = profiling.rss_bytes()
+        st.caption(
+            f"Rerun ini: {profiler.total_seconds * 1000:,.0f} ms"
+            + (f" • Memori proses: {schema.format_bytes(rss)}" if rss is not None else "")
+        )
+        st.dataframe(profiler.frame(), use_container_width=True, hide_index=True)
+        if profiling.log_path():
+            st.caption(f"📝 Log: `{profiling.log_path()}`")
+        elif profiling.PROFILE_LOG:
+            st.caption(f"📝 Log `{profiling.PROFILE_LOG}` tidak dapat ditulis; tahap hanya ditampilkan di sini")
+        
+        # Process-wide caches: counters cover every session since the server started
+        cache_stats = cache.all_stats()
+        st.caption("🗃️ Cache bersama (semua sesi)")
+        st.dataframe(pd.DataFrame({
+            'Cache': list(cache_stats),
+            'Hit': [s.hits for s in cache_stats.values()],
+            'Miss': [s.misses for s in cache_stats.values()],
+            'Dibagi': [s.shared for s in cache_stats.values()],
+            'Hit %': [round(s.hits / max(s.hits + s.misses, 1) * 100, 1) for s in cache_stats.values()],
+            'Entri': [s.entries for s in cache_stats.values()],
+            'Memori': [f"{schema.format_bytes(s.total_bytes)} / {schema.format_bytes(s.max_bytes)}"
+                       for s in cache_stats.values()]
+        }), use_container_width=True, hide_index=True)
+
 # === FOOTER ===
 st.markdown("---")
 st.markdown("""
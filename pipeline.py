@@ -0,0 +1,135 @@
+# pipeline.py
+"""The dashboard's data pipeline without Streamlit: load, filter, aggregate, report
+
+Each step the dashboard runs between reading a CSV and showing or exporting
+its numbers is a plain function here, so the Streamlit app and the headless
+batch runner (batch.py) share the same code.
+"""
+import os
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+import exports
+import ingest
+import influencers
+import schema
+from comparison import Kpis
+from cube import Cube
+from filters import FACETS, FilterIndex
+
+Selection = namedtuple('Selection', ['start_day', 'end_day', 'facets'])
+
+REPORT_FILES = {
+    'summary': 'summary.csv',
+    'platform': 'platform_analysis.csv',
+    'filtered': 'filtered_data.csv',
+    'influencers': 'influencer_leaderboard.csv',
+}
+
+# Handles listed in the batch influencer leaderboard
+INFLUENCER_REPORT_K = 50
+
+
+def read_csv(path):
+    """Parse and clean one CSV file without the shared dataset cache.
+
+    Returns `(dataset_hash, df)` like `ingest.load_csv`.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    campaign = ingest.campaign_name(path)
+    return ingest.dataset_key(data, campaign), ingest.parse_csv(data, campaign)
+
+
+def make_selection(data_cube, start_date=None, end_date=None, **facets):
+    """Filter selection; dates and facets left unset select everything in the cube"""
+    start_day = data_cube.min_day if start_date is None else schema.date_to_day(start_date)
+    end_day = data_cube.max_day if end_date is None else schema.date_to_day(end_date)
+    return Selection(start_day, end_day, {
+        facet: list(facets.get(facet) or data_cube.members(facet)) for facet in FACETS
+    })
+
+
+def aggregate(data_cube, selection):
+    """Cube slice of a selection; every KPI and chart is a rollup of it"""
+    return data_cube.slice(selection.start_day, selection.end_day, **selection.facets)
+
+
+def kpis(view):
+    """`Kpis` of a cube slice or `incremental.Aggregates`"""
+    engagements, posts = view.totals()
+    sentiment_posts = view.rollup('sentiment').set_index('sentiment')['posts']
+    return Kpis(posts, engagements, int(sentiment_posts.get('Positive', 0)))
+
+
+def summary_report(current):
+    """The 'Download Summary Report' table for a `Kpis`"""
+    return pd.DataFrame({
+        'Metric': ['Total Posts', 'Total Engagement', 'Avg Engagement', 'Positive Sentiment %'],
+        'Value': [current.posts, current.engagements, current.avg_engagement, f"{current.positive_pct:.1f}%"]
+    })
+
+
+def platform_analysis(view):
+    """Total engagements per platform, best first"""
+    platform_eng = view.rollup('platform')[['platform', 'engagements']]
+    return platform_eng.sort_values('engagements', ascending=False)
+
+
+def influencer_leaderboard(df, selection, k=INFLUENCER_REPORT_K):
+    """Top `k` influencers of a selection by total engagement"""
+    influencer_cube = Cube.from_frame(df, dims=influencers.INFLUENCER_DIMS)
+    return influencers.leaderboard(influencer_cube, selection.start_day, selection.end_day, k, **selection.facets)
+
+
+def select_rows(selection, index):
+    """Row positions of a selection in the frame a `FilterIndex` was built over"""
+    return index.select(selection.start_day, selection.end_day, **selection.facets)
+
+
+def filtered_rows(df, selection, index=None, rows=None):
+    """Raw rows of a selection with the derived columns dropped.
+
+    `index` is a `FilterIndex` over `df` (or over a frame with the same row
+    order); one is built when not given. `rows` are positions already
+    selected with `select_rows`, e.g. shared between sessions.
+    """
+    if rows is None:
+        rows = select_rows(selection, FilterIndex(df) if index is None else index)
+    return df.iloc[rows].drop(columns=schema.DERIVED_COLS, errors='ignore')
+
+
+def run_report(path, out_dir, start_date=None, end_date=None, **facets):
+    """Write the summary, platform analysis, influencer leaderboard and filtered export of one CSV.
+
+    Files go to `out_dir/<file name without extension>/`. Returns a dict of
+    per-file statistics; a file that cannot be processed is reported with
+    its `error` instead of raising, so one bad client does not stop a batch.
+    """
+    started = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path))[0]
+    stats = {'file': name, 'rows': 0, 'posts': 0, 'engagements': 0, 'seconds': 0.0, 'error': None}
+    try:
+        _, df = read_csv(path)
+        data_cube = Cube.from_frame(df)
+        if data_cube.empty:
+            raise ValueError("Tidak ada baris valid")
+        selection = make_selection(data_cube, start_date, end_date, **facets)
+        view = aggregate(data_cube, selection)
+        current = kpis(view)
+
+        report_dir = os.path.join(out_dir, name)
+        os.makedirs(report_dir, exist_ok=True)
+        summary_report(current).to_csv(os.path.join(report_dir, REPORT_FILES['summary']), index=False)
+        platform_analysis(view).to_csv(os.path.join(report_dir, REPORT_FILES['platform']), index=False)
+        influencer_leaderboard(df, selection).to_csv(os.path.join(report_dir, REPORT_FILES['influencers']), index=False)
+        with open(os.path.join(report_dir, REPORT_FILES['filtered']), 'wb') as f:
+            exports.write(df, select_rows(selection, FilterIndex(df)), f)
+
+        stats.update(rows=len(df), posts=current.posts, engagements=current.engagements)
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        stats['error'] = str(e) or type(e).__name__
+    stats['seconds'] = time.perf_counter() - started
+    return stats
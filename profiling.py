@@ -0,0 +1,182 @@
+# profiling.py
+"""Per-stage instrumentation of a dashboard rerun: wall time, memory delta and rows
+
+The dashboard creates one `Profiler` per rerun and wraps each named stage of
+the script in `profiler.stage(...)`. Library code (ingest, cube, ...) calls
+the module-level `stage(...)`, which records into the rerun's profiler when
+one is active in the current thread and does nothing otherwise, so the batch
+runner and benchmarks pay no cost.
+
+Every finished stage is also written as one JSON line to a rotating log
+(PROFILE_LOG, empty to disable), tagged with DEPLOYMENT_ID, so regressions
+can be found across deployments with tools/profile_report.py.
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import uuid
+import warnings
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # Unix-only; without it (Windows) memory is not measured
+    resource = None
+
+PROFILE_LOG = os.environ.get(
+    'PROFILE_LOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profile.jsonl')
+)
+DEPLOYMENT_ID = os.environ.get('DEPLOYMENT_ID', 'local')
+
+PROFILE_LOG_BYTES = 16 * 1024 * 1024
+PROFILE_LOG_BACKUPS = 3
+
+_active = contextvars.ContextVar('profiler', default=None)
+_logger = logging.getLogger('media_dashboard.profile')
+_logger_lock = threading.Lock()
+# Set once the log file could not be opened, so it is not retried on every rerun
+_log_unavailable = False
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes():
+    """Resident set size of this process (peak RSS where /proc is unavailable, None without either)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        if resource is None:
+            return None
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if peak > 1 << 32 else peak * 1024
+
+
+class Stage:
+    """One timed stage; `rows` and `detail` may be filled in inside the block"""
+
+    __slots__ = ('name', 'depth', 'rows', 'detail', 'seconds', 'memory_delta')
+
+    def __init__(self, name, depth=0, rows=None, detail=None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.detail = detail
+        self.seconds = 0.0
+        self.memory_delta = 0
+
+
+def _profile_logger():
+    """The JSON-lines logger, configured on first use; None when logging is disabled or the file cannot be opened"""
+    global _log_unavailable
+    if not PROFILE_LOG:
+        return None
+    with _logger_lock:
+        if _log_unavailable:
+            return None
+        if not _logger.handlers:
+            try:
+                os.makedirs(os.path.dirname(PROFILE_LOG) or '.', exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    PROFILE_LOG, maxBytes=PROFILE_LOG_BYTES, backupCount=PROFILE_LOG_BACKUPS, encoding='utf-8'
+                )
+            except OSError as e:
+                # e.g. a read-only image: stages are still timed and shown, just not logged
+                _log_unavailable = True
+                warnings.warn(f"Profile log {PROFILE_LOG} disabled: {e}", RuntimeWarning, stacklevel=3)
+                return None
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _logger.addHandler(handler)
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+    return _logger
+
+
+def log_path():
+    """File the stages are logged to, or None when logging is disabled or unavailable"""
+    return None if _log_unavailable or not PROFILE_LOG else PROFILE_LOG
+
+
+class Profiler:
+    """Stages of one script run, in the order they started"""
+
+    def __init__(self, context=None, log=True):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.context = dict(context or {})
+        self.stages = []
+        self.started = time.perf_counter()
+        self.rss_start = rss_bytes()
+        self._depth = 0
+        self._logger = _profile_logger() if log else None
+        _active.set(self)
+
+    @contextmanager
+    def stage(self, name, rows=None, detail=None):
+        record = Stage(name, self._depth, rows, detail)
+        self.stages.append(record)
+        self._depth += 1
+        rss = rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            if rss is not None:
+                record.memory_delta = rss_bytes() - rss
+            self._depth -= 1
+            self._log(record)
+
+    @property
+    def total_seconds(self):
+        return time.perf_counter() - self.started
+
+    def frame(self):
+        """Stages as a frame for display; nested stages are indented"""
+        return pd.DataFrame({
+            'Tahap': [' ' * s.depth + s.name for s in self.stages],
+            'Waktu (ms)': [round(s.seconds * 1000, 1) for s in self.stages],
+            'Δ Memori (MB)': [round(s.memory_delta / 2**20, 1) for s in self.stages],
+            'Baris': [s.rows for s in self.stages],
+            'Keterangan': [s.detail or '' for s in self.stages],
+        })
+
+    def _log(self, record):
+        if self._logger is None:
+            return
+        self._logger.info(json.dumps({
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'deployment': DEPLOYMENT_ID,
+            'run_id': self.run_id,
+            'stage': record.name,
+            'depth': record.depth,
+            'seconds': round(record.seconds, 6),
+            'memory_delta': record.memory_delta,
+            'rows': record.rows,
+            'detail': record.detail,
+            **self.context,
+        }, default=str))
+
+
+def active():
+    """The profiler of the current script run, if any"""
+    return _active.get()
+
+
+def stage(name, rows=None, detail=None):
+    """`Profiler.stage` of the active profiler, or a no-op block without one"""
+    profiler = _active.get()
+    if profiler is None:
+        return nullcontext(Stage(name, rows=rows, detail=detail))
+    return profiler.stage(name, rows, detail)
@@ -0,0 +1,95 @@
+# schema.py
+"""Compact dtype representation of the cleaned dataset"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from sentiment import SENTIMENT_LABELS
+
+# Categorical dimensions. `None` means categories are the sorted distinct values,
+# which keeps the order stable no matter how rows are arranged in the file.
+DIMENSIONS = {
+    'platform': None,
+    'sentiment': SENTIMENT_LABELS,
+    'location': None,
+    'media_type': None,
+    'campaign': None,
+    'influencer': None,
+    'brand': None,
+    'post_type': None,
+}
+
+# Columns added by `compact` that are not part of the original data
+DERIVED_COLS = ['day']
+
+EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+
+MemoryReport = namedtuple('MemoryReport', ['before', 'after'])
+
+
+def frame_bytes(df):
+    """Deep memory usage of a frame in bytes"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def format_bytes(nbytes):
+    size = float(nbytes)
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GB"
+
+
+def to_day_index(dates):
+    """Days since 1970-01-01 as int32, for cheap integer range lookups"""
+    return dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int32)
+
+
+def date_to_day(value):
+    """Day index of a `datetime.date`"""
+    return int((np.datetime64(value, 'D') - EPOCH_DAY).astype(np.int64))
+
+
+def day_to_date(day):
+    """`datetime.date` for a day index"""
+    return (EPOCH_DAY + np.timedelta64(int(day), 'D')).astype(object)
+
+
+def compact(df):
+    """Convert a cleaned frame to its compact schema.
+
+    - dimensions become categoricals with stable category order
+    - engagements are downcast to the smallest integer type that fits
+    - dates are `datetime64[ns]`, with an int32 `day` index alongside
+
+    The before/after memory is stored in `df.attrs['memory_report']`.
+    """
+    before = frame_bytes(df)
+    df = df.copy()
+
+    for col, categories in DIMENSIONS.items():
+        values = df[col]
+        if categories is None:
+            categories = sorted(values.dropna().unique())
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            if list(values.cat.categories) != list(categories):
+                # Values outside `categories` become missing, as with pd.Categorical
+                df[col] = values.cat.set_categories(categories)
+            continue
+        df[col] = pd.Categorical(values, categories=categories)
+
+    df['engagements'] = pd.to_numeric(df['engagements'], downcast='integer')
+    df['date'] = df['date'].astype('datetime64[ns]')
+    df['day'] = to_day_index(df['date'])
+
+    df = df.reset_index(drop=True)
+    df.attrs['memory_report'] = MemoryReport(before, frame_bytes(df))
+    return df
+
+
+def describe_memory(report):
+    """Human readable 'before → after' line for a `MemoryReport`"""
+    saved = 1 - report.after / report.before if report.before else 0
+    return f"{format_bytes(report.before)} → {format_bytes(report.after)} (-{saved:.0%})"
@@ -0,0 +1,73 @@
+# sentiment.py
+"""Vectorized sentiment normalization: classify each distinct raw label once"""
+import numpy as np
+import pandas as pd
+
+SENTIMENT_LABELS = ['Positive', 'Neutral', 'Negative']
+
+# Exact (lower-cased, stripped) raw label -> standard label.
+# Anything not listed falls back to the 'pos' / 'neg' substring rule.
+DEFAULT_SYNONYMS = {
+    'pos': 'Positive',
+    'positive': 'Positive',
+    'positif': 'Positive',
+    'good': 'Positive',
+    'baik': 'Positive',
+    'neg': 'Negative',
+    'negative': 'Negative',
+    'negatif': 'Negative',
+    'bad': 'Negative',
+    'buruk': 'Negative',
+    'neu': 'Neutral',
+    'neutral': 'Neutral',
+    'netral': 'Neutral',
+    '😊': 'Positive',
+    '😀': 'Positive',
+    '😍': 'Positive',
+    '👍': 'Positive',
+    '❤️': 'Positive',
+    '😐': 'Neutral',
+    '😶': 'Neutral',
+    '😞': 'Negative',
+    '😡': 'Negative',
+    '😠': 'Negative',
+    '👎': 'Negative',
+}
+
+
+def classify_label(raw, synonyms=DEFAULT_SYNONYMS):
+    """Standard label for a single raw sentiment value"""
+    text = str(raw).lower().strip()
+    if text in synonyms:
+        return synonyms[text]
+    if 'pos' in text:
+        return 'Positive'
+    if 'neg' in text:
+        return 'Negative'
+    return 'Neutral'
+
+
+def normalize_sentiment(values, synonyms=None):
+    """Map raw sentiment labels to a Positive/Neutral/Negative categorical.
+
+    The raw column is factorized so `classify_label` runs once per distinct
+    label; the per-row work is a single integer take. Missing values become
+    'Neutral'. `synonyms` extends (and overrides) `DEFAULT_SYNONYMS`.
+    """
+    table = DEFAULT_SYNONYMS
+    if synonyms:
+        table = {**DEFAULT_SYNONYMS, **{str(k).lower().strip(): v for k, v in synonyms.items()}}
+
+    codes, uniques = pd.factorize(values)
+
+    label_codes = np.empty(len(uniques) + 1, dtype=np.int8)
+    for i, raw in enumerate(uniques):
+        label_codes[i] = SENTIMENT_LABELS.index(classify_label(raw, table))
+    # factorize marks missing values with -1, which indexes this last slot
+    label_codes[-1] = SENTIMENT_LABELS.index('Neutral')
+
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes[codes], categories=SENTIMENT_LABELS),
+        index=values.index,
+        name=values.name,
+    )
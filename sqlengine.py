@@ -0,0 +1,187 @@
+# sqlengine.py
+"""Optional DuckDB query engine: filters and rollups of the cleaned rows as SQL
+
+The default engine answers every KPI and chart from the pre-aggregated cube
+(cube.py / incremental.py) with pandas and numpy on one core. This one loads
+the cleaned rows of a dataset into an embedded, in-process DuckDB database
+(columnar and compressed) and runs the filter and each group-by as a
+multi-threaded query. Dimensions are stored as their category codes and
+decoded against the frame's categories, so results have the same dtypes and
+row order as `incremental.Aggregates.rollup`.
+
+DuckDB is not a requirement of the dashboard: without it `AVAILABLE` is
+False and the dashboard only offers the default engine.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import profiling
+from cache import MemoryLRU
+from cube import CUBE_DIMS
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+AVAILABLE = duckdb is not None
+
+ENGINES = ['pandas', 'duckdb']
+
+ENGINE_LABELS = {
+    'pandas': 'Pandas (cube)',
+    'duckdb': 'DuckDB (SQL)',
+}
+
+TABLE = 'cleaned_rows'
+
+
+class SqlTable:
+    """Cleaned rows of one dataset in their own in-memory DuckDB database.
+
+    Rows missing any cube dimension are left out, as `cube.build_cells`
+    leaves them out of the cube. `threads` caps DuckDB's worker threads
+    (default: one per core).
+    """
+
+    def __init__(self, df, key=None, threads=None):
+        if not AVAILABLE:
+            raise RuntimeError("DuckDB tidak terpasang (pip install duckdb)")
+        self.key = key
+        self.dims = [dim for dim in CUBE_DIMS if dim != 'day']
+        self.categories = {dim: df[dim].cat.categories for dim in self.dims}
+        codes = pd.DataFrame({
+            'day': df['day'].to_numpy(),
+            **{dim: df[dim].cat.codes.to_numpy() for dim in self.dims},
+            # BIGINT sums stay exact; narrower types are downcast by the compact schema
+            'engagements': df['engagements'].to_numpy(dtype=np.int64),
+        })
+        config = {} if threads is None else {'threads': int(threads)}
+        self._con = duckdb.connect(':memory:', config=config)
+        self._con.register('frame', codes)
+        complete = ' AND '.join(f'"{dim}" >= 0' for dim in self.dims)
+        self._con.execute(f"CREATE TABLE {TABLE} AS SELECT * FROM frame WHERE {complete}")
+        self._con.unregister('frame')
+        self._local = threading.local()
+
+    def __len__(self):
+        return self.query(f"SELECT COUNT(*) FROM {TABLE}")[0][0]
+
+    @property
+    def nbytes(self):
+        used = self.query("SELECT memory_usage_bytes FROM duckdb_memory() WHERE tag = 'IN_MEMORY_TABLE'")
+        return int(used[0][0]) if used else 0
+
+    @property
+    def threads(self):
+        return int(self.query("SELECT current_setting('threads')")[0][0])
+
+    def _cursor(self):
+        # A DuckDB connection is not safe to share between threads; cursors
+        # are per-thread connections to the same database
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._local.cursor = self._con.cursor()
+        return cursor
+
+    def query(self, sql, params=None):
+        """Rows of a query as a list of tuples"""
+        return self._cursor().execute(sql, params).fetchall()
+
+    def query_arrays(self, sql, params=None):
+        """Columns of a query as a dict of numpy arrays"""
+        return self._cursor().execute(sql, params).fetchnumpy()
+
+    def where(self, start_day, end_day, **facets):
+        """WHERE clause and parameters of a date range and facet value lists.
+
+        Facets whose selection covers every category are skipped, as in
+        `filters.FilterIndex.select`.
+        """
+        clauses = ['day BETWEEN ? AND ?']
+        for facet, values in facets.items():
+            categories = self.categories[facet]
+            codes = categories.get_indexer(list(values))
+            codes = np.unique(codes[codes >= 0])
+            if len(codes) == len(categories):
+                continue
+            # Codes are integers from get_indexer, so they are safe to inline
+            clauses.append(f'"{facet}" IN ({", ".join(map(str, codes))})' if len(codes) else 'FALSE')
+        return ' AND '.join(clauses), [int(start_day), int(end_day)]
+
+    def view(self, start_day, end_day, **facets):
+        return SqlView(self, *self.where(start_day, end_day, **facets))
+
+
+class SqlView:
+    """A filtered selection of a `SqlTable`, answering like `incremental.Aggregates`.
+
+    Each `totals()` / `rollup(dim)` is one query, run on first use and kept
+    for the lifetime of the view; `rollup` hands out copies.
+    """
+
+    def __init__(self, table, where, params):
+        self.table = table
+        self.where = where
+        self.params = params
+        self._results = {}
+
+    @property
+    def nbytes(self):
+        return sum(int(r.memory_usage(index=True, deep=True).sum()) if isinstance(r, pd.DataFrame) else 16
+                   for r in self._results.values())
+
+    @property
+    def empty(self):
+        return self.totals()[1] == 0
+
+    def totals(self):
+        """(total engagements, total posts)"""
+        if 'totals' not in self._results:
+            (engagements, posts), = self.table.query(
+                f"SELECT COALESCE(SUM(engagements), 0)::BIGINT, COUNT(*) FROM {TABLE} WHERE {self.where}",
+                self.params
+            )
+            self._results['totals'] = (int(engagements), int(posts))
+        return self._results['totals']
+
+    def rollup(self, dim):
+        """Same frame as `incremental.Aggregates.rollup(dim)`: one row per member with posts, in code order"""
+        if dim not in self._results:
+            columns = self.table.query_arrays(
+                f'SELECT "{dim}", SUM(engagements)::BIGINT AS engagements, COUNT(*) AS posts '
+                f'FROM {TABLE} WHERE {self.where} GROUP BY "{dim}" ORDER BY "{dim}"',
+                self.params
+            )
+            labels = np.asarray(columns[dim])
+            if dim != 'day':
+                labels = pd.Categorical.from_codes(labels, categories=self.table.categories[dim])
+            self._results[dim] = pd.DataFrame({
+                dim: labels,
+                'engagements': np.asarray(columns['engagements'], dtype=np.int64),
+                'posts': np.asarray(columns['posts'], dtype=np.int64),
+            })
+        # A copy: the view is shared between sessions and callers add columns to rollups
+        return self._results[dim].copy()
+
+
+# The columnar tables are compressed codes, a fraction of the cleaned frame
+SQL_CACHE_BYTES = 512 * 1024 * 1024
+
+_table_cache = MemoryLRU(SQL_CACHE_BYTES, max_entries=8, name='sql_tables')
+
+
+def table_for(dataset_hash, df):
+    """Cached `SqlTable` of a dataset, loaded once per dataset hash"""
+    if dataset_hash is None:
+        return SqlTable(df)
+
+    def load():
+        with profiling.stage('sql.load', rows=len(df)) as loaded:
+            sql_table = SqlTable(df, dataset_hash)
+            loaded.detail = f"{sql_table.threads} thread"
+        return sql_table
+
+    return _table_cache.get_or_compute(dataset_hash, load)
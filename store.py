@@ -0,0 +1,123 @@
+# store.py
+"""Local dataset store: cleaned frames saved as memory-mappable Arrow files"""
+import json
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from cache import MemoryLRU
+from schema import DIMENSIONS, MemoryReport, frame_bytes
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datasets')
+
+# Columns every chart needs; everything else is only read for exports
+CORE_COLUMNS = ['date', *DIMENSIONS, 'engagements', 'day']
+
+STORE_CACHE_BYTES = 1024 * 1024 * 1024
+
+_frame_cache = MemoryLRU(STORE_CACHE_BYTES, max_entries=16, name='store')
+
+
+def slugify(name):
+    """File-system safe dataset id"""
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', name.strip()).strip('_')
+    if not slug:
+        raise ValueError("Nama dataset tidak valid")
+    return slug
+
+
+def _paths(name):
+    slug = slugify(name)
+    return os.path.join(STORE_DIR, f"{slug}.arrow"), os.path.join(STORE_DIR, f"{slug}.json")
+
+
+def save(name, df, dataset_hash):
+    """Write a cleaned, compact frame and its schema/statistics under `name`.
+
+    The data is an uncompressed Arrow IPC (Feather v2) file so later reads can
+    memory-map it and only materialize the requested columns.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    data_path, meta_path = _paths(name)
+
+    table_df = df.copy(deep=False)
+    table_df.attrs = {}
+    feather.write_feather(table_df, data_path, compression='uncompressed')
+
+    report = df.attrs.get('memory_report')
+    metadata = {
+        'name': slugify(name),
+        'hash': dataset_hash,
+        'saved_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': len(df),
+        'columns': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'file_bytes': os.path.getsize(data_path),
+        'memory_before': report.before if report else None,
+        'memory_after': report.after if report else frame_bytes(df),
+        'stats': {
+            'date_min': df['date'].min().isoformat() if len(df) else None,
+            'date_max': df['date'].max().isoformat() if len(df) else None,
+            'engagements_sum': int(df['engagements'].sum()),
+            'engagements_max': int(df['engagements'].max()) if len(df) else 0,
+            'distinct': {dim: int(df[dim].nunique()) for dim in DIMENSIONS},
+        },
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+def read_metadata(name):
+    _, meta_path = _paths(name)
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_datasets():
+    """Metadata of every stored dataset, newest first"""
+    if not os.path.isdir(STORE_DIR):
+        return []
+    datasets = []
+    for entry in os.listdir(STORE_DIR):
+        if entry.endswith('.json'):
+            try:
+                datasets.append(read_metadata(entry[:-len('.json')]))
+            except (OSError, ValueError):
+                continue
+    return sorted(datasets, key=lambda m: m['saved_at'], reverse=True)
+
+
+def load(name, columns=CORE_COLUMNS):
+    """Open a stored dataset, reading only `columns` (all when None).
+
+    Returns `(dataset_hash, df)` like `ingest.load_csv`. Frames are cached per
+    process and must not be modified in place.
+    """
+    metadata = read_metadata(name)
+    if columns is not None:
+        columns = [col for col in columns if col in metadata['columns']]
+    key = (metadata['name'], metadata['saved_at'], None if columns is None else tuple(columns))
+
+    def read():
+        data_path, _ = _paths(name)
+        table = feather.read_table(data_path, columns=columns, memory_map=True)
+        df = table.to_pandas()
+        # Datasets saved before a dimension existed get one value for it:
+        # their name as campaign, 'Unknown' otherwise
+        for dim in DIMENSIONS:
+            if dim not in df.columns:
+                df[dim] = pd.Categorical([metadata['name'] if dim == 'campaign' else 'Unknown'] * len(df))
+        before = metadata['memory_before'] or metadata['memory_after']
+        df.attrs['memory_report'] = MemoryReport(before, frame_bytes(df))
+        return df
+
+    return metadata['hash'], _frame_cache.get_or_compute(key, read)
+
+
+def delete(name):
+    for path in _paths(name):
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,147 @@
+# streaming.py
+"""Chunked ingest for CSVs larger than memory: keep only the aggregated cells"""
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from approx import ApproxSummary
+from cache import MemoryLRU
+from cube import CUBE_DIMS, Cube, build_cells, merge_cells
+from dates import merge_reports
+from influencers import INFLUENCER_DIMS
+from ingest import (DEFAULT_CAMPAIGN, OPTIONAL_COLS, REQUIRED_COLS, campaign_name, column_key, content_hash,
+                    prepare, standardize_columns, unique_campaigns)
+from schema import DERIVED_COLS
+
+STREAM_CHUNK_ROWS = 250_000
+
+# Streamed results are only the cells, so far fewer bytes are needed than for raw frames
+STREAM_CACHE_BYTES = 512 * 1024 * 1024
+
+_stream_cache = MemoryLRU(STREAM_CACHE_BYTES, max_entries=16, name='streams')
+
+StreamResult = namedtuple('StreamResult', [
+    'cube', 'rows_read', 'rows_kept', 'chunks', 'preview', 'date_report', 'influencer_cube', 'approx'
+])
+
+# Cell grains folded per chunk: the main cube and the influencer cube
+GRAINS = [CUBE_DIMS, INFLUENCER_DIMS]
+
+
+def source_key(source):
+    """Cache key for a local path (path + size + mtime) or an in-memory upload"""
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        return ('path', os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+    return ('bytes', content_hash(source.getvalue()))
+
+
+def source_campaign(source):
+    """Campaign label of a local path or a named upload"""
+    if isinstance(source, (str, os.PathLike)):
+        return campaign_name(source)
+    name = getattr(source, 'name', None)
+    return campaign_name(name) if name else DEFAULT_CAMPAIGN
+
+
+def stream_csv(source, chunk_rows=STREAM_CHUNK_ROWS, campaign=DEFAULT_CAMPAIGN):
+    """Read `source` chunk by chunk, clean each chunk and fold it into cube cells.
+
+    Both the main and the influencer cube are built, and each chunk is also
+    folded into the approximate-mode sample and sketches. Only the required and
+    optional columns are parsed. Partial cells are merged whenever
+    they grow past one chunk, so peak memory stays around two chunks plus the
+    final cells no matter how large the file is. The date format is inferred
+    per chunk until one chunk settles it unambiguously, then reused for the rest.
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    reader = pd.read_csv(
+        source,
+        chunksize=chunk_rows,
+        usecols=lambda col: column_key(col) in REQUIRED_COLS or column_key(col) in OPTIONAL_COLS,
+    )
+
+    parts = [[] for _ in GRAINS]
+    pending_rows = [0] * len(GRAINS)
+    rows_read = rows_kept = chunks = 0
+    preview = None
+    date_reports = []
+    date_format = None
+    summary = ApproxSummary()
+
+    for chunk in reader:
+        rows_read += len(chunk)
+        chunks += 1
+        chunk = prepare(standardize_columns(chunk), campaign, date_format)
+        date_reports.append(chunk.attrs['date_report'])
+        # Kept for later chunks once a chunk settles it (not while every day is <= 12)
+        if date_format is None and not date_reports[-1].ambiguous:
+            date_format = date_reports[-1].date_format
+        rows_kept += len(chunk)
+        if preview is None:
+            preview = chunk.head(10).drop(columns=DERIVED_COLS)
+
+        for i, dims in enumerate(GRAINS):
+            parts[i].append(build_cells(chunk, dims))
+            pending_rows[i] += len(parts[i][-1])
+            if pending_rows[i] > chunk_rows:
+                parts[i] = [merge_cells(parts[i], dims)]
+                pending_rows[i] = len(parts[i][0])
+        summary = summary.add(chunk)
+        del chunk
+
+    if preview is None:
+        raise ValueError("File CSV kosong")
+
+    streamed, influencer_cube = (Cube(merge_cells(p, dims)) for p, dims in zip(parts, GRAINS))
+    # Build before caching so their size is accounted for
+    streamed.index
+    influencer_cube.index
+    return StreamResult(streamed, rows_read, rows_kept, chunks, preview, merge_reports(date_reports), influencer_cube,
+                        summary)
+
+
+def load_stream(source, chunk_rows=STREAM_CHUNK_ROWS, campaign=None):
+    """Cached `stream_csv`: each distinct file is streamed once per process"""
+    campaign = campaign or source_campaign(source)
+    key = (*source_key(source), campaign)
+
+    def read():
+        result = stream_csv(source, chunk_rows, campaign)
+        result.cube.key = key
+        result.influencer_cube.key = key
+        return result
+
+    return _stream_cache.get_or_compute(key, read)
+
+
+def load_streams(sources, chunk_rows=STREAM_CHUNK_ROWS):
+    """`load_stream` for several files, merged into one cube with a campaign per file"""
+    campaigns = unique_campaigns(source_campaign(source) for source in sources)
+    results = [load_stream(source, chunk_rows, campaign) for source, campaign in zip(sources, campaigns)]
+    if len(results) == 1:
+        return results[0]
+
+    key = ('streams', *(r.cube.key for r in results))
+
+    def combine():
+        merged = Cube(merge_cells([r.cube.cells for r in results]), key)
+        merged.index
+        merged.calendar
+        influencer_cube = Cube(merge_cells([r.influencer_cube.cells for r in results], INFLUENCER_DIMS), key)
+        influencer_cube.index
+        return StreamResult(
+            merged,
+            sum(r.rows_read for r in results),
+            sum(r.rows_kept for r in results),
+            sum(r.chunks for r in results),
+            pd.concat([r.preview for r in results], ignore_index=True).head(10),
+            merge_reports(r.date_report for r in results),
+            influencer_cube,
+            ApproxSummary.merge(r.approx for r in results),
+        )
+
+    return _stream_cache.get_or_compute(key, combine)
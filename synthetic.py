@@ -0,0 +1,119 @@
+# synthetic.py
+"""Seeded synthetic campaign data with the same columns as Spirifi.csv
+
+Rows are generated in fixed-size blocks, each from its own seed derived from
+(seed, block number), so the output depends only on `seed` and `rows` and a
+50M-row file can be written block by block in bounded memory.
+
+The distributions are skewed the way real campaign exports are: locations and
+influencers follow a Zipf-like popularity curve, sentiment is mostly positive,
+posting volume has a weekly cycle and a slow growth trend, and engagements
+are log-normal with platform and media-type multipliers.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Date', 'Platform', 'Sentiment', 'Location', 'Engagements', 'Media_Type',
+           'Influencer_Brand', 'Post_Type']
+
+PLATFORMS = {'Instagram': 0.30, 'TikTok': 0.27, 'X/Twitter': 0.23, 'YouTube': 0.20}
+SENTIMENTS = {'Positive': 0.57, 'Neutral': 0.35, 'Negative': 0.08}
+MEDIA_TYPES = {'Carousel': 0.28, 'Image': 0.26, 'Text': 0.26, 'Video': 0.20}
+POST_TYPES = {'Collab': 0.24, 'Promo': 0.20, 'Product Launch': 0.20, 'Review': 0.19, 'Behind the Scenes': 0.17}
+
+# Engagement multipliers on top of the log-normal base
+PLATFORM_REACH = {'Instagram': 1.0, 'TikTok': 1.6, 'X/Twitter': 0.6, 'YouTube': 1.3}
+MEDIA_REACH = {'Carousel': 1.1, 'Image': 0.9, 'Text': 0.5, 'Video': 1.8}
+
+# Spirifi's cities first, then smaller ones that only show up at larger sizes
+LOCATIONS = ['Bandung', 'Denpasar', 'Yogyakarta', 'Makassar', 'Jakarta', 'Medan', 'Surabaya',
+             'Semarang', 'Palembang', 'Malang', 'Balikpapan', 'Manado', 'Pontianak', 'Padang',
+             'Pekanbaru', 'Banjarmasin', 'Batam', 'Kupang', 'Jayapura', 'Ambon']
+HANDLES = ['@genzfoodie', '@kulinerhits', '@drinkculture', '@tastebuds.id', '@snackattack']
+BRANDS = ['Spirifi']
+
+# Rows per generated block; part of the output definition, so never change it
+BLOCK_ROWS = 1_000_000
+
+DEFAULT_START = '2023-01-01'
+DEFAULT_DAYS = 365
+DEFAULT_SKEW = 1.1
+
+
+def zipf_weights(n, skew=DEFAULT_SKEW):
+    """Popularity of `n` ranked members, proportional to 1 / rank**skew"""
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def influencers(count):
+    """`count` 'handle | brand' labels; Spirifi's five come first"""
+    labels = [f"{handle} | {BRANDS[0]}" for handle in HANDLES]
+    for i in range(len(labels), count):
+        labels.append(f"@creator{i:04d} | {BRANDS[i % len(BRANDS)]}")
+    return labels[:count]
+
+
+def day_weights(days, start=DEFAULT_START):
+    """Posting volume per day: weekend peaks and a slow upward trend"""
+    weekday = (np.datetime64(start, 'D') + np.arange(days)).astype('datetime64[D]').view('int64')
+    weekday = (weekday + 3) % 7  # 0 = Monday
+    weights = np.where(weekday >= 5, 1.4, 1.0) * np.linspace(1.0, 1.5, days)
+    return weights / weights.sum()
+
+
+def _choice(rng, members, rows):
+    """Categorical sampled from a {member: probability} dict"""
+    labels = list(members)
+    codes = rng.choice(len(labels), size=rows, p=np.fromiter(members.values(), dtype=np.float64))
+    return pd.Categorical.from_codes(codes, labels)
+
+
+def _block(seed, block, rows, dates, day_p, locations, location_p, handles, handle_p):
+    rng = np.random.default_rng([seed, block])
+    platform = _choice(rng, PLATFORMS, rows)
+    media_type = _choice(rng, MEDIA_TYPES, rows)
+    reach = (np.asarray(platform.map(PLATFORM_REACH), dtype=np.float64)
+             * np.asarray(media_type.map(MEDIA_REACH), dtype=np.float64))
+    engagements = np.rint(rng.lognormal(mean=8.5, sigma=1.0, size=rows) * reach).astype(np.int64)
+    return pd.DataFrame({
+        'Date': pd.Categorical.from_codes(rng.choice(len(dates), size=rows, p=day_p), dates),
+        'Platform': platform,
+        'Sentiment': _choice(rng, SENTIMENTS, rows),
+        'Location': pd.Categorical.from_codes(rng.choice(len(locations), size=rows, p=location_p), locations),
+        'Engagements': engagements,
+        'Media_Type': media_type,
+        'Influencer_Brand': pd.Categorical.from_codes(rng.choice(len(handles), size=rows, p=handle_p), handles),
+        'Post_Type': _choice(rng, POST_TYPES, rows),
+    })
+
+
+def blocks(rows, seed=42, start=DEFAULT_START, days=DEFAULT_DAYS, skew=DEFAULT_SKEW,
+           locations=len(LOCATIONS), influencer_count=50):
+    """Yield the raw frames (Spirifi column names, string-valued categoricals) of `rows` rows"""
+    dates = np.datetime_as_string(np.datetime64(start, 'D') + np.arange(days), unit='D')
+    day_p = day_weights(days, start)
+    location_names = (LOCATIONS * (locations // len(LOCATIONS) + 1))[:locations]
+    location_names = [name if i < len(LOCATIONS) else f"{name} {i // len(LOCATIONS) + 1}"
+                      for i, name in enumerate(location_names)]
+    handles = influencers(influencer_count)
+    for block, offset in enumerate(range(0, rows, BLOCK_ROWS)):
+        yield _block(seed, block, min(BLOCK_ROWS, rows - offset), dates, day_p,
+                     location_names, zipf_weights(locations, skew),
+                     handles, zipf_weights(influencer_count, skew))
+
+
+def generate(rows, seed=42, **options):
+    """The whole dataset as one raw frame; see `blocks` for the options"""
+    frames = list(blocks(rows, seed, **options))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_csv(path, rows, seed=42, **options):
+    """Write the dataset to `path` block by block; returns the file size in bytes"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for i, frame in enumerate(blocks(rows, seed, **options)):
+            frame.to_csv(f, index=False, header=(i == 0))
+        return f.tell()
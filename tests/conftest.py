@@ -0,0 +1,22 @@
+# tests/conftest.py
+"""Shared fixtures: a seeded synthetic dataset, cleaned as the dashboard loads it"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ingest  # noqa: E402
+import synthetic  # noqa: E402
+from cube import Cube  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def frame():
+    return ingest.prepare(ingest.standardize_columns(synthetic.generate(20_000, seed=7)))
+
+
+@pytest.fixture(scope='session')
+def data_cube(frame):
+    return Cube.from_frame(frame, key='synthetic-20k')
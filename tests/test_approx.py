@@ -0,0 +1,75 @@
+# tests/test_approx.py
+import numpy as np
+
+import pipeline
+from approx import ApproxSummary
+
+# Small enough per platform that the 20k-row fixture is sampled, not copied
+SAMPLE_K = 1_000
+SEEDS = 40
+# 95% intervals; with 40 draws a rate below this is very unlikely for a correct estimator
+MIN_COVERAGE = 0.85
+
+KPIS = ['posts', 'engagements', 'avg_engagement', 'positive_pct']
+FACETS = {'platform': ['Instagram', 'TikTok', 'YouTube'], 'media_type': ['Image', 'Video', 'Carousel']}
+
+
+def _selection(data_cube):
+    return data_cube.min_day + 30, data_cube.max_day - 30
+
+
+def test_intervals_cover_the_exact_values_at_their_nominal_rate(frame, data_cube):
+    start_day, end_day = _selection(data_cube)
+    exact_view = data_cube.slice(start_day, end_day, **FACETS)
+    exact = pipeline.kpis(exact_view)
+    truth = exact_view.rollup('platform').set_index('platform')
+    # Each interval counts once: 4 KPIs, and engagements and posts of every platform
+    covered = {name: 0 for name in KPIS}
+    intervals = {name: SEEDS for name in KPIS}
+    for measure in ['engagements', 'posts']:
+        covered[f'platform {measure}'], intervals[f'platform {measure}'] = 0, SEEDS * len(truth)
+
+    for seed in range(SEEDS):
+        summary = ApproxSummary(rng=np.random.default_rng(seed), k=SAMPLE_K).add(frame)
+        view = summary.view(start_day, end_day, **FACETS)
+        estimate, margins = pipeline.kpis(view), view.kpi_margins()
+        for name in KPIS:
+            covered[name] += abs(getattr(estimate, name) - getattr(exact, name)) <= margins[name]
+        estimated = view.rollup('platform').set_index('platform')
+        margin = view.margins('platform').set_index('platform')
+        for measure in ['engagements', 'posts']:
+            covered[f'platform {measure}'] += int(((estimated[measure] - truth[measure]).abs() <= margin[measure]).sum())
+
+    for name, count in covered.items():
+        assert count / intervals[name] >= MIN_COVERAGE, (name, count, intervals[name])
+
+
+def test_sample_size_per_stratum(frame):
+    summary = ApproxSummary(k=SAMPLE_K).add(frame)
+    assert summary.rows == len(frame)
+    assert summary.sample['platform'].value_counts().eq(SAMPLE_K).all()
+    assert set(summary.population) == set(frame['platform'].unique())
+
+
+def test_strata_sampled_in_full_are_exact_with_zero_margin(frame, data_cube):
+    # The default k exceeds every platform's rows, so nothing is left out
+    summary = ApproxSummary().add(frame)
+    start_day, end_day = _selection(data_cube)
+    view = summary.view(start_day, end_day, **FACETS)
+    exact_view = data_cube.slice(start_day, end_day, **FACETS)
+
+    assert summary.sample_rows == len(frame)
+    assert view.totals() == exact_view.totals()
+    assert all(margin == 0 for margin in view.kpi_margins().values())
+    assert (view.margins('platform')[['engagements', 'posts']] == 0).all().all()
+
+
+def test_distinct_counts_within_their_margin(frame, data_cube):
+    # The sketches hash labels, so they do not depend on the sample's random draw
+    summary = ApproxSummary(k=SAMPLE_K).add(frame)
+    start_day, end_day = _selection(data_cube)
+    platforms = FACETS['platform']
+    rows = frame[frame['day'].between(start_day, end_day) & frame['platform'].isin(platforms)]
+    for col in ['location', 'influencer']:
+        distinct, distinct_margin = summary.distinct(col, start_day, end_day, platforms)
+        assert abs(distinct - rows[col].nunique()) <= distinct_margin, col
@@ -0,0 +1,77 @@
+# tests/test_cache.py
+import threading
+import time
+
+import pytest
+
+from cache import MemoryLRU
+
+CALLERS = 8
+
+
+def _concurrent_calls(lru, compute):
+    """Outcome of `get_or_compute` in CALLERS threads, all asking while the first one computes"""
+    started, release = threading.Event(), threading.Event()
+    outcomes = [None] * CALLERS
+
+    def gated():
+        started.set()
+        release.wait(5)
+        return compute()
+
+    def call(i):
+        try:
+            outcomes[i] = ('value', lru.get_or_compute('key', gated))
+        except Exception as error:
+            outcomes[i] = ('error', error)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Every other caller is waiting on the first one's computation
+    deadline = time.monotonic() + 5
+    while lru.shared < CALLERS - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_get_or_compute_runs_once_for_concurrent_callers():
+    lru = MemoryLRU(1024 * 1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ['result']
+
+    outcomes = _concurrent_calls(lru, compute)
+
+    assert len(calls) == 1
+    assert all(kind == 'value' for kind, _ in outcomes)
+    assert all(value is outcomes[0][1] for _, value in outcomes)
+    assert (lru.misses, lru.shared) == (1, CALLERS - 1)
+    assert lru.get_or_compute('key', compute) is outcomes[0][1]
+    assert len(calls) == 1 and lru.hits == 1
+
+
+def test_get_or_compute_passes_the_exception_to_every_caller():
+    lru = MemoryLRU(1024 * 1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        raise ValueError("parse failed")
+
+    outcomes = _concurrent_calls(lru, compute)
+
+    assert len(calls) == 1
+    assert all(kind == 'error' and isinstance(error, ValueError) for kind, error in outcomes)
+    # Nothing is cached, so the next caller computes again
+    assert 'key' not in lru
+    with pytest.raises(ValueError):
+        lru.get_or_compute('key', compute)
+    assert len(calls) == 2
@@ -0,0 +1,42 @@
+# tests/test_incremental.py
+import numpy as np
+import pandas as pd
+
+from filters import FACETS
+from incremental import GROUP_DIMS, IncrementalAggregator
+
+
+def _random_change(rng, data_cube, start_day, end_day, facets):
+    """One sidebar change: toggle a facet's values, shift the date range, or change both"""
+    facets = dict(facets)
+    kind = rng.integers(3)
+    if kind != 1:
+        facet = FACETS[rng.integers(len(FACETS))]
+        members = data_cube.members(facet)
+        picked = rng.random(len(members)) < 0.6
+        facets[facet] = [m for m, keep in zip(members, picked) if keep]
+    if kind != 0:
+        span = data_cube.max_day - data_cube.min_day
+        start_day = data_cube.min_day + int(rng.integers(span))
+        end_day = min(data_cube.max_day, start_day + int(rng.integers(1, span)))
+    return start_day, end_day, facets
+
+
+def test_incremental_updates_match_a_full_slice(data_cube):
+    rng = np.random.default_rng(0)
+    aggregator = IncrementalAggregator()
+    start_day, end_day = data_cube.min_day, data_cube.max_day
+    facets = {facet: data_cube.members(facet) for facet in FACETS}
+    updates = set()
+
+    for _ in range(60):
+        start_day, end_day, facets = _random_change(rng, data_cube, start_day, end_day, facets)
+        aggregates = aggregator.update(data_cube, start_day, end_day, **facets)
+        updates.add(aggregator.last_update)
+
+        expected = data_cube.slice(start_day, end_day, **facets)
+        assert aggregates.totals() == expected.totals()
+        for dim in GROUP_DIMS:
+            pd.testing.assert_frame_equal(aggregates.rollup(dim), expected.rollup(dim))
+
+    assert 'delta' in updates
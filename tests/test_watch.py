@@ -0,0 +1,43 @@
+# tests/test_watch.py
+import pandas as pd
+
+import ingest
+import synthetic
+from cube import CUBE_DIMS, append_cells, build_cells
+from influencers import INFLUENCER_DIMS
+from watch import Watcher
+
+
+def _sorted_cells(cells, dims=CUBE_DIMS):
+    """Cells in a canonical row order with plain labels, to compare regardless of grouping order"""
+    cells = cells.astype({dim: str for dim in dims if dim != 'day'})
+    return cells.sort_values(dims, ignore_index=True)
+
+
+def test_append_cells_matches_a_full_rebuild(frame):
+    history, appended = frame.iloc[:15_000], frame.iloc[15_000:]
+    cells = append_cells(build_cells(history), build_cells(appended))
+    pd.testing.assert_frame_equal(_sorted_cells(cells), _sorted_cells(build_cells(frame)))
+
+
+def test_watcher_after_the_file_grows_matches_rereading_it(tmp_path):
+    rows = synthetic.generate(6_000, seed=11)
+    path = tmp_path / 'Live.csv'
+    rows.iloc[:4_000].to_csv(path, index=False)
+    # Small blocks, so each refresh folds several blocks into the cells
+    watcher = Watcher(str(path), block_bytes=64 * 1024)
+    first, _ = watcher.refresh()
+
+    # The export grows, with a line still being written at the end
+    with open(path, 'a', newline='') as f:
+        rows.iloc[4_000:].to_csv(f, header=False, index=False)
+        f.write(rows.iloc[:1].to_csv(header=False, index=False).rstrip('\n')[:10])
+    result, appended = watcher.refresh()
+
+    reread = ingest.prepare(ingest.standardize_columns(rows), ingest.campaign_name(path))
+    assert appended == 2_000
+    assert result.cube.key != first.cube.key
+    assert result.rows_kept == len(reread)
+    pd.testing.assert_frame_equal(_sorted_cells(result.cube.cells), _sorted_cells(build_cells(reread)))
+    pd.testing.assert_frame_equal(_sorted_cells(result.influencer_cube.cells, INFLUENCER_DIMS),
+                                  _sorted_cells(build_cells(reread, INFLUENCER_DIMS), INFLUENCER_DIMS))
@@ -0,0 +1,88 @@
+# timebuckets.py
+"""Integer period codes (week, month, quarter) for the day index
+
+Every temporal aggregate groups on these codes instead of formatted date
+strings: codes are plain integers that sort in calendar order. A `Calendar`
+holds the codes of every day of a dataset's range, computed once when the
+dataset's cube is built, so rolling a daily series up to any period is a
+table lookup plus a `bincount`.
+"""
+import numpy as np
+
+from schema import EPOCH_DAY
+
+PERIODS = ['day', 'week', 'month', 'quarter']
+
+
+def _months(days):
+    """Months since 1970-01 for day indexes"""
+    return (EPOCH_DAY + days.astype('timedelta64[D]')).astype('datetime64[M]').astype(np.int64)
+
+
+def period_codes(days, period):
+    """Period code of each day index; codes increase with time"""
+    days = np.asarray(days, dtype=np.int64)
+    if period == 'day':
+        return days
+    if period == 'week':
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        return (days + 3) // 7
+    if period == 'month':
+        return _months(days)
+    if period == 'quarter':
+        return _months(days) // 3
+    raise ValueError(f"Unknown period {period!r}")
+
+
+def period_start_days(codes, period):
+    """Day index of the first day of each period"""
+    codes = np.asarray(codes, dtype=np.int64)
+    if period == 'day':
+        return codes
+    if period == 'week':
+        return codes * 7 - 3
+    if period == 'month':
+        months = codes
+    elif period == 'quarter':
+        months = codes * 3
+    else:
+        raise ValueError(f"Unknown period {period!r}")
+    starts = months.astype('datetime64[M]').astype('datetime64[D]')
+    return (starts - EPOCH_DAY).astype(np.int64)
+
+
+def period_labels(codes, period):
+    """Display labels, e.g. 'January 2024' or 'Q1 2024'"""
+    codes = np.asarray(codes, dtype=np.int64)
+    if period == 'quarter':
+        return [f"Q{code % 4 + 1} {1970 + code // 4}" for code in codes]
+    starts = EPOCH_DAY + period_start_days(codes, period).astype('timedelta64[D]')
+    fmt = '%B %Y' if period == 'month' else '%d %b %Y'
+    return [start.astype(object).strftime(fmt) for start in starts]
+
+
+class Calendar:
+    """Period codes of every day in [first_day, last_day]"""
+
+    def __init__(self, first_day, last_day):
+        self.first_day = int(first_day)
+        self.last_day = int(last_day)
+        days = np.arange(self.first_day, self.last_day + 1, dtype=np.int64)
+        self.codes = {period: period_codes(days, period) for period in PERIODS}
+
+    @property
+    def nbytes(self):
+        return sum(codes.nbytes for codes in self.codes.values())
+
+    def rollup(self, days, values, period):
+        """Sum `values` per period of `days`; returns (codes, sums) in time order.
+
+        `days` must lie within the calendar. Codes are dense from the first
+        period, so grouping is a `bincount` and needs no sort.
+        """
+        table = self.codes[period]
+        codes = table[np.asarray(days, dtype=np.int64) - self.first_day] - table[0]
+        size = int(table[-1] - table[0]) + 1
+        sums = np.bincount(codes, weights=np.asarray(values, dtype=np.float64), minlength=size)
+        present = np.bincount(codes, minlength=size) > 0
+        return np.flatnonzero(present) + table[0], np.rint(sums[present]).astype(np.int64)
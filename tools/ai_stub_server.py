@@ -0,0 +1,167 @@
+# tools/ai_stub_server.py
+"""Local stand-in for the Gemini and OpenAI endpoints used by insights.py
+
+Run it, then start the dashboard against it:
+    python tools/ai_stub_server.py --port 8765 --delay 0.5
+    GEMINI_API_BASE=http://127.0.0.1:8765 OPENAI_API_BASE=http://127.0.0.1:8765 \\
+        streamlit run media_intelligence_dashboard.py
+
+Any non-empty API key is accepted. `--fail-every N` answers every Nth request
+with HTTP 503 to exercise the retry path. Streaming requests (Gemini
+`:streamGenerateContent?alt=sse`, OpenAI `"stream": true`) are answered as
+server-sent events over chunked transfer encoding, one word per event,
+`--token-delay` seconds apart; blocking answers wait for all tokens first.
+`--no-stream` answers streaming requests with 404 to exercise the fallback.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHART_PATTERN = re.compile(r"analisis (.+?):")
+
+
+def answer_for(prompt):
+    match = CHART_PATTERN.search(prompt)
+    chart = match.group(1) if match else "data"
+    return (f"• **Stub insight** untuk {chart}\n"
+            f"• Prompt berisi {len(prompt)} karakter\n"
+            f"• Rekomendasi: uji ulang dengan API sungguhan")
+
+
+def tokens_for(text):
+    """Split an answer into word-sized streaming tokens (whitespace kept)"""
+    return re.findall(r"\S+\s*", text)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "AIStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_events(self, events):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for event in events:
+            time.sleep(self.server.token_delay)
+            data = b"data: " + event.encode('utf-8') + b"\n\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _wait_for_generation(self, prompt):
+        """A blocking answer is only ready once every token is generated"""
+        time.sleep(self.server.token_delay * len(tokens_for(answer_for(prompt))))
+
+    def _should_fail(self):
+        with self.server.lock:
+            self.server.requests += 1
+            count = self.server.requests
+        return self.server.fail_every and count % self.server.fail_every == 0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        if self._should_fail():
+            self._send_json(503, {'error': 'stub: simulated overload'})
+            return
+        time.sleep(self.server.delay)
+
+        streaming = ':streamGenerateContent' in self.path or payload.get('stream')
+        if streaming and self.server.no_stream:
+            self._send_json(404, {'error': 'stub: streaming disabled'})
+            return
+
+        if ':generateContent' in self.path or ':streamGenerateContent' in self.path:
+            if 'key=' not in self.path:
+                self._send_json(403, {'error': 'missing key'})
+                return
+            prompt = payload['contents'][0]['parts'][0]['text']
+            if streaming:
+                self._send_events(
+                    json.dumps({'candidates': [{'content': {'parts': [{'text': token}]}}]})
+                    for token in tokens_for(answer_for(prompt))
+                )
+                return
+            self._wait_for_generation(prompt)
+            self._send_json(200, {
+                'candidates': [{'content': {'parts': [{'text': answer_for(prompt)}]}}]
+            })
+        elif self.path.startswith('/v1/chat/completions'):
+            if not self.headers.get('Authorization', '').startswith('Bearer '):
+                self._send_json(401, {'error': 'missing key'})
+                return
+            prompt = payload['messages'][-1]['content']
+            if streaming:
+                events = [
+                    json.dumps({'choices': [{'delta': {'content': token}}]})
+                    for token in tokens_for(answer_for(prompt))
+                ]
+                self._send_events(events + ['[DONE]'])
+                return
+            self._wait_for_generation(prompt)
+            self._send_json(200, {
+                'choices': [{'message': {'role': 'assistant', 'content': answer_for(prompt)}}]
+            })
+        else:
+            self._send_json(404, {'error': f'unknown path {self.path}'})
+
+
+def make_server(host='127.0.0.1', port=0, delay=0.0, fail_every=0, token_delay=0.0,
+                no_stream=False, quiet=True):
+    """Create (but do not start) a stub server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.token_delay = token_delay
+    server.no_stream = no_stream
+    server.fail_every = fail_every
+    server.quiet = quiet
+    server.requests = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def start_in_thread(**kwargs):
+    """Start a stub server on a background thread and return it with its base URL"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.5, help="seconds before each answer")
+    parser.add_argument('--fail-every', type=int, default=0)
+    parser.add_argument('--token-delay', type=float, default=0.05, help="seconds between streamed tokens")
+    parser.add_argument('--no-stream', action='store_true')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay, args.fail_every, args.token_delay,
+                         args.no_stream, quiet=False)
+    print(f"AI stub listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# tools/profile_report.py
+"""Summarize the stage timings logged by profiling.py, per deployment
+
+    python tools/profile_report.py logs/profile.jsonl
+    python tools/profile_report.py logs/profile.jsonl* --baseline v1.4 --candidate v1.5
+
+Without --baseline/--candidate, prints median and p95 seconds of every stage
+for each deployment. With both, compares the two deployments stage by stage
+and flags stages whose median got slower by more than --threshold.
+"""
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+
+def read_log(paths):
+    records = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return pd.DataFrame(records)
+
+
+def stage_stats(log):
+    """Runs, median/p95 seconds and median memory delta per (deployment, stage)"""
+    grouped = log.groupby(['deployment', 'stage'])
+    return pd.DataFrame({
+        'runs': grouped.size(),
+        'median_s': grouped['seconds'].median(),
+        'p95_s': grouped['seconds'].quantile(0.95),
+        'median_mem_mb': grouped['memory_delta'].median() / 2**20,
+    }).reset_index()
+
+
+def compare(stats, baseline, candidate):
+    """Per-stage median ratio candidate / baseline"""
+    base = stats[stats['deployment'] == baseline].set_index('stage')
+    cand = stats[stats['deployment'] == candidate].set_index('stage')
+    joined = base[['median_s']].join(cand[['median_s']], how='inner', lsuffix='_base', rsuffix='_cand')
+    joined['ratio'] = joined['median_s_cand'] / joined['median_s_base']
+    return joined.sort_values('ratio', ascending=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('logs', nargs='+', help="profile log files (rotated backups included)")
+    parser.add_argument('--baseline', help="deployment id to compare against")
+    parser.add_argument('--candidate', help="deployment id to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio flagged as regression")
+    args = parser.parse_args(argv)
+
+    log = read_log(args.logs)
+    if log.empty:
+        print("No profile records", file=sys.stderr)
+        return 1
+    stats = stage_stats(log)
+
+    if not (args.baseline and args.candidate):
+        print(stats.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        return 0
+
+    joined = compare(stats, args.baseline, args.candidate)
+    print(joined.to_string(float_format=lambda v: f"{v:.4f}"))
+    regressions = joined[joined['ratio'] > args.threshold]
+    if not regressions.empty:
+        print(f"\n{len(regressions)} stage(s) slower than {args.threshold:.2f}x: {', '.join(regressions.index)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# watch.py
+"""Watch mode: tail CSV exports that keep growing and fold only the appended rows into the cubes
+
+A `Watcher` follows one CSV file, or every CSV in a directory (one campaign
+per file), from the byte offset it last read. Each refresh reads only the
+bytes appended since then, up to the last complete line, parses them with
+the file's header and the date format inferred from its first rows that
+settle it (day-first and month-first stay open while every day is <= 12), and
+merges their cells with `cube.append_cells`, which regroups only the days
+the new rows touch. A file that shrinks, disappears or is replaced makes
+the watcher start over from the beginning of every file.
+"""
+import glob
+import io
+import itertools
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from approx import ApproxSummary
+from cube import Cube, append_cells, build_cells
+from dates import merge_reports
+from ingest import OPTIONAL_COLS, REQUIRED_COLS, campaign_name, column_key, prepare, standardize_columns
+from schema import DERIVED_COLS
+from streaming import GRAINS, StreamResult
+
+# Bytes parsed at a time when a file has a large backlog (e.g. on the first read)
+WATCH_BLOCK_BYTES = 64 * 1024 * 1024
+
+DEFAULT_INTERVAL_SECONDS = 30
+
+PREVIEW_ROWS = 10
+
+# Distinguishes the cube keys of a watcher that had to start over
+_generations = itertools.count()
+
+# Watchers kept per process; the least recently used path is dropped beyond this
+MAX_WATCHERS = 8
+
+_watchers = OrderedDict()
+_watchers_lock = threading.Lock()
+
+
+class WaitingForData(Exception):
+    """Raised while the watched path has no CSV or no data rows yet"""
+
+
+class _Tail:
+    """Read position of one watched file"""
+
+    def __init__(self, path, stat):
+        self.campaign = campaign_name(path)
+        self.identity = (stat.st_dev, stat.st_ino)
+        # Bytes consumed (complete lines only) and file size at the last refresh
+        self.offset = 0
+        self.size = 0
+        self.header = None
+        self.date_format = None
+
+
+class Watcher:
+    """Incrementally ingested view of a growing CSV file or a directory of CSVs.
+
+    Shared by every session watching the same path; `refresh` is serialized.
+    """
+
+    def __init__(self, target, block_bytes=WATCH_BLOCK_BYTES):
+        self.target = os.path.abspath(target)
+        self.block_bytes = block_bytes
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._tails = {}
+        self._cells = [None] * len(GRAINS)
+        self._approx = ApproxSummary()
+        self._generation = next(_generations)
+        self._consumed = 0
+        self.rows_read = self.rows_kept = self.blocks = 0
+        self.preview = None
+        self.date_report = None
+        self.result = None
+
+    @property
+    def key(self):
+        """Cube key of the latest result; changes whenever rows are appended"""
+        return None if self.result is None else self.result.cube.key
+
+    def paths(self):
+        """Watched CSV paths: the file itself, or the CSVs of the directory"""
+        if os.path.isdir(self.target):
+            return sorted(glob.glob(os.path.join(self.target, '*.csv')))
+        return [self.target] if os.path.exists(self.target) else []
+
+    def has_new_data(self):
+        """Whether a refresh would read anything; only stats the files"""
+        # A copy, as another session's refresh may add tails meanwhile
+        tails = dict(self._tails)
+        paths = self.paths()
+        if set(paths) != set(tails):
+            return True
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return True
+            tail = tails[path]
+            if stat.st_size != tail.size or (stat.st_dev, stat.st_ino) != tail.identity:
+                return True
+        return False
+
+    def _replaced(self, paths):
+        """Whether a known file was removed, truncated or swapped for another one"""
+        for path, tail in self._tails.items():
+            if path not in paths:
+                return True
+            stat = os.stat(path)
+            if stat.st_size < tail.offset or (stat.st_dev, stat.st_ino) != tail.identity:
+                return True
+        return False
+
+    def refresh(self):
+        """Ingest what was appended since the last refresh; returns `(StreamResult, appended rows)`.
+
+        Raises `WaitingForData` while there is no CSV or no data row yet.
+        """
+        with self._lock:
+            paths = self.paths()
+            if not paths:
+                raise WaitingForData(f"Belum ada file CSV di {self.target}")
+            if self._replaced(paths):
+                self._reset()
+
+            appended = 0
+            for path in paths:
+                appended += self._read_appended(path)
+
+            if self._cells[0] is None or not len(self._cells[0]):
+                raise WaitingForData("File CSV belum berisi data")
+            if self.result is None or appended:
+                key = ('watch', self.target, self._generation, self._consumed)
+                watched, influencer_cube = (Cube(cells, key) for cells in self._cells)
+                # Build before sharing so concurrent sessions do not race on them
+                watched.index
+                watched.calendar
+                influencer_cube.index
+                self.result = StreamResult(watched, self.rows_read, self.rows_kept, self.blocks, self.preview,
+                                           self.date_report, influencer_cube, self._approx)
+            return self.result, appended
+
+    def _read_appended(self, path):
+        """Parse the complete lines appended to `path` since its offset; returns rows kept"""
+        stat = os.stat(path)
+        tail = self._tails.get(path)
+        if tail is None:
+            tail = self._tails[path] = _Tail(path, stat)
+        tail.size = stat.st_size
+
+        kept = 0
+        with open(path, 'rb') as f:
+            f.seek(tail.offset)
+            carry = b''
+            while True:
+                data = f.read(self.block_bytes)
+                if not data:
+                    break
+                data = carry + data
+                # A line still being written stays unread until its newline arrives
+                end = data.rfind(b'\n') + 1
+                carry = data[end:]
+                if end:
+                    kept += self._ingest(tail, data[:end])
+                    tail.offset += end
+                    self._consumed += end
+        return kept
+
+    def _ingest(self, tail, data):
+        """Clean one block of complete lines and fold it into the cells"""
+        header = tail.header
+        if header is None:
+            split = data.index(b'\n') + 1
+            header, data = data[:split], data[split:]
+        if data.strip():
+            raw = pd.read_csv(
+                io.BytesIO(header + data),
+                usecols=lambda col: column_key(col) in REQUIRED_COLS or column_key(col) in OPTIONAL_COLS,
+            )
+        else:
+            raw = pd.read_csv(io.BytesIO(header), nrows=0)
+        # Raises before anything is consumed, so a fixed file is read again from here
+        raw = standardize_columns(raw)
+        tail.header = header
+        if raw.empty:
+            return 0
+
+        self.rows_read += len(raw)
+        self.blocks += 1
+        chunk = prepare(raw, tail.campaign, tail.date_format)
+        date_report = chunk.attrs['date_report']
+        if tail.date_format is None and not date_report.ambiguous:
+            tail.date_format = date_report.date_format
+        self.date_report = merge_reports([self.date_report, date_report])
+        self.rows_kept += len(chunk)
+        if len(chunk):
+            self.preview = chunk.tail(PREVIEW_ROWS).drop(columns=DERIVED_COLS)
+
+        for i, dims in enumerate(GRAINS):
+            new = build_cells(chunk, dims)
+            self._cells[i] = new if self._cells[i] is None else append_cells(self._cells[i], new, dims)
+        self._approx = self._approx.add(chunk)
+        return len(chunk)
+
+
+def watcher_for(target):
+    """The process-wide `Watcher` of a path, created on first use.
+
+    Only the MAX_WATCHERS most recently used paths keep their watcher, so
+    paths typed once and abandoned do not hold their cubes forever.
+    """
+    target = os.path.abspath(target)
+    with _watchers_lock:
+        watcher = _watchers.get(target)
+        if watcher is None:
+            watcher = _watchers[target] = Watcher(target)
+            while len(_watchers) > MAX_WATCHERS:
+                _watchers.popitem(last=False)
+        else:
+            _watchers.move_to_end(target)
+        return watcher